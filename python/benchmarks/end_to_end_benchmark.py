@@ -0,0 +1,181 @@
+import argparse
+import ast
+import asyncio
+import json
+import math
+import sys
+import time
+
+from agents import set_default_openai_client, set_tracing_disabled
+from openai import AsyncOpenAI, OpenAI
+
+from benchmarks.stub_openai_server import StubConfig, StubOpenAIServer
+from llm.telemetry import TELEMETRY
+from pipeline import stages
+
+# Stages reported, in notebook order; "flow" is one whole listing -> final evaluation run
+STAGE_ORDER = ("job_parsing", "research", "distillation", "interview_turn", "judge", "aggregator", "flow")
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    # Nearest-rank, so small samples report an observed value rather than an interpolated one
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def latency_summary(values: list[float]) -> dict:
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 0.50), 4),
+        "p95": round(percentile(values, 0.95), 4),
+        "p99": round(percentile(values, 0.99), 4),
+        "max": round(max(values), 4),
+    }
+
+
+def load_fixtures() -> tuple[str, str, list[str]]:
+    with open("./saved_texts/scraped_job.md", "r") as f:
+        scraped_job = f.read()
+    with open("./saved_texts/interview_questions.md", "r") as f:
+        interview_questions = f.read()
+    with open("./saved_texts/sample_interview.txt", "r") as f:
+        candidate_messages = [message["content"] for message in ast.literal_eval(f.read()) if message["role"] == "user"]
+    return scraped_job, interview_questions, candidate_messages
+
+
+async def run_flow(client: OpenAI, async_client: AsyncOpenAI, scraped_job: str, interview_questions: str, candidate_messages: list[str]) -> float:
+    # The testing.ipynb flow end to end, through the stage functions so every model call is spanned
+    start = time.perf_counter()
+    listing = await stages.extract_job_listing_attributes_async(async_client, scraped_job)
+    deep_research_results = stages.combine_research(await stages.perform_research_simultaneously(listing))
+    interview_guide = await asyncio.to_thread(stages.create_interview_guide, client, listing, deep_research_results, interview_questions)
+
+    history = []
+    for message in candidate_messages:
+        reply = "".join([delta async for delta in stages.ainterview_chat_stream(async_client, listing, interview_guide, message, history)])
+        history.append((message, reply))
+
+    messages = [{"role": role, "content": content} for turn in history for role, content in zip(("user", "assistant"), turn)]
+    interview_transcript = stages.format_interview_transcript(messages)
+    evaluations = await stages.perform_all_evaluations(async_client, listing, deep_research_results, interview_guide, interview_transcript)
+    await stages.aggregate_evaluations_async(async_client, listing, stages.combine_evaluations(evaluations))
+    return time.perf_counter() - start
+
+
+async def run_benchmark(config: StubConfig, flows: int, concurrency: int, interview_turns: int, max_retries: int = 2) -> dict:
+    scraped_job, interview_questions, candidate_messages = load_fixtures()
+    candidate_messages = candidate_messages[:interview_turns]
+
+    with StubOpenAIServer(config) as server:
+        client = OpenAI(base_url=server.base_url, api_key="stub", max_retries=max_retries)
+        async_client = AsyncOpenAI(base_url=server.base_url, api_key="stub", max_retries=max_retries)
+        # The research agents go through the Agents SDK's default client; tracing would otherwise try to export
+        set_default_openai_client(async_client, use_for_tracing=False)
+        set_tracing_disabled(True)
+        TELEMETRY.reset()
+
+        semaphore = asyncio.Semaphore(concurrency)
+        flow_seconds, failures = [], []
+
+        async def bounded_flow() -> None:
+            async with semaphore:
+                try:
+                    flow_seconds.append(await run_flow(client, async_client, scraped_job, interview_questions, candidate_messages))
+                except Exception as error:
+                    failures.append(type(error).__name__)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(bounded_flow() for _ in range(flows)))
+        elapsed = time.perf_counter() - start
+        requests = dict(server.requests)
+        await async_client.close()
+        client.close()
+
+    wall_by_stage: dict[str, list[float]] = {"flow": flow_seconds}
+    ttft_by_stage: dict[str, list[float]] = {}
+    errors_by_stage: dict[str, int] = {}
+    for span in TELEMETRY.spans:
+        wall_by_stage.setdefault(span.stage, []).append(span.wall_seconds)
+        if span.ttft_seconds is not None:
+            ttft_by_stage.setdefault(span.stage, []).append(span.ttft_seconds)
+        if span.error:
+            errors_by_stage[span.stage] = errors_by_stage.get(span.stage, 0) + 1
+
+    stage_names = [stage for stage in STAGE_ORDER if wall_by_stage.get(stage)] + sorted(set(wall_by_stage) - set(STAGE_ORDER))
+    return {
+        "config": vars(config),
+        "flows": flows,
+        "concurrency": concurrency,
+        "completed_flows": len(flow_seconds),
+        "failed_flows": len(failures),
+        "elapsed_seconds": round(elapsed, 3),
+        "flows_per_minute": round(len(flow_seconds) * 60 / elapsed, 3),
+        "model_calls_per_second": round(sum(len(wall_by_stage[stage]) for stage in stage_names if stage != "flow") / elapsed, 3),
+        "stub_requests": requests,
+        "stages": {
+            stage: {
+                "wall_seconds": latency_summary(wall_by_stage[stage]),
+                **({"ttft_seconds": latency_summary(ttft_by_stage[stage])} if stage in ttft_by_stage else {}),
+                "errors": errors_by_stage.get(stage, 0),
+            }
+            for stage in stage_names
+        },
+    }
+
+
+def regressions(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    # A stage regresses when its p95 wall time is more than `tolerance` above the baseline's
+    found = []
+    for stage, metrics in report["stages"].items():
+        reference = baseline.get("stages", {}).get(stage)
+        if reference is None:
+            continue
+        current, previous = metrics["wall_seconds"]["p95"], reference["wall_seconds"]["p95"]
+        if current > previous * (1 + tolerance):
+            found.append(f"{stage}: p95 {current:.3f}s vs baseline {previous:.3f}s")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the full interview flow against a local stub OpenAI server and report per-stage latency.")
+    parser.add_argument("--flows", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--interview-turns", type=int, default=4)
+    parser.add_argument("--ttft", type=float, default=StubConfig.time_to_first_token)
+    parser.add_argument("--jitter", type=float, default=StubConfig.jitter_seconds)
+    parser.add_argument("--tokens-per-second", type=float, default=StubConfig.tokens_per_second)
+    parser.add_argument("--completion-tokens", type=int, default=StubConfig.completion_tokens)
+    parser.add_argument("--error-rate", type=float, default=StubConfig.error_rate)
+    parser.add_argument("--cached-prompt-fraction", type=float, default=StubConfig.cached_prompt_fraction)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write the JSON report here as well as printing it")
+    parser.add_argument("--baseline", default=None, help="Earlier report to compare against; exits non-zero on a p95 regression")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    config = StubConfig(
+        time_to_first_token=args.ttft,
+        jitter_seconds=args.jitter,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+        cached_prompt_fraction=args.cached_prompt_fraction,
+        seed=args.seed,
+    )
+    report = asyncio.run(run_benchmark(config, args.flows, args.concurrency, args.interview_turns))
+    print(json.dumps(report, indent=4))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            found = regressions(report, json.load(f), args.tolerance)
+        for line in found:
+            print(f"Latency regression: {line}", file=sys.stderr)
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
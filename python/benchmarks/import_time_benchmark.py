@@ -0,0 +1,107 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Label -> what a worker runs on cold start. Each is timed in a fresh interpreter.
+TARGETS = {
+    "import interview_bot": "import interview_bot",
+    "interview_bot.ConversationManager": "import interview_bot; interview_bot.ConversationManager",
+    "interview_bot.stages": "import interview_bot; interview_bot.stages",
+    "interview_bot.PrepPipeline": "import interview_bot; interview_bot.PrepPipeline",
+}
+
+# Top-level packages that must not be imported just by loading the runtime; each belongs to a specific stage
+HEAVY_MODULES = ("agents", "openai", "httpx", "bs4", "lxml", "firecrawl", "gradio", "IPython", "langchain", "autogen_agentchat", "semantic_kernel", "playwright")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"import_ms": elapsed * 1000, "heavy_modules": sorted(name for name in {heavy!r} if name in sys.modules)}}))
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_probe(statement: str, importtime: bool = False) -> tuple[dict, str]:
+    command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", PROBE.format(statement=statement, heavy=HEAVY_MODULES)]
+    result = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def slowest_imports(importtime_output: str, count: int = 8) -> list[tuple[str, int]]:
+    # `-X importtime` lines: "import time: self [us] | cumulative | imported package"; keep top-level packages only
+    cumulative = {}
+    for line in importtime_output.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not line.startswith("import time:") or "cumulative" in line:
+            continue
+        name = parts[2].rstrip()
+        if not name.startswith("  ") and name.strip():
+            cumulative[name.strip()] = int(parts[1])
+    return sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def run_benchmark(repeats: int) -> dict:
+    report = {}
+    for label, statement in TARGETS.items():
+        samples = [run_probe(statement)[0] for _ in range(repeats)]
+        _, importtime_output = run_probe(statement, importtime=True)
+        report[label] = {
+            "median_ms": round(statistics.median(sample["import_ms"] for sample in samples), 1),
+            "min_ms": round(min(sample["import_ms"] for sample in samples), 1),
+            "heavy_modules": samples[0]["heavy_modules"],
+            "slowest_imports_us": slowest_imports(importtime_output),
+        }
+    return report
+
+
+def failures(report: dict, baseline: dict | None, tolerance: float, max_ms: float | None) -> list[str]:
+    found = []
+    bare = report["import interview_bot"]
+    if bare["heavy_modules"]:
+        found.append(f"import interview_bot loaded {', '.join(bare['heavy_modules'])}")
+    if "openai" in report["interview_bot.ConversationManager"]["heavy_modules"] or "agents" in report["interview_bot.stages"]["heavy_modules"]:
+        found.append("a stage module imports openai or the Agents SDK at import time")
+    if max_ms is not None and bare["median_ms"] > max_ms:
+        found.append(f"import interview_bot took {bare['median_ms']}ms (limit {max_ms}ms)")
+
+    # Medians are compared rather than minimums so a single lucky run can't mask a regression
+    for label, metrics in (baseline or {}).items():
+        if label in report and report[label]["median_ms"] > metrics["median_ms"] * (1 + tolerance):
+            found.append(f"{label}: {report[label]['median_ms']}ms vs baseline {metrics['median_ms']}ms")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of the interview_bot runtime in fresh interpreters.")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", default=None, help="Write the JSON report here, e.g. to use as a later --baseline")
+    parser.add_argument("--baseline", default=None, help="Earlier report; exits non-zero if any median regresses beyond --tolerance")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--max-ms", type=float, default=None, help="Absolute limit for the bare `import interview_bot`")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.repeats)
+    print(json.dumps(report, indent=4))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+    found = failures(report, baseline, args.tolerance, args.max_ms)
+    for line in found:
+        print(f"Cold-start regression: {line}", file=sys.stderr)
+    if found:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from benchmarks.end_to_end_benchmark import latency_summary, load_fixtures
+from benchmarks.stub_openai_server import StubConfig, StubOpenAIServer
+from interview.guardrail import MessageGuardrail
+from interview.interview_server import InterviewServer, InterviewSessionManager, pooled_async_client
+
+LISTING_PATH = "./saved_texts/job_listing_research_response.json"
+GUIDE_PATH = "./saved_texts/interview_guide.md"
+
+
+async def run_candidate(http: httpx.AsyncClient, base_url: str, artifacts_id: str, messages: list[str], ttfts: list[float], turns: list[float]) -> str:
+    # "rejected" when the admission limit turned the session away, otherwise "completed"
+    response = await http.post(f"{base_url}/sessions", json={"artifacts_id": artifacts_id})
+    if response.status_code == 429:
+        return "rejected"
+    response.raise_for_status()
+    session_id = response.json()["session_id"]
+
+    for message in messages:
+        start = time.perf_counter()
+        first = None
+        async with http.stream("POST", f"{base_url}/sessions/{session_id}/messages", json={"message": message}) as stream:
+            async for line in stream.aiter_lines():
+                if line.startswith("data: {") and first is None:
+                    first = time.perf_counter() - start
+        turns.append(time.perf_counter() - start)
+        if first is not None:
+            ttfts.append(first)
+
+    await http.delete(f"{base_url}/sessions/{session_id}")
+    return "completed"
+
+
+async def run_benchmark(config: StubConfig, candidates: int, interview_turns: int, max_sessions: int, max_active_turns: int, guardrail: bool = True) -> dict:
+    _, _, candidate_messages = load_fixtures()
+    candidate_messages = candidate_messages[:interview_turns]
+    with open(LISTING_PATH, "r") as f:
+        listing = json.load(f)
+    with open(GUIDE_PATH, "r") as f:
+        interview_guide = f.read()
+
+    with StubOpenAIServer(config) as stub:
+        async_client = pooled_async_client(max_active_turns, stub.base_url, api_key="stub")
+        manager = InterviewSessionManager(async_client, max_sessions=max_sessions, max_active_turns=max_active_turns, guardrail=MessageGuardrail(async_client) if guardrail else None)
+        async with InterviewServer(manager, port=0) as server:
+            limits = httpx.Limits(max_connections=candidates + 10)
+            async with httpx.AsyncClient(limits=limits, timeout=300) as http:
+                response = await http.post(f"{server.base_url}/artifacts", json={"listing": listing, "interview_guide": interview_guide})
+                artifacts_id = response.json()["artifacts_id"]
+
+                ttfts, turns = [], []
+                start = time.perf_counter()
+                outcomes = await asyncio.gather(*(run_candidate(http, server.base_url, artifacts_id, candidate_messages, ttfts, turns) for _ in range(candidates)))
+                elapsed = time.perf_counter() - start
+                stats = (await http.get(f"{server.base_url}/stats")).json()
+        await async_client.close()
+
+    return {
+        "config": vars(config),
+        "candidates": candidates,
+        "interview_turns": len(candidate_messages),
+        "max_sessions": max_sessions,
+        "max_active_turns": max_active_turns,
+        "completed": outcomes.count("completed"),
+        "rejected": outcomes.count("rejected"),
+        "elapsed_seconds": round(elapsed, 3),
+        "turns_per_second": round(len(turns) / elapsed, 3),
+        "ttft_seconds": latency_summary(ttfts) if ttfts else None,
+        "turn_seconds": latency_summary(turns) if turns else None,
+        "server_stats": stats,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run many concurrent mock interviews through the interview server against the stub OpenAI server.")
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--interview-turns", type=int, default=4)
+    parser.add_argument("--max-sessions", type=int, default=500)
+    parser.add_argument("--max-active-turns", type=int, default=64)
+    parser.add_argument("--ttft", type=float, default=StubConfig.time_to_first_token)
+    parser.add_argument("--tokens-per-second", type=float, default=StubConfig.tokens_per_second)
+    parser.add_argument("--completion-tokens", type=int, default=StubConfig.completion_tokens)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-guardrail", action="store_true")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    config = StubConfig(time_to_first_token=args.ttft, tokens_per_second=args.tokens_per_second, completion_tokens=args.completion_tokens, seed=args.seed)
+    report = asyncio.run(run_benchmark(config, args.candidates, args.interview_turns, args.max_sessions, args.max_active_turns, not args.no_guardrail))
+    print(json.dumps(report, indent=4))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
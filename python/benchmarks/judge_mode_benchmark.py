@@ -0,0 +1,141 @@
+import argparse
+import ast
+import asyncio
+import json
+import math
+import re
+import statistics
+import time
+from collections import Counter
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+from constants.constants import JobListingResearchResponse
+from pipeline import stages
+
+# Compares the five-call fan-out evaluation against the single structured-output call on the saved_texts fixtures:
+# total input tokens, wall time, and how closely the two modes' judge outputs agree.
+
+QUOTE_PATTERN = re.compile(r"[\"“]([^\"”]{12,})[\"”]")
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+class UsageRecorder:
+    """Wraps an AsyncOpenAI client and totals the usage reported by every completion it returns."""
+
+    def __init__(self, async_client: AsyncOpenAI):
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+        self.calls = 0
+        self.chat = _Namespace(completions=_RecordingCompletions(async_client.chat.completions, self))
+        self.beta = _Namespace(chat=_Namespace(completions=_RecordingCompletions(async_client.beta.chat.completions, self)))
+
+    def record(self, response) -> None:
+        self.calls += 1
+        if response.usage:
+            self.prompt_tokens += response.usage.prompt_tokens
+            self.completion_tokens += response.usage.completion_tokens
+            details = response.usage.prompt_tokens_details
+            self.cached_tokens += (details.cached_tokens or 0) if details else 0
+
+
+class _Namespace:
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+class _RecordingCompletions:
+    def __init__(self, completions, recorder: UsageRecorder):
+        self._completions = completions
+        self._recorder = recorder
+
+    async def create(self, **params):
+        response = await self._completions.create(**params)
+        self._recorder.record(response)
+        return response
+
+    async def parse(self, **params):
+        response = await self._completions.parse(**params)
+        self._recorder.record(response)
+        return response
+
+
+def term_cosine(a: str, b: str) -> float:
+    a_terms, b_terms = Counter(WORD_PATTERN.findall(a.lower())), Counter(WORD_PATTERN.findall(b.lower()))
+    dot = sum(count * b_terms[term] for term, count in a_terms.items())
+    norm = math.sqrt(sum(c * c for c in a_terms.values())) * math.sqrt(sum(c * c for c in b_terms.values()))
+    return dot / norm if norm else 0.0
+
+
+def quote_overlap(a: str, b: str) -> float:
+    # Jaccard overlap of the transcript quotes each output cites, i.e. whether both modes point at the same evidence
+    a_quotes = {quote.strip().lower() for quote in QUOTE_PATTERN.findall(a)}
+    b_quotes = {quote.strip().lower() for quote in QUOTE_PATTERN.findall(b)}
+    if not a_quotes and not b_quotes:
+        return 1.0
+    return len(a_quotes & b_quotes) / len(a_quotes | b_quotes)
+
+
+async def run_mode(async_client: AsyncOpenAI, mode: str, listing: JobListingResearchResponse, deep_research_results: str, interview_guide: str, interview_transcript: str) -> tuple[dict, dict[str, str]]:
+    recorder = UsageRecorder(async_client)
+    start = time.perf_counter()
+    evaluations = await stages.perform_all_evaluations(recorder, listing, deep_research_results, interview_guide, interview_transcript, mode=mode)
+    wall_time = time.perf_counter() - start
+    return {
+        "wall_time_seconds": wall_time,
+        "calls": recorder.calls,
+        "input_tokens": recorder.prompt_tokens,
+        "cached_input_tokens": recorder.cached_tokens,
+        "output_tokens": recorder.completion_tokens,
+    }, evaluations
+
+
+def summarize(samples: list[dict]) -> dict:
+    return {metric: statistics.mean(sample[metric] for sample in samples) for metric in samples[0]}
+
+
+async def run_benchmark(async_client: AsyncOpenAI, runs: int) -> dict:
+    with open("./saved_texts/job_listing_research_response.json", "r") as f:
+        listing = JobListingResearchResponse(**json.load(f))
+    with open("./saved_texts/deep_research_results.md", "r") as f:
+        deep_research_results = f.read()
+    with open("./saved_texts/interview_guide.md", "r") as f:
+        interview_guide = f.read()
+    with open("./saved_texts/sample_interview.txt", "r") as f:
+        interview_transcript = stages.format_interview_transcript(ast.literal_eval(f.read()))
+
+    samples = {stages.FAN_OUT_MODE: [], stages.SINGLE_CALL_MODE: []}
+    agreement = {name: {"term_cosine": [], "quote_overlap": []} for name in stages.JUDGE_PROMPTS}
+
+    for _ in range(runs):
+        fan_out_metrics, fan_out = await run_mode(async_client, stages.FAN_OUT_MODE, listing, deep_research_results, interview_guide, interview_transcript)
+        single_call_metrics, single_call = await run_mode(async_client, stages.SINGLE_CALL_MODE, listing, deep_research_results, interview_guide, interview_transcript)
+        samples[stages.FAN_OUT_MODE].append(fan_out_metrics)
+        samples[stages.SINGLE_CALL_MODE].append(single_call_metrics)
+
+        for name in stages.JUDGE_PROMPTS:
+            agreement[name]["term_cosine"].append(term_cosine(fan_out[name], single_call[name]))
+            agreement[name]["quote_overlap"].append(quote_overlap(fan_out[name], single_call[name]))
+
+    return {
+        "runs": runs,
+        "modes": {mode: summarize(mode_samples) for mode, mode_samples in samples.items()},
+        "agreement": {name: {metric: statistics.mean(values) for metric, values in metrics.items()} for name, metrics in agreement.items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare fan-out and single-call judge evaluation on the saved_texts fixtures.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--base-url", default=None, help="OpenAI-compatible endpoint to benchmark against")
+    args = parser.parse_args()
+
+    load_dotenv(override=True)
+    report = asyncio.run(run_benchmark(AsyncOpenAI(base_url=args.base_url), args.runs))
+    print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from llm.tokens import estimate_message_tokens, estimate_tokens
+
+FILLER_WORDS = (
+    "the candidate described a concrete example with clear ownership measurable impact and a reflection on what "
+    "they would change next time while connecting the answer back to the role and the team"
+).split()
+
+
+@dataclass
+class StubConfig:
+    # Seconds before the first token, plus up to jitter_seconds of uniform noise
+    time_to_first_token: float = 0.4
+    jitter_seconds: float = 0.1
+    # Output tokens per second once generation starts
+    tokens_per_second: float = 80.0
+    completion_tokens: int = 250
+    # Fraction of requests answered with error_status instead of a completion
+    error_rate: float = 0.0
+    error_status: int = 500
+    # Fraction of the prompt reported as served from the prompt cache
+    cached_prompt_fraction: float = 0.0
+    seed: int | None = None
+
+
+def filler_text(tokens: int, rng: random.Random) -> str:
+    # estimate_tokens counts ~4 characters per token; filler words average about that with the trailing space
+    words = []
+    while estimate_tokens(" ".join(words)) < tokens:
+        words.append(rng.choice(FILLER_WORDS))
+    return " ".join(words)
+
+
+def instance_from_schema(schema: dict, definitions: dict, rng: random.Random, text_tokens: int) -> object:
+    # Just enough JSON Schema to satisfy the structured-output models in constants.constants
+    if "$ref" in schema:
+        return instance_from_schema(definitions[schema["$ref"].split("/")[-1]], definitions, rng, text_tokens)
+    if "anyOf" in schema:
+        return instance_from_schema(schema["anyOf"][0], definitions, rng, text_tokens)
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    if "const" in schema:
+        return schema["const"]
+
+    schema_type = schema.get("type")
+    if schema_type == "object":
+        properties = schema.get("properties", {})
+        share = max(text_tokens // max(len(properties), 1), 8)
+        return {name: instance_from_schema(prop, definitions, rng, share) for name, prop in properties.items()}
+    if schema_type == "array":
+        return [instance_from_schema(schema.get("items", {}), definitions, rng, max(text_tokens // 2, 8)) for _ in range(2)]
+    if schema_type == "integer":
+        return rng.randint(1, 5)
+    if schema_type == "number":
+        return round(rng.random(), 3)
+    if schema_type == "boolean":
+        return rng.random() < 0.5
+    if schema_type == "null":
+        return None
+    return filler_text(text_tokens, rng)
+
+
+class StubOpenAIServer:
+    """
+    OpenAI-compatible server on localhost for network-free benchmarks. Serves /v1/chat/completions (plain, streamed and
+    json_schema structured outputs) and /v1/responses (for the research agents), with simulated latency, token rates,
+    prompt caching and injected errors. Request counts per path are kept in `requests`.
+    """
+
+    def __init__(self, config: StubConfig | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StubConfig()
+        self.rng = random.Random(self.config.seed)
+        self.requests: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StubOpenAIServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    # ===============================
+    #       Simulated behaviour
+    # ===============================
+
+    def _draw(self) -> tuple[bool, float, random.Random]:
+        # Handler threads share one seeded Random behind the lock; each request then generates text from its own
+        with self._lock:
+            fail = self.rng.random() < self.config.error_rate
+            return fail, self.rng.uniform(0, self.config.jitter_seconds), random.Random(self.rng.random())
+
+    def _usage(self, prompt_tokens: int, completion_tokens: int) -> dict:
+        cached_tokens = int(prompt_tokens * self.config.cached_prompt_fraction)
+        return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "cached_tokens": cached_tokens}
+
+    def _content(self, request: dict, rng: random.Random) -> str:
+        response_format = request.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            schema = response_format["json_schema"]["schema"]
+            return json.dumps(instance_from_schema(schema, schema.get("$defs", {}), rng, self.config.completion_tokens))
+        return filler_text(self.config.completion_tokens, rng)
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                path = self.path.split("?")[0].rstrip("/")
+                with server._lock:
+                    server.requests[path] = server.requests.get(path, 0) + 1
+
+                fail, jitter, rng = server._draw()
+                time.sleep(server.config.time_to_first_token + jitter)
+                if fail:
+                    self._json(server.config.error_status, {"error": {"message": "Injected stub error", "type": "server_error", "code": None}})
+                elif path.endswith("/chat/completions"):
+                    try:
+                        self._chat_completion(body, rng)
+                    except (BrokenPipeError, ConnectionResetError):
+                        # The client closed a stream early, e.g. a reply cancelled by the guardrail
+                        self.close_connection = True
+                elif path.endswith("/responses"):
+                    self._response(body, rng)
+                else:
+                    self._json(404, {"error": {"message": f"Unknown path {path}", "type": "invalid_request_error", "code": None}})
+
+            def _json(self, status: int, payload: dict) -> None:
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _generation_delay(self, completion_tokens: int) -> float:
+                return completion_tokens / server.config.tokens_per_second
+
+            def _chat_completion(self, request: dict, rng: random.Random) -> None:
+                content = server._content(request, rng)
+                usage = server._usage(estimate_message_tokens(request.get("messages", [])), estimate_tokens(content))
+                completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+                created = int(time.time())
+                model = request.get("model", "stub")
+
+                if not request.get("stream"):
+                    time.sleep(self._generation_delay(usage["completion_tokens"]))
+                    self._json(200, {
+                        "id": completion_id,
+                        "object": "chat.completion",
+                        "created": created,
+                        "model": model,
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                        "usage": _chat_usage(usage),
+                    })
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+
+                def event(choices: list, chunk_usage: dict | None = None) -> None:
+                    chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model, "choices": choices}
+                    if chunk_usage is not None:
+                        chunk["usage"] = chunk_usage
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                    self.wfile.flush()
+
+                words = content.split(" ")
+                delay = self._generation_delay(usage["completion_tokens"]) / max(len(words), 1)
+                for index, word in enumerate(words):
+                    event([{"index": 0, "delta": {"content": word if index == 0 else f" {word}"}, "finish_reason": None}])
+                    time.sleep(delay)
+                event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+                if (request.get("stream_options") or {}).get("include_usage"):
+                    event([], _chat_usage(usage))
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+            def _response(self, request: dict, rng: random.Random) -> None:
+                # Non-streamed Responses API call with a single message output, which the Agents SDK takes as the final output
+                content = filler_text(server.config.completion_tokens, rng)
+                request_input = request.get("input", "")
+                prompt_text = (request.get("instructions") or "") + (request_input if isinstance(request_input, str) else json.dumps(request_input))
+                usage = server._usage(estimate_tokens(prompt_text), estimate_tokens(content))
+                time.sleep(self._generation_delay(usage["completion_tokens"]))
+                self._json(200, {
+                    "id": f"resp_{uuid.uuid4().hex[:24]}",
+                    "object": "response",
+                    "created_at": time.time(),
+                    "model": request.get("model", "stub"),
+                    "status": "completed",
+                    "output": [{
+                        "type": "message",
+                        "id": f"msg_{uuid.uuid4().hex[:24]}",
+                        "role": "assistant",
+                        "status": "completed",
+                        "content": [{"type": "output_text", "text": content, "annotations": []}],
+                    }],
+                    "parallel_tool_calls": False,
+                    "tool_choice": "auto",
+                    "tools": [],
+                    "usage": {
+                        "input_tokens": usage["prompt_tokens"],
+                        "input_tokens_details": {"cached_tokens": usage["cached_tokens"]},
+                        "output_tokens": usage["completion_tokens"],
+                        "output_tokens_details": {"reasoning_tokens": 0},
+                        "total_tokens": usage["prompt_tokens"] + usage["completion_tokens"],
+                    },
+                })
+
+        return Handler
+
+
+def _chat_usage(usage: dict) -> dict:
+    return {
+        "prompt_tokens": usage["prompt_tokens"],
+        "completion_tokens": usage["completion_tokens"],
+        "total_tokens": usage["prompt_tokens"] + usage["completion_tokens"],
+        "prompt_tokens_details": {"cached_tokens": usage["cached_tokens"]},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the stub OpenAI-compatible server in the foreground.")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--ttft", type=float, default=StubConfig.time_to_first_token)
+    parser.add_argument("--tokens-per-second", type=float, default=StubConfig.tokens_per_second)
+    parser.add_argument("--completion-tokens", type=int, default=StubConfig.completion_tokens)
+    parser.add_argument("--error-rate", type=float, default=StubConfig.error_rate)
+    args = parser.parse_args()
+
+    config = StubConfig(time_to_first_token=args.ttft, tokens_per_second=args.tokens_per_second, completion_tokens=args.completion_tokens, error_rate=args.error_rate)
+    server = StubOpenAIServer(config, port=args.port)
+    print(f"Stub OpenAI server listening on {server.base_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel
 
 class JobListingResearchResponse(BaseModel):
@@ -7,4 +9,32 @@ class JobListingResearchResponse(BaseModel):
     work_schedule: str
     company_name: str
     expectations_and_responsibilities: str
-    requirements: str
\ No newline at end of file
+    requirements: str
+
+
+class PanelEvaluation(BaseModel):
+    content_evaluation: str
+    structure_evaluation: str
+    fit_evaluation: str
+    communication_evaluation: str
+    risk_evaluation: str
+
+
+class FeedbackPoint(BaseModel):
+    polarity: Literal["strength", "improvement"]
+    criterion: str
+    quotes: list[str]
+    rationale: str
+    job_context: str
+    best_practice: str
+    severity: Literal["low", "medium", "high"]
+
+
+class JudgeEvaluation(BaseModel):
+    feedback_points: list[FeedbackPoint]
+    summary: str
+
+
+class GuardrailResponse(BaseModel):
+    reason: str
+    contains_any_malicious_content: bool
@@ -0,0 +1,160 @@
+import argparse
+import asyncio
+import glob
+import json
+import logging
+import os
+from typing import Iterator
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+from pydantic import BaseModel
+
+from constants.constants import JobListingResearchResponse
+from interview.session_store import SessionStore
+from llm.rate_limiter import RateLimiter
+from llm.tokens import estimate_message_tokens
+from pipeline import stages
+
+logger = logging.getLogger(__name__)
+
+# Completion tokens reserved per call on top of the prompt, since the bucket is charged before the response exists
+EXPECTED_JUDGE_COMPLETION_TOKENS = 1500
+EXPECTED_AGGREGATOR_COMPLETION_TOKENS = 2500
+
+
+class TranscriptRecord(BaseModel):
+    session_id: str
+    listing: JobListingResearchResponse
+    deep_research_results: str
+    interview_guide: str
+    messages: list[dict]
+
+
+def load_transcripts(path: str) -> Iterator[TranscriptRecord]:
+    # A JSONL file with one record per line, a SessionStore directory, or a directory of one-record *.json files
+    if os.path.isfile(os.path.join(path, "sessions.jsonl")):
+        yield from load_store_transcripts(SessionStore(path))
+        return
+
+    if os.path.isdir(path):
+        for file_path in sorted(glob.glob(os.path.join(path, "*.json"))):
+            with open(file_path, "r", encoding="utf-8") as f:
+                yield TranscriptRecord(**json.load(f))
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield TranscriptRecord(**json.loads(line))
+
+
+def load_store_transcripts(store: SessionStore) -> Iterator[TranscriptRecord]:
+    for session_id in store.session_ids():
+        session = store.session(session_id)
+        # Sessions started without their prep outputs can't be judged
+        if not session or not session["listing"] or session["deep_research_results"] is None or session["interview_guide"] is None:
+            continue
+        yield TranscriptRecord(
+            session_id=session_id,
+            listing=JobListingResearchResponse(**session["listing"]),
+            deep_research_results=session["deep_research_results"],
+            interview_guide=session["interview_guide"],
+            messages=store.messages(session_id),
+        )
+
+
+def completed_sessions(output_path: str) -> set[str]:
+    # The output file doubles as the checkpoint: a session is done once its line has been written
+    if not os.path.exists(output_path):
+        return set()
+
+    completed = set()
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                completed.add(json.loads(line)["session_id"])
+            except (json.JSONDecodeError, KeyError):
+                # A crash mid-write can leave a truncated last line; that session simply runs again
+                continue
+    return completed
+
+
+async def evaluate_record(async_client: AsyncOpenAI, limiter: RateLimiter, record: TranscriptRecord, layout: str, mode: str = stages.FAN_OUT_MODE) -> dict:
+    interview_transcript = stages.format_interview_transcript(record.messages)
+
+    async def judge(name: str) -> str:
+        messages = stages.judge_messages(name, record.listing, record.deep_research_results, record.interview_guide, interview_transcript, layout)
+        async with limiter.reserve(estimate_message_tokens(messages) + EXPECTED_JUDGE_COMPLETION_TOKENS):
+            return await stages.evaluate_interview(async_client, name, record.listing, record.deep_research_results, record.interview_guide, interview_transcript, layout)
+
+    if mode == stages.SINGLE_CALL_MODE:
+        messages = stages.panel_messages(record.listing, record.deep_research_results, record.interview_guide, interview_transcript)
+        async with limiter.reserve(estimate_message_tokens(messages) + EXPECTED_JUDGE_COMPLETION_TOKENS * len(stages.PANEL_FIELDS)):
+            evaluations = await stages.evaluate_interview_single_call(async_client, record.listing, record.deep_research_results, record.interview_guide, interview_transcript)
+    else:
+        results = await asyncio.gather(*(judge(name) for name in stages.JUDGE_PROMPTS))
+        evaluations = dict(zip(stages.JUDGE_PROMPTS.keys(), results))
+
+    combined_evaluations = stages.combine_evaluations(evaluations)
+    aggregator_tokens = estimate_message_tokens(stages.aggregator_messages(record.listing, combined_evaluations)) + EXPECTED_AGGREGATOR_COMPLETION_TOKENS
+    async with limiter.reserve(aggregator_tokens):
+        final_evaluation = await stages.aggregate_evaluations_async(async_client, record.listing, combined_evaluations)
+
+    return {"session_id": record.session_id, "evaluations": evaluations, "final_evaluation": final_evaluation}
+
+
+async def run_batch_evaluation(async_client: AsyncOpenAI, input_path: str, output_path: str, max_concurrency: int = 8, tokens_per_minute: int = 200_000, layout: str = stages.JUDGE_FIRST_LAYOUT, mode: str = stages.FAN_OUT_MODE) -> dict[str, int]:
+    limiter = RateLimiter(max_concurrency, tokens_per_minute)
+    completed = completed_sessions(output_path)
+    counts = {"completed": 0, "skipped": 0, "failed": 0}
+    write_lock = asyncio.Lock()
+
+    # Sessions in flight are capped separately from calls so a huge input file isn't turned into tasks all at once
+    session_slots = asyncio.Semaphore(max_concurrency)
+
+    async def run(record: TranscriptRecord) -> None:
+        try:
+            result = await evaluate_record(async_client, limiter, record, layout, mode)
+        except Exception as error:
+            counts["failed"] += 1
+            logger.warning("Evaluation failed for session %s: %r", record.session_id, error)
+            return
+        finally:
+            session_slots.release()
+
+        async with write_lock:
+            with open(output_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+        counts["completed"] += 1
+
+    tasks = []
+    for record in load_transcripts(input_path):
+        if record.session_id in completed:
+            counts["skipped"] += 1
+            continue
+        await session_slots.acquire()
+        tasks.append(asyncio.create_task(run(record)))
+
+    await asyncio.gather(*tasks)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-score many interview transcripts with the five judges and the aggregator.")
+    parser.add_argument("input", help="JSONL of transcript records, a SessionStore directory, or a directory of *.json records")
+    parser.add_argument("--output", required=True, help="JSONL of results; also the checkpoint used to resume")
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    parser.add_argument("--tokens-per-minute", type=int, default=200_000)
+    parser.add_argument("--layout", choices=[stages.JUDGE_FIRST_LAYOUT, stages.SHARED_PREFIX_LAYOUT], default=stages.JUDGE_FIRST_LAYOUT)
+    parser.add_argument("--mode", choices=[stages.FAN_OUT_MODE, stages.SINGLE_CALL_MODE], default=stages.FAN_OUT_MODE)
+    args = parser.parse_args()
+
+    load_dotenv(override=True)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    counts = asyncio.run(run_batch_evaluation(AsyncOpenAI(), args.input, args.output, args.max_concurrency, args.tokens_per_minute, args.layout, args.mode))
+    print(json.dumps(counts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import argparse
+import json
+import logging
+import re
+from dataclasses import dataclass
+
+from llm.tokens import estimate_tokens
+from pipeline import stages
+
+# Research pillars each judge draws on, most useful first. Pillars not listed are never sent to that judge.
+JUDGE_RESEARCH_PILLARS = {
+    "Content Evaluation": ["role_success", "domain_knowledge", "company_strategy"],
+    "Structure Evaluation": ["role_success"],
+    "Fit Evaluation": ["company_strategy", "team_culture", "role_success", "domain_knowledge"],
+    "Communication Evaluation": ["team_culture"],
+    "Risk Evaluation": ["role_success", "team_culture", "company_strategy"],
+}
+
+# When a pillar's report is missing, the "## " subsections of other pillars whose headings mention one of these stand in for it
+PILLAR_KEYWORDS = {
+    "company_strategy": ("company", "strategy", "positioning", "market", "developments", "competit"),
+    "role_success": ("role", "responsibilit", "deliverable", "success", "skills", "competenc"),
+    "team_culture": ("team", "culture", "values", "process", "ways of working", "collaborat", "stakeholder", "skills", "competenc"),
+    "domain_knowledge": ("domain", "industry", "functional", "tools", "frameworks", "practices"),
+}
+
+# ...and when no heading matches, the next most relevant pillars are sent whole
+PILLAR_FALLBACKS = {
+    "company_strategy": ["domain_knowledge", "role_success"],
+    "role_success": ["domain_knowledge", "team_culture"],
+    "team_culture": ["role_success", "company_strategy"],
+    "domain_knowledge": ["role_success", "company_strategy"],
+}
+
+logger = logging.getLogger(__name__)
+
+# Interview guide sections (the "### N) Title" headers DISTILLATION_SYSTEM_PROMPT_V1 prescribes) each judge needs, most useful first
+JUDGE_GUIDE_SECTIONS = {
+    "Content Evaluation": ["Role Snapshot", "High-Impact Topics to Probe", "Signals of Strong Answers", "Tailored Question Bank", "Micro-Glossary"],
+    "Structure Evaluation": ["Role Snapshot", "Tailored Question Bank", "Signals of Strong Answers", "Follow-Up Patterns"],
+    "Fit Evaluation": ["Role Snapshot", "Strategic Context", "High-Impact Topics to Probe", "Signals of Strong Answers"],
+    "Communication Evaluation": ["Role Snapshot", "Follow-Up Patterns", "Micro-Glossary"],
+    "Risk Evaluation": ["Role Snapshot", "Red Flags to Watch", "Signals of Strong Answers"],
+}
+
+DEFAULT_CONTEXT_TOKEN_BUDGET = 3000
+
+GUIDE_HEADER_PATTERN = re.compile(r"^#{1,3}\s*\d+\)\s*(.+?)\s*$")
+
+
+@dataclass
+class Section:
+    key: str
+    text: str
+    order: int
+    suborder: int = 0
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+@dataclass
+class JudgeContext:
+    judge: str
+    deep_research_results: str
+    interview_guide: str
+    research_pillars: list[str]
+    guide_sections: list[str]
+    full_tokens: int
+    selected_tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.full_tokens - self.selected_tokens
+
+
+def _split_on(text: str, is_header) -> list[tuple[str | None, str]]:
+    # (header line or None for any preamble, text including the header), in document order
+    sections, header, lines = [], None, []
+    for line in text.splitlines(keepends=True):
+        if is_header(line) and (lines or header is not None):
+            sections.append((header, "".join(lines)))
+            lines = []
+        if is_header(line):
+            header = line
+        lines.append(line)
+    if lines:
+        sections.append((header, "".join(lines)))
+    return [(header, body) for header, body in sections if body.strip()]
+
+
+def split_research(deep_research_results: str) -> list[Section]:
+    # Pillar reports start with the H1 title their agent is told to use; anything else keeps its own heading as key
+    pillar_by_title = {title.lower(): pillar for pillar, title in stages.RESEARCH_PILLAR_TITLES.items()}
+    sections = []
+    for order, (header, body) in enumerate(_split_on(deep_research_results, lambda line: line.startswith("# "))):
+        title = header[2:].strip().lower() if header else ""
+        sections.append(Section(pillar_by_title.get(title, title or "preamble"), body, order))
+    return sections
+
+
+def split_guide(interview_guide: str) -> list[Section]:
+    sections = []
+    for order, (header, body) in enumerate(_split_on(interview_guide, lambda line: GUIDE_HEADER_PATTERN.match(line) is not None)):
+        match = GUIDE_HEADER_PATTERN.match(header) if header else None
+        sections.append(Section(match.group(1) if match else "preamble", body, order))
+    return sections
+
+
+def matches_heading(section_title: str, wanted: str) -> bool:
+    # Guide headers can carry a trailing qualifier, e.g. "Strategic Context — High-Yield Facts"
+    return section_title.lower().startswith(wanted.lower())
+
+
+def _subsections(section: Section) -> list[Section]:
+    return [Section(section.key, body, order) for order, (_, body) in enumerate(_split_on(section.text, lambda line: line.startswith("## ")))]
+
+
+def _stand_ins(pillar: str, research: list[Section], judge_pillars: list[str]) -> list[Section]:
+    # Drawn only from pillars the judge doesn't already read, so nothing is sent twice
+    others = [section for section in research if section.key in stages.RESEARCH_PILLAR_TITLES and section.key not in judge_pillars]
+    matches = []
+    for section in others:
+        for subsection in _subsections(section):
+            heading = subsection.text.splitlines()[0]
+            if heading.startswith("## ") and any(keyword in heading.lower() for keyword in PILLAR_KEYWORDS[pillar]):
+                matches.append(Section(f"{pillar} <- {section.key}: {heading[3:].strip()}", subsection.text, section.order, subsection.order))
+    if matches:
+        return matches
+    for fallback in PILLAR_FALLBACKS[pillar]:
+        sections = [Section(f"{pillar} <- {section.key}", section.text, section.order) for section in others if section.key == fallback]
+        if sections:
+            return sections
+    return []
+
+
+def plan_judge_context(judge: str, deep_research_results: str, interview_guide: str, token_budget: int = DEFAULT_CONTEXT_TOKEN_BUDGET) -> JudgeContext:
+    """
+    Picks the research pillars and guide sections relevant to one judge's criteria, in priority order, until the token
+    budget is spent. A pillar that doesn't fit whole contributes the "## " subsections that do. A pillar missing from the
+    report is logged and stood in for by related subsections of other pillars. Sections the planner doesn't recognise
+    (an unexpected heading) are kept when they fit, after the judge's own picks.
+    """
+    research = split_research(deep_research_results)
+    guide = split_guide(interview_guide)
+
+    # A guide without the expected headers can't be split safely; keep it whole
+    if not any(section.key != "preamble" for section in guide):
+        guide = [Section("guide", interview_guide, 0)] if interview_guide.strip() else []
+
+    known_pillars = set(stages.RESEARCH_PILLAR_TITLES)
+    known_guide = [title for titles in JUDGE_GUIDE_SECTIONS.values() for title in titles]
+    candidates = []
+    for title in JUDGE_GUIDE_SECTIONS[judge]:
+        candidates.extend(("guide", section) for section in guide if matches_heading(section.key, title))
+    candidates.extend(("guide", section) for section in guide if not any(matches_heading(section.key, title) for title in known_guide))
+    judge_pillars = JUDGE_RESEARCH_PILLARS[judge]
+    for pillar in judge_pillars:
+        sections = [section for section in research if section.key == pillar]
+        if not sections and research:
+            sections = _stand_ins(pillar, research, judge_pillars)
+            logger.warning("%s: research has no %r report; standing in %s", judge, pillar, [section.key for section in sections] or "nothing")
+        candidates.extend(("research", section) for section in sections)
+    candidates.extend(("research", section) for section in research if section.key not in known_pillars)
+
+    remaining = token_budget
+    selected: dict[str, list[tuple[int, int, str]]] = {"research": [], "guide": []}
+    picked = {"research": [], "guide": []}
+    for source, section in candidates:
+        if section.tokens <= remaining:
+            parts = [(section.order, section.suborder, section.text)]
+        elif source == "research":
+            parts = []
+            for subsection in _subsections(section):
+                if subsection.tokens <= remaining - sum(estimate_tokens(text) for _, _, text in parts):
+                    parts.append((section.order, subsection.order, subsection.text))
+        else:
+            parts = []
+
+        if parts:
+            selected[source].extend(parts)
+            picked[source].append(section.key)
+            remaining -= sum(estimate_tokens(text) for _, _, text in parts)
+
+    # Reassemble in document order so each judge reads the same structure the researchers wrote
+    def assemble(parts: list[tuple[int, int, str]]) -> str:
+        return "\n".join(text.strip("\n") + "\n" for _, _, text in sorted(parts)).strip("\n")
+
+    planned_research = assemble(selected["research"])
+    planned_guide = assemble(selected["guide"])
+    return JudgeContext(
+        judge=judge,
+        deep_research_results=planned_research,
+        interview_guide=planned_guide,
+        research_pillars=picked["research"],
+        guide_sections=picked["guide"],
+        full_tokens=estimate_tokens(deep_research_results) + estimate_tokens(interview_guide),
+        selected_tokens=estimate_tokens(planned_research) + estimate_tokens(planned_guide),
+    )
+
+
+def plan_contexts(deep_research_results: str, interview_guide: str, token_budget: int = DEFAULT_CONTEXT_TOKEN_BUDGET) -> dict[str, JudgeContext]:
+    return {judge: plan_judge_context(judge, deep_research_results, interview_guide, token_budget) for judge in stages.JUDGE_PROMPTS}
+
+
+def context_savings_report(contexts: dict[str, JudgeContext]) -> dict[str, dict]:
+    return {
+        judge: {
+            "full_tokens": context.full_tokens,
+            "selected_tokens": context.selected_tokens,
+            "tokens_saved": context.tokens_saved,
+            "research_pillars": context.research_pillars,
+            "guide_sections": context.guide_sections,
+        }
+        for judge, context in contexts.items()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report the context each judge would get, and the tokens saved, for a research report and guide.")
+    parser.add_argument("--deep-research", default="./saved_texts/deep_research_results.md")
+    parser.add_argument("--interview-guide", default="./saved_texts/interview_guide.md")
+    parser.add_argument("--budget", type=int, default=DEFAULT_CONTEXT_TOKEN_BUDGET)
+    args = parser.parse_args()
+
+    with open(args.deep_research, "r", encoding="utf-8") as f:
+        deep_research_results = f.read()
+    with open(args.interview_guide, "r", encoding="utf-8") as f:
+        interview_guide = f.read()
+    print(json.dumps(context_savings_report(plan_contexts(deep_research_results, interview_guide, args.budget)), indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import re
+from dataclasses import dataclass
+
+from constants.constants import JudgeEvaluation
+
+# Two quotes are treated as the same evidence if one contains the other word for word, or their word sets overlap this much
+QUOTE_OVERLAP_THRESHOLD = 0.6
+
+# Quotes shorter than this ("led", "yes I did") are too generic to identify a piece of evidence and never match
+MIN_QUOTE_WORDS = 3
+
+SEVERITY_RANK = {"low": 0, "medium": 1, "high": 2}
+
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+@dataclass
+class MergedFeedbackPoint:
+    polarity: str
+    severity: str
+    judges: list[str]
+    criteria: list[str]
+    quotes: list[str]
+    rationales: list[str]
+    job_context: str
+    best_practices: list[str]
+
+
+def _quote_text(quote: str) -> str:
+    return " ".join(WORD_PATTERN.findall(quote.lower()))
+
+
+def quotes_overlap(a: str, b: str) -> bool:
+    a_text, b_text = _quote_text(a), _quote_text(b)
+    if min(len(a_text.split()), len(b_text.split())) < MIN_QUOTE_WORDS:
+        return False
+    # Judges often cite a truncated ("...") form of the same sentence another judge quoted in full. Padding with spaces
+    # compares whole words, so "led the team" is not found inside "cancelled the team".
+    if f" {a_text} " in f" {b_text} " or f" {b_text} " in f" {a_text} ":
+        return True
+    a_words, b_words = set(a_text.split()), set(b_text.split())
+    return len(a_words & b_words) / len(a_words | b_words) >= QUOTE_OVERLAP_THRESHOLD
+
+
+def _add_quote(quotes: list[str], quote: str) -> None:
+    # Keep the longest version of each piece of evidence
+    for index, existing in enumerate(quotes):
+        if quotes_overlap(existing, quote):
+            if len(_quote_text(quote)) > len(_quote_text(existing)):
+                quotes[index] = quote
+            return
+    quotes.append(quote)
+
+
+def _add_unique(values: list[str], value: str) -> None:
+    if value and value not in values:
+        values.append(value)
+
+
+def merge_feedback(evaluations: dict[str, JudgeEvaluation]) -> list[MergedFeedbackPoint]:
+    """
+    Deterministically merges feedback points of the same polarity that cite overlapping quotes, across and within judges.
+    Ordered by how many judges raised the point, then severity, then first appearance.
+    """
+    points = [(judge, point) for judge, evaluation in evaluations.items() for point in evaluation.feedback_points]
+
+    parent = list(range(len(points)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for i, (_, a) in enumerate(points):
+        for j in range(i + 1, len(points)):
+            b = points[j][1]
+            if a.polarity == b.polarity and any(quotes_overlap(qa, qb) for qa in a.quotes for qb in b.quotes):
+                parent[find(j)] = find(i)
+
+    clusters: dict[int, list[int]] = {}
+    for index in range(len(points)):
+        clusters.setdefault(find(index), []).append(index)
+
+    merged = []
+    for members in clusters.values():
+        first_judge, first_point = points[members[0]]
+        point = MergedFeedbackPoint(
+            polarity=first_point.polarity,
+            severity=max((points[index][1].severity for index in members), key=SEVERITY_RANK.get),
+            judges=[],
+            criteria=[],
+            quotes=[],
+            rationales=[],
+            job_context=max((points[index][1].job_context for index in members), key=len),
+            best_practices=[],
+        )
+        for index in members:
+            judge, source = points[index]
+            _add_unique(point.judges, judge)
+            _add_unique(point.criteria, source.criterion)
+            for quote in source.quotes:
+                _add_quote(point.quotes, quote)
+            if source.rationale:
+                _add_unique(point.rationales, f"{judge}: {source.rationale}")
+            _add_unique(point.best_practices, source.best_practice)
+        merged.append((members[0], point))
+
+    merged.sort(key=lambda item: (-len(item[1].judges), -SEVERITY_RANK[item[1].severity], item[0]))
+    return [point for _, point in merged]
+
+
+def format_merged_feedback(evaluations: dict[str, JudgeEvaluation], merged: list[MergedFeedbackPoint]) -> str:
+    # Replaces combine_evaluations as the aggregator's input when judges return structured output
+    lines = ["# Judge Summaries", ""]
+    for judge, evaluation in evaluations.items():
+        lines.append(f"- **{judge}**: {evaluation.summary}")
+
+    lines.extend(["", "# Merged Feedback Points"])
+    for number, point in enumerate(merged, start=1):
+        lines.extend([
+            "",
+            f"## {number}. {point.polarity.capitalize()} ({point.severity} severity) — {'; '.join(point.criteria)}",
+            f"- **Raised by**: {', '.join(point.judges)}",
+            f"- **Quotes**: {' / '.join(f'“{quote}”' for quote in point.quotes)}",
+            "- **Rationale**:",
+            *(f"  - {rationale}" for rationale in point.rationales),
+            f"- **Job context**: {point.job_context}",
+            "- **Best practices**:",
+            *(f"  - {best_practice}" for best_practice in point.best_practices),
+        ])
+    return "\n".join(lines)
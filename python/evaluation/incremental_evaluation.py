@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, AsyncIterator
+
+from constants.constants import JobListingResearchResponse, JudgeEvaluation
+from evaluation.context_planner import DEFAULT_CONTEXT_TOKEN_BUDGET, plan_judge_context
+from evaluation.feedback_merge import MergedFeedbackPoint, format_merged_feedback, merge_feedback
+from llm.tokens import estimate_tokens
+from pipeline import stages
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+# Judges whose criteria can be scored one answer at a time. Fit (requirement coverage, motivation) and Risk
+# (contradictions, repeated missing results) only make sense over the whole interview and are re-run on the transcript so far.
+PER_EXCHANGE_JUDGES = ["Content Evaluation", "Structure Evaluation", "Communication Evaluation"]
+WHOLE_INTERVIEW_JUDGES = [name for name in stages.JUDGE_PROMPTS if name not in PER_EXCHANGE_JUDGES]
+
+# The whole-interview judges re-run in the background on the transcript so far after every this many exchanges, so
+# finish() normally finds their result current. Each pass reads the whole transcript; raise it to trade report
+# latency for cost.
+WHOLE_INTERVIEW_EVERY = 1
+
+# How much of the earlier interview each exchange is judged alongside, most recent exchanges first
+PRIOR_EXCHANGE_TOKEN_BUDGET = 1500
+
+# Prepended to each exchange so the judges score the excerpt rather than penalise it for being an incomplete interview
+EXCHANGE_NOTE = (
+    "Note: this is exchange {number} of an interview that is still in progress. Evaluate only this question and answer; "
+    "do not comment on missing parts of the interview, the opening or the close. Earlier exchanges, when shown, are there "
+    "so you can judge this answer against them (consistency, follow-ups, repetition); do not evaluate them again.\n\n"
+)
+
+
+class IncrementalEvaluator:
+    """
+    Scores the interview one question/answer exchange at a time, in the background while the interview continues.
+    Call record_turn() after every interviewer reply; once the candidate answers a question, the per-answer judges run
+    on that exchange with the most recent earlier exchanges as context and only the research and guide sections their
+    criteria need. The whole-interview judges re-run in the background on the transcript so far, and finish() reuses
+    that pass when no turn has arrived since, so the closing report normally waits only on the aggregator.
+    """
+
+    def __init__(self, async_client: AsyncOpenAI, listing: JobListingResearchResponse, deep_research_results: str, interview_guide: str, max_concurrency: int = 5, layout: str = stages.SHARED_PREFIX_LAYOUT, context_budget: int | None = DEFAULT_CONTEXT_TOKEN_BUDGET, prior_exchange_tokens: int = PRIOR_EXCHANGE_TOKEN_BUDGET, whole_interview_every: int = WHOLE_INTERVIEW_EVERY):
+        self.async_client = async_client
+        self.listing = listing
+        self.deep_research_results = deep_research_results
+        self.interview_guide = interview_guide
+        # The shared-prefix layout keeps each judge's research and guide as a cached prefix across exchanges
+        self.layout = layout
+        self.prior_exchange_tokens = prior_exchange_tokens
+        self.whole_interview_every = whole_interview_every
+
+        # Judge -> (research, guide) it is sent; context_budget=None sends every judge everything
+        self.judge_context: dict[str, tuple[str, str]] = {}
+        for name in stages.JUDGE_PROMPTS:
+            if context_budget is None:
+                self.judge_context[name] = (deep_research_results, interview_guide)
+            else:
+                context = plan_judge_context(name, deep_research_results, interview_guide, context_budget)
+                self.judge_context[name] = (context.deep_research_results, context.interview_guide)
+
+        self.messages: list[dict] = []
+        self.exchanges: list[list[dict]] = []
+        self.exchange_evaluations: dict[int, dict[str, JudgeEvaluation]] = {}
+        self.failures: dict[int, list[str]] = {}
+        self.interview_evaluations: dict[str, JudgeEvaluation] = {}
+        self.interview_failures: list[str] = []
+        # Number of messages the current interview_evaluations were judged on
+        self._interview_judged_at: int | None = None
+        self._interview_task: asyncio.Task | None = None
+        self._interview_due = False
+        self.interview_passes = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def exchange_count(self) -> int:
+        return len(self.exchanges)
+
+    def record_turn(self, user_message: str, assistant_reply: str) -> None:
+        # The candidate's message answers the interviewer's previous reply; the first message is the greeting
+        if self.messages and self.messages[-1]["role"] == "assistant":
+            self._schedule_exchange([self.messages[-1], {"role": "user", "content": user_message}])
+        self.messages.append({"role": "user", "content": user_message})
+        self.messages.append({"role": "assistant", "content": assistant_reply})
+        if self.exchanges and self.exchange_count % self.whole_interview_every == 0:
+            self._refresh_interview()
+
+    def _earlier_exchanges(self, number: int) -> str:
+        # Whole exchanges, newest first, until the budget runs out; printed back in interview order
+        earlier: list[str] = []
+        remaining = self.prior_exchange_tokens
+        for previous in range(number - 1, 0, -1):
+            text = f"Exchange {previous}:\n" + stages.format_interview_transcript(self.exchanges[previous - 1])
+            if estimate_tokens(text) > remaining:
+                break
+            earlier.insert(0, text)
+            remaining -= estimate_tokens(text)
+        return "".join(earlier)
+
+    def _schedule_exchange(self, exchange: list[dict]) -> None:
+        self.exchanges.append(exchange)
+        number = self.exchange_count
+        transcript = EXCHANGE_NOTE.format(number=number)
+        earlier = self._earlier_exchanges(number)
+        if earlier:
+            transcript += f"Earlier in the interview (context only):\n\n{earlier}Exchange {number} (evaluate this one):\n"
+        transcript += stages.format_interview_transcript(exchange)
+        self._tasks.append(asyncio.create_task(self._evaluate_exchange(number, transcript)))
+
+    async def _judge(self, name: str, transcript: str) -> JudgeEvaluation:
+        deep_research_results, interview_guide = self.judge_context[name]
+        async with self._semaphore:
+            return await stages.evaluate_interview_structured(
+                self.async_client, name, self.listing, deep_research_results, interview_guide, transcript, self.layout,
+            )
+
+    async def _evaluate_exchange(self, number: int, transcript: str) -> None:
+        results = await asyncio.gather(*(self._judge(name, transcript) for name in PER_EXCHANGE_JUDGES), return_exceptions=True)
+        self.exchange_evaluations[number] = {name: result for name, result in zip(PER_EXCHANGE_JUDGES, results) if isinstance(result, JudgeEvaluation)}
+        failed = [name for name, result in zip(PER_EXCHANGE_JUDGES, results) if not isinstance(result, JudgeEvaluation)]
+        if failed:
+            self.failures[number] = failed
+
+    def _refresh_interview(self) -> asyncio.Task | None:
+        # One background pass at a time; a refresh requested mid-pass runs as soon as that pass lands
+        if self._interview_judged_at == len(self.messages):
+            return None
+        self._interview_due = True
+        if self._interview_task is None or self._interview_task.done():
+            self._interview_task = asyncio.create_task(self._evaluate_interview())
+        return self._interview_task
+
+    async def _evaluate_interview(self) -> None:
+        while self._interview_due:
+            self._interview_due = False
+            judged_at = len(self.messages)
+            transcript = stages.format_interview_transcript(self.messages[:judged_at])
+            results = await asyncio.gather(*(self._judge(name, transcript) for name in WHOLE_INTERVIEW_JUDGES), return_exceptions=True)
+            self.interview_passes += 1
+            self.interview_evaluations = {name: result for name, result in zip(WHOLE_INTERVIEW_JUDGES, results) if isinstance(result, JudgeEvaluation)}
+            self.interview_failures = [name for name, result in zip(WHOLE_INTERVIEW_JUDGES, results) if not isinstance(result, JudgeEvaluation)]
+            self._interview_judged_at = judged_at
+
+    def pending_exchanges(self) -> int:
+        return sum(not task.done() for task in self._tasks)
+
+    async def finish(self) -> dict[str, JudgeEvaluation]:
+        # Normally only the final exchange is still running, and the background whole-interview pass is current (or
+        # finishing) by the time the candidate ends the interview
+        if not self.exchanges:
+            return {}
+        await asyncio.gather(*self._tasks)
+        # Reuses the background pass when no turn has arrived since it was judged
+        while (interview := self._refresh_interview()) is not None:
+            await interview
+        return self.evaluations()
+
+    def evaluations(self) -> dict[str, JudgeEvaluation]:
+        # One evaluation per judge: per-answer judges get their feedback points from every exchange, in interview order
+        combined = {}
+        for name in stages.JUDGE_PROMPTS:
+            if name in self.interview_evaluations:
+                combined[name] = self.interview_evaluations[name]
+                continue
+            per_exchange = [(number, self.exchange_evaluations[number][name]) for number in sorted(self.exchange_evaluations) if name in self.exchange_evaluations[number]]
+            if not per_exchange:
+                continue
+            combined[name] = JudgeEvaluation(
+                feedback_points=[point for _, evaluation in per_exchange for point in evaluation.feedback_points],
+                summary=" ".join(f"[Exchange {number}] {evaluation.summary}" for number, evaluation in per_exchange),
+            )
+        return combined
+
+    def merged_feedback(self) -> list[MergedFeedbackPoint]:
+        return merge_feedback(self.evaluations())
+
+    def aggregator_input(self) -> str:
+        evaluations = self.evaluations()
+        return format_merged_feedback(evaluations, merge_feedback(evaluations))
+
+    async def stream_report(self) -> AsyncIterator[str]:
+        if not await self.finish():
+            raise RuntimeError("No completed question/answer exchange to evaluate")
+        async for token in stages.aggregate_evaluations_stream_async(self.async_client, self.listing, self.aggregator_input()):
+            yield token
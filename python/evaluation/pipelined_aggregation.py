@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, AsyncIterator
+
+from constants.constants import JobListingResearchResponse, JudgeEvaluation
+from evaluation.feedback_merge import MergedFeedbackPoint, format_merged_feedback, merge_feedback
+from pipeline import stages
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+# What to do with a judge that misses the deadline: leave it out, or race a faster fallback model against it
+DROP_STRAGGLERS = "drop"
+FALLBACK_STRAGGLERS = "fallback"
+
+# Judge statuses
+COMPLETED = "completed"
+COMPLETED_BY_FALLBACK = "completed_by_fallback"
+DROPPED = "dropped"
+FAILED = "failed"
+
+
+class PipelinedEvaluation:
+    """
+    Runs the five structured judges and merges each one's feedback as soon as it lands (completion order), then streams
+    the aggregator's coaching report. Judges still running at the deadline are dropped or raced against a fallback
+    model, and under the fallback policy a judge whose call fails gets its fallback straight away. Once only one judge
+    is outstanding after speculate_after seconds, the aggregator starts on the other four; the run is kept if that
+    judge is then dropped, so one slow judge no longer sets the report latency.
+    """
+
+    def __init__(self, async_client: AsyncOpenAI, listing: JobListingResearchResponse, deep_research_results: str, interview_guide: str, interview_transcript: str, judge_timeout: float = 45.0, straggler_policy: str = DROP_STRAGGLERS, fallback_timeout: float = 20.0, layout: str = stages.JUDGE_FIRST_LAYOUT, speculate_after: float | None = 30.0):
+        self.async_client = async_client
+        self.listing = listing
+        self.deep_research_results = deep_research_results
+        self.interview_guide = interview_guide
+        self.interview_transcript = interview_transcript
+        self.judge_timeout = judge_timeout
+        self.straggler_policy = straggler_policy
+        self.fallback_timeout = fallback_timeout
+        self.layout = layout
+        # None waits for every judge (or the deadline) before starting the aggregator
+        self.speculate_after = speculate_after
+
+        self.evaluations: dict[str, JudgeEvaluation] = {}
+        self.judge_status: dict[str, str] = {}
+        self.merged: list[MergedFeedbackPoint] = []
+        self.speculative_report_kept: bool | None = None
+        self._landed = asyncio.Event()
+
+    def _start_judge(self, name: str, model: str) -> asyncio.Task:
+        return asyncio.create_task(stages.evaluate_interview_structured(
+            self.async_client, name, self.listing, self.deep_research_results, self.interview_guide, self.interview_transcript, self.layout, model,
+        ))
+
+    def _land(self, name: str, task: asyncio.Task, status: str) -> bool:
+        # Always retrieve the exception, including for a judge already answered by its other call
+        error = task.exception()
+        if error is not None:
+            logger.warning("%s call (%s) failed: %r", name, status, error)
+            self.judge_status.setdefault(name, FAILED)
+            return False
+        if name in self.evaluations:
+            return True
+        self.evaluations[name] = task.result()
+        self.judge_status[name] = status
+
+        # Re-merge on every arrival so the aggregator input is ready the moment the last judge lands
+        self.merged = merge_feedback({judge: self.evaluations[judge] for judge in stages.JUDGE_PROMPTS if judge in self.evaluations})
+        self._landed.set()
+        return True
+
+    async def collect(self) -> dict[str, JudgeEvaluation]:
+        loop = asyncio.get_running_loop()
+        tasks: dict[asyncio.Task, tuple[str, str]] = {}
+        deadlines: dict[asyncio.Task, float] = {}
+        fell_back: set[str] = set()
+        pending: set[asyncio.Task] = set()
+
+        def start(name: str, model: str, status: str, timeout: float) -> asyncio.Task:
+            task = self._start_judge(name, model)
+            tasks[task] = (name, status)
+            deadlines[task] = loop.time() + timeout
+            pending.add(task)
+            return task
+
+        def fall_back(name: str) -> bool:
+            if self.straggler_policy != FALLBACK_STRAGGLERS or name in fell_back:
+                return False
+            fell_back.add(name)
+            start(name, stages.JUDGE_FALLBACK_MODEL, COMPLETED_BY_FALLBACK, self.fallback_timeout)
+            return True
+
+        for name in stages.JUDGE_PROMPTS:
+            start(name, stages.JUDGE_MODEL, COMPLETED, self.judge_timeout)
+
+        try:
+            while pending:
+                for task in [task for task in pending if deadlines[task] <= loop.time()]:
+                    name = tasks[task][0]
+                    fallback = fall_back(name)
+                    if fallback:
+                        # The original call keeps racing its fallback until the fallback's deadline
+                        deadlines[task] = max(deadlines[other] for other in pending if tasks[other][0] == name)
+                    else:
+                        task.cancel()
+                        pending.discard(task)
+                if not pending:
+                    break
+
+                timeout = min(deadlines[task] for task in pending) - loop.time()
+                done, _ = await asyncio.wait(pending, timeout=max(timeout, 0), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.discard(task)
+                    name, status = tasks[task]
+                    # A judge that fails fast gets its fallback now rather than being dropped at the deadline
+                    if not self._land(name, task, status) and name not in self.evaluations:
+                        fall_back(name)
+
+                # A judge answered by either its original or its fallback call no longer needs the other one
+                for task in [task for task in pending if tasks[task][0] in self.evaluations]:
+                    task.cancel()
+                    pending.discard(task)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        for name in stages.JUDGE_PROMPTS:
+            self.judge_status.setdefault(name, DROPPED)
+        return self.evaluations
+
+    def aggregator_input(self) -> str:
+        combined_evaluations = format_merged_feedback(self.evaluations, self.merged)
+        missing = [name for name in stages.JUDGE_PROMPTS if name not in self.evaluations]
+        if missing:
+            combined_evaluations += f"\n\nNote: the {', '.join(missing)} did not finish in time. Do not mention the missing evaluations in the report."
+        return combined_evaluations
+
+    def _start_aggregator(self, aggregator_input: str) -> tuple[str, asyncio.Queue, asyncio.Task]:
+        # Tokens are buffered so a speculative run can get ahead while the last judge is still running
+        tokens: asyncio.Queue = asyncio.Queue()
+
+        async def run() -> None:
+            try:
+                async for token in stages.aggregate_evaluations_stream_async(self.async_client, self.listing, aggregator_input):
+                    tokens.put_nowait(token)
+            finally:
+                tokens.put_nowait(None)
+
+        return aggregator_input, tokens, asyncio.create_task(run())
+
+    async def _speculate(self, collecting: asyncio.Task) -> tuple[str, asyncio.Queue, asyncio.Task] | None:
+        await asyncio.wait({collecting}, timeout=self.speculate_after)
+        while not collecting.done():
+            if len(self.evaluations) == len(stages.JUDGE_PROMPTS) - 1:
+                return self._start_aggregator(self.aggregator_input())
+            self._landed.clear()
+            landed = asyncio.create_task(self._landed.wait())
+            await asyncio.wait({collecting, landed}, return_when=asyncio.FIRST_COMPLETED)
+            landed.cancel()
+        return None
+
+    async def stream_report(self) -> AsyncIterator[str]:
+        collecting = asyncio.create_task(self.collect())
+        aggregator = None
+        try:
+            if self.speculate_after is not None:
+                aggregator = await self._speculate(collecting)
+            await collecting
+            if not self.evaluations:
+                raise RuntimeError("No judge finished before the deadline")
+
+            # The speculative run is kept only if the last judge never landed, so its input is still the final one
+            aggregator_input = self.aggregator_input()
+            if aggregator is not None:
+                self.speculative_report_kept = aggregator[0] == aggregator_input
+                if not self.speculative_report_kept:
+                    aggregator[2].cancel()
+                    aggregator = None
+            if aggregator is None:
+                aggregator = self._start_aggregator(aggregator_input)
+
+            _, tokens, run = aggregator
+            while (token := await tokens.get()) is not None:
+                yield token
+            # Re-raises an aggregator failure after whatever it streamed
+            await run
+        finally:
+            collecting.cancel()
+            if aggregator is not None:
+                aggregator[2].cancel()
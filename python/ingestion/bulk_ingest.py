@@ -0,0 +1,185 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+from typing import Iterator
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+from constants.constants import JobListingResearchResponse
+from ingestion.canonical_urls import canonical_url
+from ingestion.fetchers import FirecrawlFetcher, HttpxFetcher, PageCache, PageFetcher
+from ingestion.listing_preprocessor import preprocess_listing
+from llm.rate_limiter import RateLimiter
+from llm.tokens import estimate_message_tokens
+from pipeline import stages
+
+MAX_ATTEMPTS = 3
+EXPECTED_EXTRACTION_COMPLETION_TOKENS = 800
+
+logger = logging.getLogger(__name__)
+
+
+def read_urls(path: str) -> Iterator[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            url = line.strip()
+            if url and not url.startswith("#"):
+                yield url
+
+
+class BulkIngestion:
+    """
+    Turns many listing URLs into a JSONL of JobListingResearchResponse records. URLs are deduped on their canonical
+    form before fetching, and pages on the hash of their cleaned content before extraction, so re-posts and
+    tracking-parameter variants never cost an extraction call. The output file is the checkpoint for resuming.
+    """
+
+    def __init__(self, async_client: AsyncOpenAI, fetcher: PageFetcher, output_path: str, workers: int = 16, limiter: RateLimiter | None = None):
+        self.async_client = async_client
+        self.fetcher = fetcher
+        self.output_path = output_path
+        self.workers = workers
+        self.limiter = limiter or RateLimiter()
+
+        self.seen_urls: set[str] = set()
+        self.listings_by_content: dict[str, JobListingResearchResponse] = {}
+        self._extractions: dict[str, asyncio.Task] = {}
+        self._write_lock = asyncio.Lock()
+        self.counts = {"extracted": 0, "duplicate_url": 0, "duplicate_content": 0, "failed": 0}
+        # URL -> repr of the last error, for URLs that are not in the output and will be retried on the next run
+        self.failures: dict[str, str] = {}
+
+        self._load_checkpoint()
+
+    def _load_checkpoint(self) -> None:
+        if not os.path.exists(self.output_path):
+            return
+        with open(self.output_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.seen_urls.add(record["canonical_url"])
+                self.listings_by_content.setdefault(record["content_hash"], JobListingResearchResponse(**record["listing"]))
+
+    async def _write(self, record: dict) -> None:
+        async with self._write_lock:
+            with open(self.output_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    async def _extract(self, listing_text: str) -> JobListingResearchResponse:
+        messages = stages.job_parsing_messages(listing_text)
+        async with self.limiter.reserve(estimate_message_tokens(messages) + EXPECTED_EXTRACTION_COMPLETION_TOKENS):
+            return await stages.extract_job_listing_attributes_async(self.async_client, listing_text)
+
+    async def _listing_for(self, content_hash: str, listing_text: str) -> tuple[JobListingResearchResponse, bool]:
+        if content_hash in self.listings_by_content:
+            return self.listings_by_content[content_hash], True
+
+        # Two URLs with identical content in flight at once share a single extraction
+        task = self._extractions.get(content_hash)
+        if task is not None:
+            return await task, True
+        task = self._extractions[content_hash] = asyncio.create_task(self._extract(listing_text))
+        try:
+            listing = await task
+        finally:
+            del self._extractions[content_hash]
+        self.listings_by_content[content_hash] = listing
+        return listing, False
+
+    def _fail(self, url: str, error: Exception) -> None:
+        self.counts["failed"] += 1
+        self.failures[url] = repr(error)
+        logger.warning("Ingestion failed for %s: %r", url, error)
+
+    async def ingest(self, url: str) -> None:
+        # The canonical form is only the dedup key; the page is fetched from the URL as given
+        try:
+            canonical = canonical_url(url)
+        except Exception as error:
+            self._fail(url, error)
+            return
+        if canonical in self.seen_urls:
+            self.counts["duplicate_url"] += 1
+            return
+        self.seen_urls.add(canonical)
+
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                page = await self.fetcher.fetch(url)
+                listing_text = preprocess_listing(page.content).text
+                content_hash = hashlib.sha256(listing_text.encode()).hexdigest()
+                listing, duplicate = await self._listing_for(content_hash, listing_text)
+                break
+            except Exception as error:
+                if attempt == MAX_ATTEMPTS:
+                    # Not written to the output, so the next run retries it
+                    self.seen_urls.discard(canonical)
+                    self._fail(url, error)
+                    return
+                await asyncio.sleep(2 ** attempt + random.random())
+
+        self.counts["duplicate_content" if duplicate else "extracted"] += 1
+        await self._write({
+            "url": url,
+            "canonical_url": canonical,
+            "content_hash": content_hash,
+            "duplicate": duplicate,
+            "listing": listing.model_dump(),
+        })
+
+    async def run(self, urls: Iterator[str]) -> dict[str, int]:
+        # A bounded queue gives backpressure: URLs are read only as fast as workers drain them
+        queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=self.workers * 2)
+
+        async def worker() -> None:
+            while (url := await queue.get()) is not None:
+                await self.ingest(url)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.workers)]
+        for url in urls:
+            await queue.put(url)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+        return self.counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Extract JobListingResearchResponse records from many listing URLs.")
+    parser.add_argument("urls", help="Text file with one listing URL per line")
+    parser.add_argument("--output", required=True, help="JSONL of listing records; also the checkpoint used to resume")
+    parser.add_argument("--backend", choices=["firecrawl", "httpx"], default="firecrawl")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--tokens-per-minute", type=int, default=200_000)
+    parser.add_argument("--page-cache", default="./page_cache")
+    args = parser.parse_args()
+
+    load_dotenv(override=True)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    cache = PageCache(args.page_cache)
+    if args.backend == "firecrawl":
+        from firecrawl import Firecrawl
+        fetcher = FirecrawlFetcher(Firecrawl(api_key=os.getenv("FIRECRAWL_API_KEY")), cache)
+    else:
+        fetcher = HttpxFetcher(cache)
+
+    async def run() -> dict[str, int]:
+        ingestion = BulkIngestion(AsyncOpenAI(), fetcher, args.output, args.workers, RateLimiter(args.workers, args.tokens_per_minute))
+        try:
+            return await ingestion.run(read_urls(args.urls))
+        finally:
+            await fetcher.aclose()
+
+    print(json.dumps(asyncio.run(run())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query params that only track where a click came from
+TRACKING_PARAMS = {
+    "from", "tk", "campaignid", "advn", "adid", "ad", "sjdu", "acatk", "pub", "xkcb", "xpse", "xfps", "gclid", "fbclid",
+    "msclkid", "ref", "refid", "trk", "trackingid", "src", "source", "gh_src", "lever-source", "lever-origin", "mc_cid", "mc_eid",
+}
+
+LINKEDIN_JOB_PATH = re.compile(r"^/jobs/view/(?:[^/]*-)?(\d+)")
+GREENHOUSE_JOB_PATH = re.compile(r"^/([^/]+)/jobs/(\d+)")
+LEVER_JOB_PATH = re.compile(r"^/([^/]+)/([0-9a-f-]{36})")
+
+
+def _host(netloc: str) -> str:
+    # Mobile subdomains serve the same posting; anything else (www., regional subdomains) is kept so the URL still resolves
+    host = netloc.lower().split("@")[-1].split(":")[0]
+    for prefix in ("m.", "mobile."):
+        if host.startswith(prefix):
+            return host[len(prefix):]
+    return host
+
+
+def _on_site(host: str, domain: str) -> bool:
+    return host == domain or host.endswith(f".{domain}")
+
+
+def _first(pairs: list[tuple[str, str]], *names: str) -> str | None:
+    for name in names:
+        for key, value in pairs:
+            if key == name:
+                return value
+    return None
+
+
+def _route(fragment: str) -> str:
+    # Hash-routed boards (#/job/123, #!/job/123) keep the posting in the fragment; any other fragment is an in-page anchor
+    return fragment if fragment.startswith(("/", "!")) else ""
+
+
+def canonical_url(url: str) -> str:
+    """
+    Reduces a listing URL to one form per posting, so tracking-parameter and mobile variants dedupe. The result is a
+    dedup key that still resolves; callers fetch the URL they were given. Raises ValueError for an unparseable URL.
+    """
+    parts = urlsplit(url.strip())
+    host = _host(parts.netloc)
+    if not host:
+        raise ValueError(f"Not an absolute URL: {url!r}")
+    # Pairs rather than a dict so repeated keys (?skill=a&skill=b) all survive
+    query = parse_qsl(parts.query, keep_blank_values=False)
+
+    # Site-specific job ids
+    job_key = _first(query, "jk", "vjk")
+    if _on_site(host, "indeed.com") and job_key:
+        # Regional sites (uk.indeed.com) keep their host; the bare domain only redirects to www
+        return f"https://{'www.indeed.com' if host == 'indeed.com' else host}/viewjob?jk={job_key.lower()}"
+    if _on_site(host, "linkedin.com"):
+        match = LINKEDIN_JOB_PATH.match(parts.path)
+        job_id = match.group(1) if match else _first(query, "currentJobId")
+        if job_id:
+            return f"https://www.linkedin.com/jobs/view/{job_id}"
+    if _on_site(host, "greenhouse.io"):
+        match = GREENHOUSE_JOB_PATH.match(parts.path)
+        if match:
+            return f"https://boards.greenhouse.io/{match.group(1).lower()}/jobs/{match.group(2)}"
+    if host == "jobs.lever.co":
+        match = LEVER_JOB_PATH.match(parts.path)
+        if match:
+            return f"https://jobs.lever.co/{match.group(1).lower()}/{match.group(2).lower()}"
+
+    # Generic: drop tracking params and anchor fragments, sort what's left
+    kept = sorted((key, value) for key, value in query if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_"))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", host, path, urlencode(kept), _route(parts.fragment)))
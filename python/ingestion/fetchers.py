@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    import httpx
+
+USER_AGENT = "Mozilla/5.0 (compatible; InterviewProBot/1.0)"
+
+
+@dataclass
+class FetchedPage:
+    url: str
+    content: str
+    content_format: str  # "markdown" or "html"
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = 0.0
+    not_modified: bool = False  # True when the server answered 304 and the cached copy was reused
+
+
+class PageFetcher(Protocol):
+    async def fetch(self, url: str) -> FetchedPage: ...
+
+    async def aclose(self) -> None: ...
+
+
+class PageCache:
+    """Gzip-compressed on-disk copies of fetched pages with the validators needed to revalidate them."""
+
+    def __init__(self, directory: str = "./page_cache"):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory, f"{hashlib.sha256(url.encode()).hexdigest()}.json.gz")
+
+    def get(self, url: str) -> FetchedPage | None:
+        try:
+            with gzip.open(self._path(url), "rt", encoding="utf-8") as f:
+                return FetchedPage(**json.load(f))
+        except (FileNotFoundError, EOFError, json.JSONDecodeError):
+            return None
+
+    def put(self, page: FetchedPage) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+            json.dump({**asdict(page), "not_modified": False}, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(page.url))
+
+
+def _conditional_headers(cached: FetchedPage | None) -> dict[str, str]:
+    headers = {"User-Agent": USER_AGENT}
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached and cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+    return headers
+
+
+def _pooled_client(max_connections: int, timeout: float) -> httpx.AsyncClient:
+    # Imported here so modules that only need the PageFetcher protocol don't pay for httpx
+    import httpx
+
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        timeout=timeout,
+        follow_redirects=True,
+    )
+
+
+class HttpxFetcher:
+    """Fetches listing pages directly over one pooled client, revalidating cached copies with ETag / Last-Modified."""
+
+    def __init__(self, cache: PageCache | None = None, max_concurrency: int = 10, max_connections: int = 20, timeout: float = 20.0):
+        self.cache = cache or PageCache()
+        self.client = _pooled_client(max_connections, timeout)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(self, url: str) -> FetchedPage:
+        cached = self.cache.get(url)
+        async with self._semaphore:
+            response = await self.client.get(url, headers=_conditional_headers(cached))
+
+        if response.status_code == 304 and cached:
+            cached.not_modified = True
+            return cached
+
+        response.raise_for_status()
+        page = FetchedPage(
+            url=url,
+            content=response.text,
+            content_format="html",
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            fetched_at=time.time(),
+        )
+        self.cache.put(page)
+        return page
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+class FirecrawlFetcher:
+    """
+    Scrapes with Firecrawl for clean markdown, but first revalidates the cached copy with a conditional HEAD so an
+    unchanged listing costs a single 304 instead of a scrape. No body is downloaded either way: a changed page is
+    scraped by Firecrawl anyway.
+    """
+
+    def __init__(self, firecrawl, cache: PageCache | None = None, max_concurrency: int = 5, max_connections: int = 20, timeout: float = 20.0):
+        self.firecrawl = firecrawl
+        self.cache = cache or PageCache()
+        self.client = _pooled_client(max_connections, timeout)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _request(self, method: str, url: str, cached: FetchedPage | None) -> httpx.Response | None:
+        import httpx
+
+        try:
+            return await self.client.request(method, url, headers=_conditional_headers(cached))
+        except httpx.HTTPError:
+            # Revalidation is only an optimization; fall through to a full scrape
+            return None
+
+    async def fetch(self, url: str) -> FetchedPage:
+        cached = self.cache.get(url)
+        etag = last_modified = None
+
+        async with self._semaphore:
+            # Conditional when the cached copy has validators; otherwise (a new URL, or an earlier HEAD that failed or
+            # returned none) it learns them so the next run can revalidate
+            response = await self._request("HEAD", url, cached)
+            if cached and response is not None and response.status_code == 304:
+                cached.not_modified = True
+                return cached
+            if response is not None and response.is_success:
+                etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+            document = await asyncio.to_thread(self.firecrawl.scrape, url, formats=["markdown"])
+
+        page = FetchedPage(
+            url=url,
+            content=document.markdown,
+            content_format="markdown",
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=time.time(),
+        )
+        self.cache.put(page)
+        return page
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
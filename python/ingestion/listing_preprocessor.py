@@ -0,0 +1,118 @@
+import re
+from dataclasses import dataclass
+
+from llm.tokens import estimate_tokens
+
+# Headings that start the page furniture job boards put after the posting ("similar jobs", salary links, career guides)
+BOILERPLATE_SECTION_PATTERN = re.compile(
+    r"^(#+\s*|\*\*)?\s*(report job|company and salary information|jobs with similar titles|similar job|similar jobs|"
+    r"career guide|people also (searched|viewed)|related (jobs|searches)|more jobs|explore (more|other) jobs|"
+    r"recommended jobs|salary (search|information)|cookie|privacy (policy|preferences))",
+    re.IGNORECASE,
+)
+
+# Lines with no job content: images, spacer entities, and bare UI labels
+NOISE_LINE_PATTERN = re.compile(r"^(!\[.*\]\(.*\)|&nbsp;|\\+|apply now|save job|share|sign in|skip to main content)$", re.IGNORECASE)
+
+MARKDOWN_LINK_PATTERN = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+
+# Elements that never hold the posting itself
+HTML_NOISE_TAGS = ["script", "style", "noscript", "svg", "nav", "header", "footer", "aside", "form", "iframe"]
+
+# Common containers for the posting body, most specific first
+HTML_POSTING_SELECTORS = [
+    "[itemtype*='JobPosting']",
+    "#jobDescriptionText",
+    "[class*='job-description']",
+    "[class*='jobDescription']",
+    "[data-testid*='jobDescription']",
+    "main",
+    "article",
+    "[role='main']",
+]
+
+
+@dataclass
+class PreprocessedListing:
+    text: str
+    original_tokens: int
+    preprocessed_tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.preprocessed_tokens
+
+
+def looks_like_html(content: str) -> bool:
+    head = content[:2000].lower()
+    return "<html" in head or "<body" in head or "<div" in head
+
+
+def html_posting_text(html: str) -> str:
+    # bs4 is only needed for raw HTML, which the Firecrawl markdown path never produces
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "lxml")
+    for tag in soup(HTML_NOISE_TAGS):
+        tag.decompose()
+
+    region = None
+    for selector in HTML_POSTING_SELECTORS:
+        region = soup.select_one(selector)
+        if region is not None and len(region.get_text(strip=True)) > 200:
+            break
+        region = None
+    region = region or soup.body or soup
+
+    # Keep the page title: on most boards the posting container doesn't include the job title or company
+    title = soup.title.get_text(strip=True) if soup.title else ""
+    text = region.get_text("\n", strip=True)
+    return f"# {title}\n\n{text}" if title else text
+
+
+def _posting_region(lines: list[str]) -> list[str]:
+    # The first H1 is the job title on Indeed, LinkedIn and most ATS pages; anything before it is navigation
+    start = 0
+    for index, line in enumerate(lines[: max(1, len(lines) * 2 // 5)]):
+        if line.startswith("# "):
+            start = index
+            break
+
+    end = len(lines)
+    for index in range(start + 1, len(lines)):
+        if BOILERPLATE_SECTION_PATTERN.match(lines[index].strip()):
+            end = index
+            break
+    return lines[start:end]
+
+
+def clean_markdown(markdown: str) -> str:
+    # Keep link text (often the company name) but drop the tracking-laden URLs; link text can span lines
+    markdown = MARKDOWN_LINK_PATTERN.sub(lambda match: match.group(1), markdown.replace("\r\n", "\n"))
+    lines = [line.rstrip().rstrip("\\").rstrip() for line in markdown.split("\n")]
+
+    cleaned = []
+    seen = set()
+    for line in _posting_region(lines):
+        stripped = line.strip()
+
+        if NOISE_LINE_PATTERN.match(stripped):
+            continue
+        if stripped and stripped in seen and not stripped.startswith(("-", "*", "#")):
+            continue
+        if not stripped and (not cleaned or not cleaned[-1].strip()):
+            continue
+
+        seen.add(stripped)
+        cleaned.append(line)
+
+    return "\n".join(cleaned).strip()
+
+
+def preprocess_listing(content: str) -> PreprocessedListing:
+    text = clean_markdown(html_posting_text(content) if looks_like_html(content) else content)
+    return PreprocessedListing(
+        text=text,
+        original_tokens=estimate_tokens(content),
+        preprocessed_tokens=estimate_tokens(text),
+    )
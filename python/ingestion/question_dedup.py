@@ -0,0 +1,224 @@
+import argparse
+import hashlib
+import json
+import re
+import struct
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from llm.tokens import estimate_tokens
+
+# A list item ("- ", "* ", "1. ") whose text is a question; deeper-indented lines below it (answer notes) belong to it
+QUESTION_PATTERN = re.compile(r"^(\s*)(?:[-*+]|\d+[.)])\s+(.*\?[\"”]?)\s*(?:\[×\d+\])?\s*$")
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Words that carry no topic; rewordings differ mostly in these ("Can you tell me about..." vs "Describe...")
+STOPWORDS = frozenset(
+    "a about an and any are as at be been being can could describe did do does during ever example explain for from give "
+    "had has have how i if in is it its me most my of on or our share so some tell that the this time to us was way "
+    "we were what whats when where which who why will with would you youd your youre".split()
+)
+SUFFIXES = ("ing", "ed", "es", "s", "ly")
+
+NUM_PERMUTATIONS = 64
+BANDS = 16  # 16 bands x 4 rows: pairs above ~0.5 Jaccard almost always share a bucket
+DEFAULT_THRESHOLD = 0.5
+_UNPACK = struct.Struct(f"<{NUM_PERMUTATIONS}I").unpack
+
+MERGED_NOTE = "Questions marked [×N] stand for N near-identical variants in the source question bank; weight them accordingly."
+
+
+@dataclass
+class Question:
+    line: int
+    text: str
+    notes: list[str] = field(default_factory=list)
+
+
+@dataclass
+class DedupedQuestionBank:
+    text: str
+    questions: int
+    clusters: int
+    counts: dict[str, int]
+    original_tokens: int
+    deduped_tokens: int
+
+    @property
+    def duplicates_removed(self) -> int:
+        return self.questions - self.clusters
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.deduped_tokens
+
+
+def _stem(word: str) -> str:
+    # Crude suffix stripping is enough to line up "preferred"/"prefer" and "managing"/"manage"
+    for suffix in SUFFIXES:
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            word = word[: -len(suffix)]
+            break
+    return word[:-1] if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "aeiou" else word
+
+
+def shingles(question: str) -> set[str]:
+    # Content words plus adjacent pairs: words catch reordering, pairs keep "time you failed" apart from "time you led"
+    words = [_stem(word) for word in WORD_PATTERN.findall(question.lower().replace("'", "").replace("’", "")) if word not in STOPWORDS]
+    return {*words, *(f"{first} {second}" for first, second in zip(words, words[1:]))}
+
+
+def _permuted(feature: str) -> tuple[int, ...]:
+    # One extendable-output hash yields all NUM_PERMUTATIONS 32-bit hashes of a shingle in a single C-level pass
+    return _UNPACK(hashlib.shake_128(feature.encode()).digest(4 * NUM_PERMUTATIONS))
+
+
+def minhash(features: set[str], cache: dict[str, tuple[int, ...]] | None = None) -> list[int]:
+    # Pass the same cache across a bank so a shingle shared by many questions is hashed once; the signature is then a
+    # column-wise min over the rows
+    cache = {} if cache is None else cache
+    rows = [cache[feature] if feature in cache else cache.setdefault(feature, _permuted(feature)) for feature in features]
+    return list(map(min, zip(*rows))) if rows else [0] * NUM_PERMUTATIONS
+
+
+def jaccard(first: set[str], second: set[str]) -> float:
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+def cluster_questions(questions: list[str], threshold: float = DEFAULT_THRESHOLD) -> list[list[int]]:
+    """
+    Groups near-duplicate questions with MinHash LSH: each question is hashed into BANDS buckets, and only questions that
+    share a bucket are compared, so the work grows with the number of questions rather than the number of pairs.
+    Returns clusters of indices, each in input order, ordered by their first member.
+    """
+    parent = list(range(len(questions)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int) -> None:
+        first, second = find(i), find(j)
+        if first != second:
+            parent[max(first, second)] = min(first, second)
+
+    # Identical questions after normalisation are merged up front so they don't crowd the LSH buckets
+    features: list[set[str]] = []
+    first_seen: dict[frozenset, int] = {}
+    unique: list[int] = []
+    for i, question in enumerate(questions):
+        features.append(shingles(question))
+        key = frozenset(features[i])
+        if key in first_seen:
+            union(first_seen[key], i)
+        else:
+            first_seen[key] = i
+            unique.append(i)
+
+    rows = NUM_PERMUTATIONS // BANDS
+    buckets: dict[tuple, int] = {}
+    permuted: dict[str, tuple[int, ...]] = {}
+    for i in unique:
+        signature = minhash(features[i], permuted)
+        for band in range(BANDS):
+            key = (band, *signature[band * rows:(band + 1) * rows])
+            # Each question is checked against the first one in the bucket; bands act as independent chances to match
+            if key in buckets:
+                if find(buckets[key]) != find(i) and jaccard(features[buckets[key]], features[i]) >= threshold:
+                    union(buckets[key], i)
+            else:
+                buckets[key] = i
+
+    clusters: dict[int, list[int]] = {}
+    for i in range(len(questions)):
+        clusters.setdefault(find(i), []).append(i)
+    return sorted(clusters.values(), key=lambda members: members[0])
+
+
+def parse_questions(markdown: str) -> list[Question]:
+    lines = markdown.splitlines()
+    questions: list[Question] = []
+    current, indent = None, 0
+    for number, line in enumerate(lines):
+        match = QUESTION_PATTERN.match(line)
+        if current is not None and line.strip() and len(line) - len(line.lstrip()) > indent:
+            current.notes.append(line)
+        elif match:
+            current, indent = Question(number, match.group(2)), len(match.group(1))
+            questions.append(current)
+        else:
+            current = None
+    return questions
+
+
+def dedupe_question_bank(markdown: str, threshold: float = DEFAULT_THRESHOLD) -> DedupedQuestionBank:
+    """
+    Keeps the first of each group of near-duplicate questions, marks it with the group size, and drops the rest together
+    with their answer notes. Everything that isn't a question (category headings, prep advice) passes through unchanged,
+    and a bank without duplicates comes back byte-identical.
+    """
+    questions = parse_questions(markdown)
+    clusters = cluster_questions([question.text for question in questions], threshold)
+
+    lines = markdown.splitlines(keepends=True)
+    dropped: set[int] = set()
+    counts: dict[str, int] = {}
+    for members in clusters:
+        representative = questions[members[0]]
+        counts[representative.text] = len(members)
+        if len(members) == 1:
+            continue
+        line = lines[representative.line]
+        lines[representative.line] = f"{line[:QUESTION_PATTERN.match(line).end(2)]} [×{len(members)}]{line[len(line.rstrip()):]}"
+        for member in members[1:]:
+            duplicate = questions[member]
+            dropped.add(duplicate.line)
+            dropped.update(range(duplicate.line + 1, duplicate.line + 1 + len(duplicate.notes)))
+
+    text = "".join(line for number, line in enumerate(lines) if number not in dropped)
+    if dropped:
+        text = f"{MERGED_NOTE}\n\n{text}"
+    return DedupedQuestionBank(
+        text=text,
+        questions=len(questions),
+        clusters=len(clusters),
+        counts=counts,
+        original_tokens=estimate_tokens(markdown),
+        deduped_tokens=estimate_tokens(text),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Collapse near-duplicate questions in a question bank before distillation.")
+    parser.add_argument("--questions", default="./saved_texts/interview_questions.md")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--output", default=None, help="Write the deduplicated bank here")
+    args = parser.parse_args()
+
+    with open(args.questions, "r", encoding="utf-8") as f:
+        markdown = f.read()
+    start = time.perf_counter()
+    bank = dedupe_question_bank(markdown, args.threshold)
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(bank.text)
+    print(json.dumps({
+        "questions": bank.questions,
+        "clusters": bank.clusters,
+        "duplicates_removed": bank.duplicates_removed,
+        "original_tokens": bank.original_tokens,
+        "deduped_tokens": bank.deduped_tokens,
+        "seconds": round(elapsed, 3),
+        "largest_clusters": Counter(bank.counts).most_common(10),
+    }, indent=4, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
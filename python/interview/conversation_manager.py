@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, AsyncIterator, Iterator
+
+from constants.constants import JobListingResearchResponse
+from interview.guardrail import GuardrailVerdict, released
+from llm.telemetry import TELEMETRY
+from llm.tokens import estimate_message_tokens
+from pipeline.stages import INTERVIEW_MODEL, INTERVIEW_SUMMARY_MODEL
+from prompts.interview_chat_prompts import (
+    INTERVIEW_SUMMARY_SYSTEM_PROMPT_V1,
+    interview_retrieval_system_prompt_v1,
+    interview_system_prompt_v1,
+    interview_turn_context_v1,
+)
+from retrieval.bm25_index import PINNED_GUIDE_SECTIONS, BM25Index, format_chunks, pinned_guide
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+logger = logging.getLogger(__name__)
+
+# Running notes for the synchronous manager are written here, off the thread streaming the reply
+_SUMMARY_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="interview-summary")
+
+
+class ConversationManager:
+    """
+    One mock interview session. The system prompt is rendered once, and only a token-budgeted window of recent turns is
+    replayed each turn; older turns are folded into running notes so prompt size stays flat over long interviews. The
+    notes are written in the background while the candidate reads the reply and picked up at the start of the next turn.
+    With a retrieval index, only the core guide sections are in the system prompt and each turn adds the few research
+    and guide chunks relevant to what is being discussed.
+    """
+
+    def __init__(self, client: OpenAI, listing: JobListingResearchResponse, interview_guide: str, history_token_budget: int = 3000, min_recent_messages: int = 4, retrieval_index: BM25Index | None = None, retrieval_k: int = 3):
+        self.client = client
+        self.history_token_budget = history_token_budget
+        self.min_recent_messages = min_recent_messages
+        self.retrieval_index = retrieval_index
+        self.retrieval_k = retrieval_k
+
+        if retrieval_index is None:
+            self.system_prompt = interview_system_prompt_v1(listing, interview_guide)
+        else:
+            self.system_prompt = interview_retrieval_system_prompt_v1(listing, pinned_guide(interview_guide))
+        self.summary = ""
+        self.window: list[dict] = []
+        self.transcript: list[dict] = []
+        # (folded turns, background summary of them) until the next turn applies it
+        self._pending_summary: tuple[list[dict], Future | asyncio.Future] | None = None
+
+    def messages(self, message: str) -> list[dict]:
+        # The static system prompt stays first and unchanged, so it remains a cacheable prefix across turns
+        messages = [{"role": "system", "content": self.system_prompt}]
+        if self.summary:
+            messages.append({"role": "system", "content": f"# Interview Notes (earlier turns)\n\n{self.summary}"})
+        messages.extend(self.window)
+        # Retrieved context goes after the history, so everything before it is unchanged from the previous turn
+        context = self.turn_context(message)
+        if context:
+            messages.append({"role": "system", "content": context})
+        messages.append({"role": "user", "content": message})
+        return messages
+
+    def turn_context(self, message: str) -> str:
+        if self.retrieval_index is None:
+            return ""
+        # The topic is set by the question being answered as much as by the answer itself
+        last_question = self.window[-1]["content"] if self.window else ""
+        chunks = self.retrieval_index.search(f"{last_question}\n{message}", self.retrieval_k, exclude_headings=PINNED_GUIDE_SECTIONS)
+        return interview_turn_context_v1(format_chunks(chunks)) if chunks else ""
+
+    def prompt_tokens(self, message: str = "") -> int:
+        return estimate_message_tokens(self.messages(message))
+
+    def reply(self, message: str) -> str:
+        self._apply_summary()
+        with TELEMETRY.span("interview_turn", INTERVIEW_MODEL) as span:
+            response = self.client.chat.completions.create(
+                model=INTERVIEW_MODEL,
+                messages=self.messages(message),
+            )
+            span.record_response(response)
+        reply = response.choices[0].message.content
+        self._record(message, reply)
+        return reply
+
+    def stream_reply(self, message: str) -> Iterator[str]:
+        self._apply_summary()
+        with TELEMETRY.span("interview_turn", INTERVIEW_MODEL) as span:
+            stream = self.client.chat.completions.create(
+                model=INTERVIEW_MODEL,
+                messages=self.messages(message),
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+
+            reply = ""
+            for chunk in stream:
+                span.record_chunk(chunk)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    reply += chunk.choices[0].delta.content
+                    yield reply
+
+        # Only starts the compaction, so the generator returns as soon as the reply is complete
+        self._record(message, reply)
+
+    def _append_turn(self, message: str, reply: str) -> list[dict]:
+        # Returns the turns to fold into the notes, if the window went over budget
+        turn = [{"role": "user", "content": message}, {"role": "assistant", "content": reply}]
+        self.window.extend(turn)
+        self.transcript.extend(turn)
+        if estimate_message_tokens(self.window) <= self.history_token_budget:
+            return []
+
+        # Fold down to half the budget so a summary call happens every few turns rather than on every turn
+        target = self.history_token_budget // 2
+        folded = []
+        while len(self.window) > self.min_recent_messages and estimate_message_tokens(self.window) > target:
+            folded.extend(self.window[:2])
+            self.window = self.window[2:]
+        return folded
+
+    def _record(self, message: str, reply: str) -> None:
+        folded = self._append_turn(message, reply)
+        if folded:
+            # Runs in a copy of the caller's context, so span collectors see the summary call as they did when it ran inline
+            self._pending_summary = (folded, _SUMMARY_POOL.submit(contextvars.copy_context().run, self._summarize, folded))
+
+    def _apply_summary(self) -> None:
+        # Normally the notes landed while the candidate was typing, so this doesn't wait
+        if self._pending_summary is None:
+            return
+        folded, future = self._pending_summary
+        self._pending_summary = None
+        try:
+            self.summary = future.result()
+        except Exception:
+            self._unfold(folded)
+
+    def _unfold(self, folded: list[dict]) -> None:
+        # A failed summary puts its turns back in the window, to be folded again after the next turn
+        logger.warning("Interview summary failed; %d messages stay in the history window", len(folded), exc_info=True)
+        self.window = folded + self.window
+
+    def _replay(self, transcript: list[dict]) -> list[dict]:
+        # Rebuilds the window from a stored transcript without model calls; returns every turn that was folded out
+        folded = []
+        for message, reply in zip(transcript[::2], transcript[1::2]):
+            folded.extend(self._append_turn(message["content"], reply["content"]))
+        return folded
+
+    def restore(self, transcript: list[dict]) -> None:
+        # For a session resumed from the session store: one summary call covers all the folded turns
+        folded = self._replay(transcript)
+        if folded:
+            self.summary = self._summarize(folded)
+
+    def _summary_messages(self, turns: list[dict]) -> list[dict]:
+        formatted_turns = "\n\n".join(f"{turn['role']}:\n{turn['content']}" for turn in turns)
+        return [
+            {"role": "system", "content": INTERVIEW_SUMMARY_SYSTEM_PROMPT_V1},
+            {"role": "user", "content": f"previous_notes:\n{self.summary or '(none)'}\n\nturns:\n{formatted_turns}"},
+        ]
+
+    def _summarize(self, turns: list[dict]) -> str:
+        with TELEMETRY.span("interview_summary", INTERVIEW_SUMMARY_MODEL) as span:
+            response = self.client.chat.completions.create(
+                model=INTERVIEW_SUMMARY_MODEL,
+                messages=self._summary_messages(turns),
+                temperature=0.2,
+            )
+            span.record_response(response)
+        return response.choices[0].message.content
+
+
+class AsyncConversationManager(ConversationManager):
+    """Same session on an AsyncOpenAI client, for servers that run many interviews on one event loop."""
+
+    def __init__(self, async_client: AsyncOpenAI, listing: JobListingResearchResponse, interview_guide: str, **kwargs):
+        super().__init__(async_client, listing, interview_guide, **kwargs)
+
+    async def reply(self, message: str) -> str:
+        await self._apply_summary()
+        with TELEMETRY.span("interview_turn", INTERVIEW_MODEL) as span:
+            response = await self.client.chat.completions.create(
+                model=INTERVIEW_MODEL,
+                messages=self.messages(message),
+            )
+            span.record_response(response)
+        reply = response.choices[0].message.content
+        await self._record(message, reply)
+        return reply
+
+    async def stream_reply(self, message: str, guard: asyncio.Future[GuardrailVerdict] | None = None) -> AsyncIterator[str]:
+        """
+        Yields the reply text so far, like ConversationManager.stream_reply. With a guard (the message's guardrail check,
+        already running), the reply is generated alongside the check but held back until it passes; a flagged message
+        stops generation and raises GuardrailTripped, and the turn is not recorded.
+        """
+        try:
+            if guard is not None:
+                released(guard)
+
+            await self._apply_summary()
+            with TELEMETRY.span("interview_turn", INTERVIEW_MODEL) as span:
+                stream = await self.client.chat.completions.create(
+                    model=INTERVIEW_MODEL,
+                    messages=self.messages(message),
+                    stream=True,
+                    stream_options={"include_usage": True},
+                )
+
+                reply, sent = "", ""
+                async with stream:
+                    async for chunk in stream:
+                        span.record_chunk(chunk)
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            reply += chunk.choices[0].delta.content
+                            if guard is None or released(guard):
+                                sent = reply
+                                yield reply
+
+            # A reply that finished before a slow check is released in one piece once the check passes
+            if guard is not None:
+                await guard
+                released(guard)
+                if reply != sent:
+                    yield reply
+        finally:
+            if guard is not None and not guard.done():
+                guard.cancel()
+
+        await self._record(message, reply)
+
+    async def _record(self, message: str, reply: str) -> None:
+        folded = self._append_turn(message, reply)
+        if folded:
+            self._pending_summary = (folded, asyncio.ensure_future(self._summarize(folded)))
+
+    async def _apply_summary(self) -> None:
+        if self._pending_summary is None:
+            return
+        folded, task = self._pending_summary
+        self._pending_summary = None
+        try:
+            self.summary = await task
+        except Exception:
+            self._unfold(folded)
+
+    async def restore(self, transcript: list[dict]) -> None:
+        folded = self._replay(transcript)
+        if folded:
+            self.summary = await self._summarize(folded)
+
+    async def _summarize(self, turns: list[dict]) -> str:
+        with TELEMETRY.span("interview_summary", INTERVIEW_SUMMARY_MODEL) as span:
+            response = await self.client.chat.completions.create(
+                model=INTERVIEW_SUMMARY_MODEL,
+                messages=self._summary_messages(turns),
+                temperature=0.2,
+            )
+            span.record_response(response)
+        return response.choices[0].message.content
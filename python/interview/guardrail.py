@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import math
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from pipeline import stages
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+# Verdict sources
+RULES = "rules"
+LEXICAL = "lexical"
+LLM = "llm"
+
+# Patterns no genuine interview answer contains; a hit blocks without asking the model.
+# Mirrors the "counterfeit structure", "dictates a verdict" and obfuscation cases of INTERVIEW_USER_MESSAGE_GUARDRAIL_PROMPT_V1.
+BLOCK_PATTERNS = {
+    # Bracketed or chat-template role tags only; a plain "Developer: 3 years on payments" line is an escalation signal below
+    "counterfeit role markup": re.compile(r"<\|?\s*/?\s*(system|developer|assistant|admin)\s*\|?>|\[\s*/?\s*(system|developer|assistant|admin)\s*\]|<\|im_(start|end)\|>", re.IGNORECASE),
+    "dictates the guardrail verdict": re.compile(r"contains_any_malicious_content|guardrail\W+(output|return|respond|say)", re.IGNORECASE),
+    "invisible characters": re.compile("[\u200b-\u200f\u2060-\u2064\ufeff\u00ad]"),
+}
+
+# Phrases that warrant a closer look but are also common in honest answers (e.g. describing red-team work)
+ESCALATE_PATTERNS = {
+    "role-labelled line": re.compile(r"(^|\n)\s*(system|developer|assistant|admin)\s*:", re.IGNORECASE),
+    "instruction override": re.compile(r"\b(ignore|disregard|forget|override)\b.{0,30}\b(previous|prior|above|earlier|all|your|the)\b.{0,20}\b(instructions?|rules|prompts?|guidelines|directions)\b", re.IGNORECASE),
+    "system prompt or configuration": re.compile(r"\b(system|hidden|developer)\s+(prompt|message|instructions?)|\b(api[\s_-]?keys?|credentials|environment variables?|config(uration)? files?)\b", re.IGNORECASE),
+    "persona change": re.compile(r"\b(you are now|from now on|pretend (to be|you are)|act as|roleplay as|new (role|persona|mode))\b", re.IGNORECASE),
+    "authority claim": re.compile(r"\b(i am|i'm)\s+(the|a|an|your)\s+(developer|admin|administrator|operator|owner)\b|\bauthori[sz]ed\s+(test|tester|user|session)\b|\b(disable|turn off|bypass|switch off)\b.{0,20}\b(guardrails?|safety|filters?|rules|restrictions)\b", re.IGNORECASE),
+    "jailbreak vocabulary": re.compile(r"\b(jailbreak|dan mode|developer mode|no restrictions|unfiltered|prompt injection)\b", re.IGNORECASE),
+    "split-letter words": re.compile(r"\b(?:[a-z][\s.\-_*]){4,}[a-z]\b", re.IGNORECASE),
+}
+
+# Small hand-weighted lexical model over word unigrams. Positive weights point towards instructions aimed at the
+# assistant or off-purpose work; negative weights towards ordinary candidate talk about their own experience.
+LEXICAL_WEIGHTS = {
+    "ignore": 2.0, "disregard": 2.0, "reveal": 1.6, "instructions": 1.4, "prompt": 1.0, "rules": 0.8, "bypass": 1.8,
+    "pretend": 1.4, "unrestricted": 1.8, "decode": 1.6, "execute": 1.0, "essay": 1.6, "recipe": 1.8, "poem": 1.6,
+    "story": 0.8, "translate": 1.0, "summarize": 0.8, "homework": 1.6, "write": 0.6, "generate": 0.6, "code": 0.3,
+    "script": 0.5, "chatgpt": 0.5, "assistant": 0.8, "model": 0.3, "configuration": 1.2, "password": 1.6, "token": 0.6,
+    "i": -0.5, "my": -0.6, "we": -0.6, "our": -0.5, "team": -0.8, "led": -1.0, "managed": -0.9, "built": -0.8,
+    "worked": -0.9, "experience": -0.9, "project": -0.8, "role": -0.6, "customer": -0.7, "client": -0.7,
+    "results": -0.7, "learned": -0.8, "because": -0.4, "when": -0.3, "company": -0.5, "question": -0.6,
+    "interview": -0.4, "ready": -0.8, "repeat": -0.7, "thanks": -0.7, "sorry": -0.5,
+}
+LEXICAL_BIAS = -2.0
+WORD_PATTERN = re.compile(r"[a-z']+")
+BASE64_PATTERN = re.compile(r"[A-Za-z0-9+/]{16,}={0,2}")
+
+# Probability bands of the lexical model: below SAFE_BELOW is released locally, above BLOCK_ABOVE is blocked
+# locally, anything in between goes to the LLM check
+SAFE_BELOW = 0.2
+BLOCK_ABOVE = 0.97
+
+
+@dataclass
+class GuardrailVerdict:
+    malicious: bool
+    reason: str
+    source: str
+    score: float = 0.0
+
+
+class GuardrailTripped(RuntimeError):
+    """Raised in place of an interviewer reply when the candidate's message was flagged."""
+
+    def __init__(self, verdict: GuardrailVerdict):
+        super().__init__(verdict.reason)
+        self.verdict = verdict
+
+
+def lexical_score(message: str) -> float:
+    counts = Counter(WORD_PATTERN.findall(message.lower()))
+    # Each word counts at most twice so a long honest answer can't drown out one injected sentence, or vice versa
+    logit = LEXICAL_BIAS + sum(weight * min(counts[word], 2) for word, weight in LEXICAL_WEIGHTS.items() if word in counts)
+    return 1 / (1 + math.exp(-logit))
+
+
+def _decoded_payload(message: str) -> str | None:
+    # A base64 run that decodes to readable text is an encoded instruction, not an accidental long token
+    for match in BASE64_PATTERN.finditer(message):
+        try:
+            decoded = base64.b64decode(match.group(0), validate=True).decode("utf-8")
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            continue
+        if decoded.isprintable() and sum(char.isalpha() or char.isspace() for char in decoded) / len(decoded) > 0.8:
+            return decoded
+    return None
+
+
+def classify_locally(message: str) -> GuardrailVerdict | None:
+    """
+    The fast path: rules first, then the lexical model. Returns None when neither is confident, in which case the
+    message goes to the LLM check.
+    """
+    normalized = unicodedata.normalize("NFKC", message)
+    for reason, pattern in BLOCK_PATTERNS.items():
+        if pattern.search(message) or pattern.search(normalized):
+            return GuardrailVerdict(True, f"The message was flagged for {reason}.", RULES, 1.0)
+    if _decoded_payload(normalized):
+        return GuardrailVerdict(True, "The message was flagged for an encoded payload.", RULES, 1.0)
+
+    score = lexical_score(normalized)
+    if any(pattern.search(normalized) for pattern in ESCALATE_PATTERNS.values()):
+        return None
+    if score < SAFE_BELOW:
+        return GuardrailVerdict(False, "The message reads as normal interview participation.", LEXICAL, score)
+    if score > BLOCK_ABOVE:
+        return GuardrailVerdict(True, "The message asks the interviewer for work unrelated to the interview.", LEXICAL, score)
+    return None
+
+
+class MessageGuardrail:
+    """
+    Checks each candidate message before the interviewer's reply is released. Most messages are settled by
+    classify_locally in microseconds; only uncertain ones cost a model call. With fail_closed, a failed model call
+    blocks the message; by default it is let through, since the interviewer prompt still refuses off-purpose requests.
+    """
+
+    def __init__(self, async_client: AsyncOpenAI, fail_closed: bool = False):
+        self.async_client = async_client
+        self.fail_closed = fail_closed
+        self.counts: Counter[str] = Counter()
+
+    def start(self, message: str) -> asyncio.Future[GuardrailVerdict]:
+        # Already resolved when the local classifier is confident, so a safe message costs the reply nothing;
+        # otherwise a task running the model check alongside reply generation
+        verdict = classify_locally(message)
+        if verdict is None:
+            return asyncio.ensure_future(self._check_with_model(message))
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(self._count(verdict))
+        return future
+
+    async def check(self, message: str) -> GuardrailVerdict:
+        return await self.start(message)
+
+    async def _check_with_model(self, message: str) -> GuardrailVerdict:
+        try:
+            response = await stages.check_interview_message_async(self.async_client, message)
+            verdict = GuardrailVerdict(response.contains_any_malicious_content, response.reason, LLM, float(response.contains_any_malicious_content))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.counts["llm_error"] += 1
+            verdict = GuardrailVerdict(self.fail_closed, "The safety check could not be completed.", LLM)
+        return self._count(verdict)
+
+    def _count(self, verdict: GuardrailVerdict) -> GuardrailVerdict:
+        self.counts[f"{verdict.source}_{'blocked' if verdict.malicious else 'allowed'}"] += 1
+        return verdict
+
+
+def released(guard: asyncio.Future[GuardrailVerdict]) -> bool:
+    # False while the check is still running; raises GuardrailTripped once it has flagged the message
+    if not guard.done():
+        return False
+    verdict = guard.result()
+    if verdict.malicious:
+        raise GuardrailTripped(verdict)
+    return True
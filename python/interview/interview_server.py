@@ -0,0 +1,453 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import TYPE_CHECKING, AsyncIterator, Callable
+
+from constants.constants import JobListingResearchResponse
+from interview.conversation_manager import AsyncConversationManager
+from interview.guardrail import GuardrailTripped, MessageGuardrail
+from interview.session_store import SessionStore
+from llm.hashing import content_hash
+from retrieval.bm25_index import BM25Index, build_listing_index
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+MAX_BODY_BYTES = 1 << 20
+
+
+class SessionLimitError(RuntimeError):
+    """Raised when a new session would exceed the server's admission limit."""
+
+
+class SessionExistsError(RuntimeError):
+    """Raised when a caller-supplied session id is already taken."""
+
+
+class UnknownIdError(KeyError):
+    """Raised for a session or artifacts id the manager (and its session store) has never seen."""
+
+
+@dataclass
+class ListingArtifacts:
+    # Shared by every session on the same listing; sessions hold the id, not a copy
+    artifacts_id: str
+    listing: JobListingResearchResponse
+    interview_guide: str
+    deep_research_results: str | None = None
+    retrieval_index: BM25Index | None = None
+
+
+@dataclass
+class InterviewSession:
+    session_id: str
+    artifacts_id: str
+    conversation: AsyncConversationManager
+    created_at: float
+    last_active: float
+    # One turn at a time per session; a second message waits for the reply to the first
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+def pooled_async_client(max_connections: int, base_url: str | None = None, api_key: str | None = None, max_retries: int = 2) -> AsyncOpenAI:
+    # One client, and so one connection pool, for every session in the process
+    import httpx
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    return AsyncOpenAI(base_url=base_url, api_key=api_key, max_retries=max_retries, http_client=DefaultAsyncHttpxClient(limits=limits))
+
+
+class InterviewSessionManager:
+    """
+    Session-keyed mock interviews on one shared AsyncOpenAI client. Listing artifacts are registered once and
+    referenced by id, at most max_sessions sessions are admitted, at most max_active_turns model calls run at once,
+    and sessions idle for idle_timeout seconds are evicted. With a session store, an evicted session is resumed from its
+    stored transcript on its next message.
+    With a guardrail, each candidate message is checked while its reply is generated.
+    """
+
+    def __init__(self, async_client: AsyncOpenAI, max_sessions: int = 500, max_active_turns: int = 64, idle_timeout: float = 1800.0, session_store: SessionStore | None = None, history_token_budget: int = 3000, guardrail: MessageGuardrail | None = None, clock: Callable[[], float] = time.monotonic):
+        self.async_client = async_client
+        self.guardrail = guardrail
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.session_store = session_store
+        self.history_token_budget = history_token_budget
+        self.clock = clock
+
+        self.artifacts: dict[str, ListingArtifacts] = {}
+        self.sessions: dict[str, InterviewSession] = {}
+        self._turns = asyncio.Semaphore(max_active_turns)
+        self.active_turns = 0
+        self.waiting_turns = 0
+        self._restoring: dict[str, asyncio.Future[InterviewSession]] = {}
+        self.evicted = 0
+        self.rejected = 0
+        self.restored = 0
+
+    # ===============================
+    #       Artifacts & sessions
+    # ===============================
+
+    async def register_artifacts(self, listing: JobListingResearchResponse, interview_guide: str, deep_research_results: str | None = None) -> str:
+        # Keyed on content, so registering the same prep twice returns the existing id; research enables per-turn retrieval
+        artifacts_id = content_hash({"listing": listing, "interview_guide": interview_guide, "deep_research_results": deep_research_results})[:16]
+        if artifacts_id not in self.artifacts:
+            await self._load_artifacts(artifacts_id, listing, interview_guide, deep_research_results)
+        return artifacts_id
+
+    async def _load_artifacts(self, artifacts_id: str, listing: JobListingResearchResponse, interview_guide: str, deep_research_results: str | None) -> ListingArtifacts:
+        # Chunking and indexing a research report is CPU-bound, so it runs off the event loop
+        index = await asyncio.to_thread(build_listing_index, deep_research_results, interview_guide) if deep_research_results else None
+        # A concurrent registration of the same prep may have finished first; keep the one sessions already reference
+        return self.artifacts.setdefault(artifacts_id, ListingArtifacts(artifacts_id, listing, interview_guide, deep_research_results, index))
+
+    def _artifacts(self, artifacts_id: str) -> ListingArtifacts:
+        if artifacts_id not in self.artifacts:
+            raise UnknownIdError(artifacts_id)
+        return self.artifacts[artifacts_id]
+
+    def _admit(self) -> None:
+        if len(self.sessions) >= self.max_sessions:
+            self.evict_idle()
+        if len(self.sessions) >= self.max_sessions:
+            self.rejected += 1
+            raise SessionLimitError(f"{len(self.sessions)} sessions open (limit {self.max_sessions})")
+
+    def _open(self, session_id: str, artifacts: ListingArtifacts) -> InterviewSession:
+        conversation = AsyncConversationManager(
+            self.async_client, artifacts.listing, artifacts.interview_guide,
+            history_token_budget=self.history_token_budget, retrieval_index=artifacts.retrieval_index,
+        )
+        now = self.clock()
+        session = InterviewSession(session_id, artifacts.artifacts_id, conversation, now, now)
+        self.sessions[session_id] = session
+        return session
+
+    async def create_session(self, artifacts_id: str, session_id: str | None = None) -> str:
+        artifacts = self._artifacts(artifacts_id)
+        if session_id is not None and (session_id in self.sessions or session_id in self._restoring or await self._stored(session_id)):
+            raise SessionExistsError(f"Session {session_id} already exists")
+        self._admit()
+
+        session_id = session_id or uuid.uuid4().hex
+        self._open(session_id, artifacts)
+        if self.session_store is not None:
+            await asyncio.to_thread(self.session_store.start_session, session_id, artifacts.listing, artifacts.deep_research_results, artifacts.interview_guide, artifacts_id=artifacts_id)
+        return session_id
+
+    async def _stored(self, session_id: str) -> bool:
+        return self.session_store is not None and await asyncio.to_thread(self.session_store.__contains__, session_id)
+
+    async def session(self, session_id: str) -> InterviewSession:
+        # Sessions evicted for idleness (or left behind by a restart) are resumed from the session store on first use
+        if session_id in self.sessions:
+            return self.sessions[session_id]
+        if session_id not in self._restoring:
+            if not await self._stored(session_id):
+                raise UnknownIdError(session_id)
+        # Concurrent requests for the same session share one restore; re-checked since the lookup above yields
+        if session_id in self.sessions:
+            return self.sessions[session_id]
+        if session_id not in self._restoring:
+            restoring = asyncio.ensure_future(self._restore(session_id))
+            restoring.add_done_callback(lambda task: self._restore_done(session_id, task))
+            self._restoring[session_id] = restoring
+        return await asyncio.shield(self._restoring[session_id])
+
+    def _restore_done(self, session_id: str, task: asyncio.Future) -> None:
+        del self._restoring[session_id]
+        # Retrieved here so a restore whose callers all disconnected doesn't log an unretrieved exception
+        if not task.cancelled():
+            task.exception()
+
+    async def _restore(self, session_id: str) -> InterviewSession:
+        record, transcript = await asyncio.to_thread(lambda: (self.session_store.session(session_id), self.session_store.messages(session_id)))
+        if record is None or record["listing"] is None:
+            raise UnknownIdError(session_id)
+        artifacts_id = record["metadata"].get("artifacts_id")
+        if artifacts_id not in self.artifacts:
+            # The prep is stored with the session, so it resumes after a restart with its retrieval index rebuilt
+            listing = JobListingResearchResponse(**record["listing"])
+            await self._load_artifacts(artifacts_id, listing, record["interview_guide"], record["deep_research_results"])
+        self._admit()
+        session = self._open(session_id, self.artifacts[artifacts_id])
+        async with session.lock:
+            await session.conversation.restore(transcript)
+        self.restored += 1
+        return session
+
+    def close_session(self, session_id: str) -> None:
+        # Only drops the in-memory state; the transcript stays in the session store
+        if self.sessions.pop(session_id, None) is None:
+            raise UnknownIdError(session_id)
+
+    def evict_idle(self) -> list[str]:
+        # Sessions mid-turn are never evicted, however long the model call takes
+        cutoff = self.clock() - self.idle_timeout
+        idle = [session.session_id for session in self.sessions.values() if session.last_active < cutoff and not session.lock.locked()]
+        for session_id in idle:
+            del self.sessions[session_id]
+        self.evicted += len(idle)
+        return idle
+
+    async def sweep_forever(self, interval: float = 60.0) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            self.evict_idle()
+
+    # ===============================
+    #            Turns
+    # ===============================
+
+    async def stream_reply(self, session_id: str, message: str) -> AsyncIterator[str]:
+        # Yields the new text of each chunk, ready to forward to the client
+        session = await self.session(session_id)
+        async with session.lock:
+            session.last_active = self.clock()
+            # Started before admission so an escalated check overlaps the wait for a turn slot too
+            guard = self.guardrail.start(message) if self.guardrail is not None else None
+            self.waiting_turns += 1
+            try:
+                await self._turns.acquire()
+            except BaseException:
+                if guard is not None:
+                    guard.cancel()
+                raise
+            finally:
+                self.waiting_turns -= 1
+
+            self.active_turns += 1
+            try:
+                sent = 0
+                async for reply in session.conversation.stream_reply(message, guard):
+                    yield reply[sent:]
+                    sent = len(reply)
+            finally:
+                self.active_turns -= 1
+                self._turns.release()
+                session.last_active = self.clock()
+
+            if self.session_store is not None:
+                await asyncio.to_thread(self.session_store.append_messages, session_id, session.conversation.transcript[-2:])
+
+    async def reply(self, session_id: str, message: str) -> str:
+        return "".join([delta async for delta in self.stream_reply(session_id, message)])
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self.sessions),
+            "max_sessions": self.max_sessions,
+            "artifacts": len(self.artifacts),
+            "active_turns": self.active_turns,
+            "waiting_turns": self.waiting_turns,
+            "evicted": self.evicted,
+            "rejected": self.rejected,
+            "restored": self.restored,
+            **({"guardrail": dict(self.guardrail.counts)} if self.guardrail is not None else {}),
+        }
+
+
+class InterviewServer:
+    """
+    Minimal asyncio HTTP front end for InterviewSessionManager, one request per connection:
+
+        POST   /v1/artifacts                  {"listing", "interview_guide", "deep_research_results"?} -> {"artifacts_id"}
+        POST   /v1/sessions                   {"artifacts_id", "session_id"?} -> {"session_id"}; 429 at the admission limit, 409 for a taken id
+        POST   /v1/sessions/{id}/messages     {"message"} -> text/event-stream of {"delta"} events, then [DONE]
+        DELETE /v1/sessions/{id}
+        GET    /v1/stats
+    """
+
+    def __init__(self, manager: InterviewSessionManager, host: str = "127.0.0.1", port: int = 8090, sweep_interval: float = 60.0):
+        self.manager = manager
+        self.host = host
+        self.port = port
+        self.sweep_interval = sweep_interval
+        self._server: asyncio.Server | None = None
+        self._sweeper: asyncio.Task | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v1"
+
+    async def start(self) -> "InterviewServer":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, backlog=1024)
+        self._sweeper = asyncio.create_task(self.manager.sweep_forever(self.sweep_interval))
+        return self
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def stop(self) -> None:
+        self._sweeper.cancel()
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def __aenter__(self) -> "InterviewServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    # ===============================
+    #            HTTP
+    # ===============================
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            method, path, payload = await self._read_request(reader)
+            await self._route(method, path, payload, writer)
+        except SessionLimitError as error:
+            await self._json(writer, HTTPStatus.TOO_MANY_REQUESTS, {"error": str(error)}, {"Retry-After": "5"})
+        except SessionExistsError as error:
+            await self._json(writer, HTTPStatus.CONFLICT, {"error": str(error)})
+        except UnknownIdError as error:
+            await self._json(writer, HTTPStatus.NOT_FOUND, {"error": f"Unknown id: {error.args[0]}"})
+        except (ValueError, TypeError) as error:
+            await self._json(writer, HTTPStatus.BAD_REQUEST, {"error": str(error)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # The client went away; an in-flight stream was already closed, which cancels the model call
+            pass
+        except Exception as error:
+            with contextlib.suppress(ConnectionError):
+                await self._json(writer, HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(error).__name__}: {error}"})
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> tuple[str, str, dict]:
+        method, path, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY_BYTES:
+            raise ValueError(f"Request body over {MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return method, path.split("?", 1)[0].rstrip("/"), json.loads(body) if body else {}
+
+    async def _route(self, method: str, path: str, payload: dict, writer: asyncio.StreamWriter) -> None:
+        parts = path.strip("/").split("/")
+        if method == "GET" and parts == ["v1", "stats"]:
+            await self._json(writer, HTTPStatus.OK, self.manager.stats())
+        elif method == "POST" and parts == ["v1", "artifacts"]:
+            _require(payload, listing=dict, interview_guide=str)
+            listing = JobListingResearchResponse(**payload["listing"])
+            artifacts_id = await self.manager.register_artifacts(listing, payload["interview_guide"], payload.get("deep_research_results"))
+            await self._json(writer, HTTPStatus.CREATED, {"artifacts_id": artifacts_id})
+        elif method == "POST" and parts == ["v1", "sessions"]:
+            _require(payload, artifacts_id=str)
+            session_id = await self.manager.create_session(payload["artifacts_id"], payload.get("session_id"))
+            await self._json(writer, HTTPStatus.CREATED, {"session_id": session_id})
+        elif method == "DELETE" and len(parts) == 3 and parts[:2] == ["v1", "sessions"]:
+            self.manager.close_session(parts[2])
+            await self._json(writer, HTTPStatus.OK, {"session_id": parts[2]})
+        elif method == "POST" and len(parts) == 4 and parts[:2] == ["v1", "sessions"] and parts[3] == "messages":
+            _require(payload, message=str)
+            # Looked up (or restored) before the stream starts, so an unknown session is still a plain 404
+            await self.manager.session(parts[2])
+            await self._stream(writer, self.manager.stream_reply(parts[2], payload["message"]))
+        else:
+            await self._json(writer, HTTPStatus.NOT_FOUND, {"error": f"No route for {method} {path}"})
+
+    async def _json(self, writer: asyncio.StreamWriter, status: HTTPStatus, payload: dict, headers: dict | None = None) -> None:
+        body = json.dumps(payload).encode()
+        head = {"Content-Type": "application/json", "Content-Length": str(len(body)), "Connection": "close", **(headers or {})}
+        writer.write(_status_line(status, head) + body)
+        await writer.drain()
+
+    async def _stream(self, writer: asyncio.StreamWriter, deltas: AsyncIterator[str]) -> None:
+        writer.write(_status_line(HTTPStatus.OK, {"Content-Type": "text/event-stream", "Cache-Control": "no-cache", "Connection": "close"}))
+        # aclosing makes a disconnect close the generator, which closes the upstream model stream and releases the turn
+        async with contextlib.aclosing(deltas):
+            try:
+                async for delta in deltas:
+                    writer.write(f"data: {json.dumps({'delta': delta})}\n\n".encode())
+                    await writer.drain()
+            except ConnectionError:
+                raise
+            except GuardrailTripped as error:
+                writer.write(f"event: guardrail\ndata: {json.dumps({'error': str(error)})}\n\n".encode())
+            except Exception as error:
+                # Headers are already sent, so a failed model call is reported as an SSE error event
+                writer.write(f"event: error\ndata: {json.dumps({'error': str(error)})}\n\n".encode())
+        writer.write(b"data: [DONE]\n\n")
+        await writer.drain()
+
+
+def _require(payload: dict, **fields: type) -> None:
+    # Missing or mistyped body fields are the client's error (400), unlike unknown ids (404)
+    if not isinstance(payload, dict):
+        raise ValueError("Request body must be a JSON object")
+    for name, expected in fields.items():
+        if name not in payload:
+            raise ValueError(f"Missing field: {name}")
+        if not isinstance(payload[name], expected):
+            raise ValueError(f"Field {name} must be a {expected.__name__}")
+
+
+def _status_line(status: HTTPStatus, headers: dict) -> bytes:
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}", *(f"{name}: {value}" for name, value in headers.items())]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve concurrent mock interviews over HTTP, registering the saved listing and guide at startup.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--base-url", default=None, help="OpenAI-compatible endpoint, e.g. the stub server")
+    parser.add_argument("--max-sessions", type=int, default=500)
+    parser.add_argument("--max-active-turns", type=int, default=64)
+    parser.add_argument("--idle-timeout", type=float, default=1800.0)
+    parser.add_argument("--session-store", default=None, help="Directory for a SessionStore; transcripts are appended every turn")
+    parser.add_argument("--no-guardrail", action="store_true", help="Skip the candidate message guardrail")
+    parser.add_argument("--listing", default="./saved_texts/job_listing_research_response.json")
+    parser.add_argument("--interview-guide", default="./saved_texts/interview_guide.md")
+    parser.add_argument("--deep-research", default=None, help="Also index this research report for per-turn retrieval")
+    args = parser.parse_args()
+
+    async def serve() -> None:
+        async_client = pooled_async_client(args.max_active_turns, args.base_url)
+        manager = InterviewSessionManager(
+            async_client,
+            max_sessions=args.max_sessions,
+            max_active_turns=args.max_active_turns,
+            idle_timeout=args.idle_timeout,
+            session_store=SessionStore(args.session_store) if args.session_store else None,
+            guardrail=None if args.no_guardrail else MessageGuardrail(async_client),
+        )
+        with open(args.listing, "r", encoding="utf-8") as f:
+            listing = JobListingResearchResponse(**json.load(f))
+        with open(args.interview_guide, "r", encoding="utf-8") as f:
+            interview_guide = f.read()
+        deep_research_results = None
+        if args.deep_research:
+            with open(args.deep_research, "r", encoding="utf-8") as f:
+                deep_research_results = f.read()
+
+        artifacts_id = await manager.register_artifacts(listing, interview_guide, deep_research_results)
+        server = InterviewServer(manager, args.host, args.port)
+        await server.start()
+        print(f"Interview server listening on {server.base_url} (artifacts_id {artifacts_id})")
+        await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
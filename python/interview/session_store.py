@@ -0,0 +1,219 @@
+import ast
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Iterator
+
+from pydantic import BaseModel
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are serialised within the process only
+    fcntl = None
+
+# Record kinds in the data file
+SESSION = "session"
+MESSAGE = "message"
+EVALUATION = "evaluation"
+FINAL_EVALUATION = "final_evaluation"
+
+
+class SessionStore:
+    """
+    Append-only store of interview sessions. Every message and judge result is one JSON line in sessions.jsonl, and a
+    sqlite index maps each line's byte offset to its session, so one session is read with a few seeks and opening the
+    store costs the same however many sessions it holds. Several processes can append to one store.
+    """
+
+    def __init__(self, directory: str = "./session_store"):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.data_path = self.directory / "sessions.jsonl"
+        self.lock_path = self.directory / "sessions.lock"
+        self._lock = threading.Lock()
+        self._index = sqlite3.connect(self.directory / "index.sqlite", timeout=30, isolation_level=None, check_same_thread=False)
+        with self._lock:
+            self._index.execute("PRAGMA journal_mode=WAL")
+            # The index can always be rebuilt from the data file by _catch_up, so it need not be synced on every commit
+            self._index.execute("PRAGMA synchronous=NORMAL")
+            self._index.execute("CREATE TABLE IF NOT EXISTS records (offset INTEGER PRIMARY KEY, end INTEGER NOT NULL, session_id TEXT NOT NULL)")
+            self._index.execute("CREATE INDEX IF NOT EXISTS records_by_session ON records (session_id, offset)")
+        with self._file_lock():
+            self._catch_up()
+
+    # ===============================
+    #            Index
+    # ===============================
+
+    @contextlib.contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        # Serialises appends across threads, and across processes where flock exists
+        with self._lock, self.lock_path.open("a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _indexed_end(self) -> int:
+        row = self._index.execute("SELECT end FROM records ORDER BY offset DESC LIMIT 1").fetchone()
+        return row[0] if row else 0
+
+    def _catch_up(self) -> None:
+        # Indexes records written after the last index row: a crash between the data append and the index insert, or
+        # a store created before the index existed. Called with the file lock held, so no append is in progress.
+        indexed_end = self._indexed_end()
+        if not self.data_path.exists() or self.data_path.stat().st_size <= indexed_end:
+            return
+        rows = []
+        with self.data_path.open("rb") as f:
+            f.seek(indexed_end)
+            offset = indexed_end
+            for line in f:
+                # A torn line from a crash mid-append is skipped here and by every reader; it is never truncated
+                if line.endswith(b"\n"):
+                    with contextlib.suppress(json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError):
+                        rows.append((offset, offset + len(line), json.loads(line)["session_id"]))
+                offset += len(line)
+        self._index.executemany("INSERT OR IGNORE INTO records (offset, end, session_id) VALUES (?, ?, ?)", rows)
+
+    # ===============================
+    #            Writing
+    # ===============================
+
+    def _append(self, session_id: str, kind: str, **fields: Any) -> None:
+        record = {"session_id": session_id, "kind": kind, "created_at": time.time(), **fields}
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._file_lock():
+            self._catch_up()
+            with self.data_path.open("ab+") as f:
+                offset = f.seek(0, os.SEEK_END)
+                # After a torn line, start on a fresh line so the new record stays readable on its own
+                if offset:
+                    f.seek(offset - 1)
+                    if f.read(1) != b"\n":
+                        f.write(b"\n")
+                        offset += 1
+                f.write(line)
+            self._index.execute("INSERT INTO records (offset, end, session_id) VALUES (?, ?, ?)", (offset, offset + len(line), session_id))
+
+    def start_session(self, session_id: str | None = None, listing: BaseModel | None = None, deep_research_results: str | None = None, interview_guide: str | None = None, **metadata: Any) -> str:
+        # The prep outputs are kept with the session so it can be re-scored without the artifacts that produced it
+        session_id = session_id or uuid.uuid4().hex
+        self._append(
+            session_id,
+            SESSION,
+            listing=listing.model_dump(mode="json") if listing is not None else None,
+            deep_research_results=deep_research_results,
+            interview_guide=interview_guide,
+            metadata=metadata,
+        )
+        return session_id
+
+    def append_message(self, session_id: str, role: str, content: str) -> None:
+        self._append(session_id, MESSAGE, role=role, content=content)
+
+    def append_messages(self, session_id: str, messages: list[dict]) -> None:
+        for message in messages:
+            self.append_message(session_id, message["role"], message["content"])
+
+    def append_evaluation(self, session_id: str, judge: str, evaluation: str | BaseModel) -> None:
+        content = evaluation.model_dump(mode="json") if isinstance(evaluation, BaseModel) else evaluation
+        self._append(session_id, EVALUATION, judge=judge, content=content)
+
+    def append_evaluations(self, session_id: str, evaluations: dict[str, str | BaseModel]) -> None:
+        for judge, evaluation in evaluations.items():
+            self.append_evaluation(session_id, judge, evaluation)
+
+    def append_final_evaluation(self, session_id: str, final_evaluation: str) -> None:
+        self._append(session_id, FINAL_EVALUATION, content=final_evaluation)
+
+    # ===============================
+    #            Reading
+    # ===============================
+
+    def _query(self, sql: str, parameters: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._index.execute(sql, parameters).fetchall()
+
+    def __contains__(self, session_id: str) -> bool:
+        return bool(self._query("SELECT 1 FROM records WHERE session_id = ? LIMIT 1", (session_id,)))
+
+    def __len__(self) -> int:
+        return self._query("SELECT COUNT(DISTINCT session_id) FROM records")[0][0]
+
+    def session_ids(self, page_size: int = 1000) -> Iterator[str]:
+        # Paged through the index, so listing every session never holds them all in memory
+        last = ""
+        while rows := self._query("SELECT DISTINCT session_id FROM records WHERE session_id > ? ORDER BY session_id LIMIT ?", (last, page_size)):
+            yield from (row[0] for row in rows)
+            last = rows[-1][0]
+
+    def records(self, session_id: str, kind: str | None = None) -> Iterator[dict]:
+        # Seeks straight to this session's lines, in the order they were appended
+        offsets = [row[0] for row in self._query("SELECT offset FROM records WHERE session_id = ? ORDER BY offset", (session_id,))]
+        if not offsets:
+            return
+        with self.data_path.open("rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                record = json.loads(f.readline())
+                if kind is None or record["kind"] == kind:
+                    yield record
+
+    def iter_records(self, kind: str | None = None) -> Iterator[dict]:
+        # Whole-store scan, one line at a time, for batch jobs that touch every session
+        if not self.data_path.exists():
+            return
+        with self.data_path.open("rb") as f:
+            for line in f:
+                # Torn lines left by a crash mid-append are skipped
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                if kind is None or record["kind"] == kind:
+                    yield record
+
+    def close(self) -> None:
+        self._index.close()
+
+    def session(self, session_id: str) -> dict | None:
+        # The most recent session record, if the session was started with start_session
+        latest = None
+        for latest in self.records(session_id, SESSION):
+            pass
+        return latest
+
+    def messages(self, session_id: str) -> list[dict]:
+        return [{"role": record["role"], "content": record["content"]} for record in self.records(session_id, MESSAGE)]
+
+    def evaluations(self, session_id: str) -> dict[str, Any]:
+        # A judge that was re-run keeps its latest result
+        return {record["judge"]: record["content"] for record in self.records(session_id, EVALUATION)}
+
+    def final_evaluation(self, session_id: str) -> str | None:
+        latest = None
+        for record in self.records(session_id, FINAL_EVALUATION):
+            latest = record["content"]
+        return latest
+
+
+def import_legacy_session(store: SessionStore, transcript_path: str, evaluations_path: str | None = None, session_id: str | None = None, **session_fields: Any) -> str:
+    # One-off migration of the str()-dumped saved_texts files; the store itself never goes through literal_eval
+    with open(transcript_path, "r", encoding="utf-8") as f:
+        messages = ast.literal_eval(f.read())
+
+    session_id = store.start_session(session_id, **session_fields)
+    store.append_messages(session_id, messages)
+    if evaluations_path:
+        with open(evaluations_path, "r", encoding="utf-8") as f:
+            store.append_evaluations(session_id, ast.literal_eval(f.read()))
+    return session_id
@@ -0,0 +1,88 @@
+"""
+Runtime entry point for the interview bot. Every name below resolves on first attribute access (PEP 562), so
+`import interview_bot` costs almost nothing, and openai, the Agents SDK, httpx and bs4 are only imported by the stage
+that needs them.
+"""
+
+import importlib
+from typing import Any
+
+# Public name -> module that defines it
+_EXPORTS = {
+    # constants/
+    "JobListingResearchResponse": "constants.constants",
+    "FeedbackPoint": "constants.constants",
+    "JudgeEvaluation": "constants.constants",
+    "GuardrailResponse": "constants.constants",
+    "PanelEvaluation": "constants.constants",
+    # prompts/
+    "JOB_LISTING_RESEARCH_PROMPT_V1": "prompts.job_parsing_prompts",
+    "DISTILLATION_SYSTEM_PROMPT_V1": "prompts.distillation_prompts",
+    "INTERVIEW_SUMMARY_SYSTEM_PROMPT_V1": "prompts.interview_chat_prompts",
+    "interview_system_prompt_v1": "prompts.interview_chat_prompts",
+    "interview_retrieval_system_prompt_v1": "prompts.interview_chat_prompts",
+    "aggregate_evaluations_prompt_v1": "prompts.evaluation_aggregator_prompts",
+    "INTERVIEW_USER_MESSAGE_GUARDRAIL_PROMPT_V1": "prompts.guardrail_prompts",
+    # Pipeline
+    "PrepPipeline": "pipeline.prep_pipeline",
+    "PrepArtifacts": "pipeline.prep_pipeline",
+    "SpeculativePrep": "pipeline.speculative_prep",
+    "ArtifactStore": "pipeline.artifact_store",
+    "preprocess_listing": "ingestion.listing_preprocessor",
+    "dedupe_question_bank": "ingestion.question_dedup",
+    "canonical_url": "ingestion.canonical_urls",
+    "PageCache": "ingestion.fetchers",
+    "HttpxFetcher": "ingestion.fetchers",
+    "FirecrawlFetcher": "ingestion.fetchers",
+    "ResearchStore": "research.research_store",
+    "ResearchRunner": "research.research_runner",
+    # Retrieval
+    "BM25Index": "retrieval.bm25_index",
+    "build_listing_index": "retrieval.bm25_index",
+    # Interview
+    "ConversationManager": "interview.conversation_manager",
+    "SessionStore": "interview.session_store",
+    "AsyncConversationManager": "interview.conversation_manager",
+    "InterviewSessionManager": "interview.interview_server",
+    "InterviewServer": "interview.interview_server",
+    "MessageGuardrail": "interview.guardrail",
+    "classify_locally": "interview.guardrail",
+    # Evaluation
+    "IncrementalEvaluator": "evaluation.incremental_evaluation",
+    "PipelinedEvaluation": "evaluation.pipelined_aggregation",
+    "merge_feedback": "evaluation.feedback_merge",
+    "format_merged_feedback": "evaluation.feedback_merge",
+    # LLM plumbing
+    "ResponseCache": "llm.response_cache",
+    "CachedOpenAI": "llm.response_cache",
+    "AsyncCachedOpenAI": "llm.response_cache",
+    "RateLimiter": "llm.rate_limiter",
+    "TELEMETRY": "llm.telemetry",
+    "Telemetry": "llm.telemetry",
+    "estimate_tokens": "llm.tokens",
+    "estimate_message_tokens": "llm.tokens",
+}
+
+# Whole modules exposed as attributes, e.g. interview_bot.stages.interview_chat_stream
+_MODULES = {
+    "stages": "pipeline.stages",
+}
+
+__all__ = sorted([*_EXPORTS, *_MODULES])
+
+
+def __getattr__(name: str) -> Any:
+    if name in _MODULES:
+        value = importlib.import_module(_MODULES[name])
+    elif name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # Cache on the module so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,30 @@
+import hashlib
+import inspect
+import json
+from typing import Any, Callable
+
+from pydantic import BaseModel
+
+
+def fingerprint(prompt: str | Callable) -> str:
+    # Prompt (and stage) functions are identified by name *and* source, so editing interview_system_prompt_v1 in place
+    # still invalidates everything built from it.
+    if callable(prompt):
+        source = inspect.getsource(prompt)
+        return f"{prompt.__module__}.{prompt.__qualname__}:{hashlib.sha256(source.encode()).hexdigest()[:16]}"
+    return f"text:{hashlib.sha256(prompt.encode()).hexdigest()[:16]}"
+
+
+def canonical(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return {str(key): canonical(value[key]) for key in sorted(value)}
+    if isinstance(value, (list, tuple)):
+        return [canonical(item) for item in value]
+    return value
+
+
+def content_hash(value: Any) -> str:
+    payload = json.dumps(canonical(value), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
@@ -0,0 +1,54 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from llm.telemetry import collect_spans
+
+
+class RateLimiter:
+    """
+    Global concurrency cap plus a tokens-per-minute bucket, shared by every call in a batch run. A reservation is
+    charged up front from an estimate, then settled against the usage the call's telemetry span actually recorded.
+    """
+
+    def __init__(self, max_concurrency: int = 8, tokens_per_minute: int = 200_000):
+        self.tokens_per_minute = tokens_per_minute
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._available = float(tokens_per_minute)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._available = min(self.tokens_per_minute, self._available + (now - self._updated_at) * self.tokens_per_minute / 60)
+        self._updated_at = now
+
+    async def _take(self, tokens: int) -> int:
+        # A single request larger than the whole budget would otherwise wait forever
+        tokens = min(tokens, self.tokens_per_minute)
+        async with self._lock:
+            self._refill()
+            while self._available < tokens:
+                await asyncio.sleep((tokens - self._available) * 60 / self.tokens_per_minute)
+                self._refill()
+            self._available -= tokens
+        return tokens
+
+    def _settle(self, charged: int, used: int) -> None:
+        # Refunds an overestimate; an underestimate leaves the bucket in debt, so the next calls wait for it
+        self._refill()
+        self._available = min(self.tokens_per_minute, self._available + charged - used)
+
+    @asynccontextmanager
+    async def reserve(self, tokens: int) -> AsyncIterator[None]:
+        async with self._semaphore:
+            charged = await self._take(tokens)
+            with collect_spans() as spans:
+                try:
+                    yield
+                finally:
+                    # No span with usage (a failed request, or a call made outside the stage functions) keeps the estimate
+                    billed = [span for span in spans if span.requests or span.from_response_cache]
+                    if billed:
+                        self._settle(charged, sum(span.prompt_tokens + span.completion_tokens for span in billed if not span.from_response_cache))
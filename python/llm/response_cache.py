@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+
+from llm.hashing import content_hash
+from llm.telemetry import current_span
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+    from openai.types.chat import ChatCompletion, ParsedChatCompletion
+
+# Disk eviction removes least-recently-used entries until the directory is back under this fraction of max_disk_bytes,
+# so a full cache evicts in batches rather than on every put
+DISK_LOW_WATER = 0.9
+
+# Other processes sharing the directory add and remove entries this process never sees; the disk index is rebuilt
+# from a directory scan at least this often
+DISK_RESCAN_SECONDS = 60.0
+
+# Request params that do not change what the model returns, so they are left out of the cache key
+NON_SEMANTIC_PARAMS = {"extra_headers", "extra_query", "timeout", "user", "metadata", "store", "safety_identifier"}
+
+
+def normalize_messages(messages: list[dict]) -> list[dict]:
+    normalized = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            # Scraped markdown differs run to run only in line endings and trailing whitespace
+            content = "\n".join(line.rstrip() for line in content.replace("\r\n", "\n").split("\n")).strip()
+        normalized.append({**message, "content": content})
+    return normalized
+
+
+def response_cache_key(model: str, messages: list[dict], response_format: Any = None, **params) -> str:
+    if isinstance(response_format, type) and issubclass(response_format, BaseModel):
+        response_format = {"name": response_format.__name__, "schema": response_format.model_json_schema()}
+
+    sampling_params = {
+        name: value for name, value in params.items()
+        if name not in NON_SEMANTIC_PARAMS and value is not None
+    }
+    return content_hash({
+        "model": model,
+        "messages": normalize_messages(messages),
+        "response_format": response_format,
+        "params": sampling_params,
+    })
+
+
+class ResponseCache:
+    """
+    Two-tier cache for raw completion payloads: an in-memory LRU in front of a size-bounded disk directory. Disk
+    recency is tracked in memory (seeded from file mtimes), so eviction never has to list and sort the directory.
+    aget/aput serve the memory tier on the event loop and do disk reads, writes and eviction in a worker thread; the
+    memory and disk tiers have separate locks, so the loop never waits on disk work.
+    """
+
+    def __init__(self, directory: str = "./llm_cache", max_memory_entries: int = 512, max_disk_bytes: int = 512 * 1024 * 1024, ttl_seconds: float | None = 7 * 24 * 60 * 60):
+        self.directory = directory
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+        self._memory: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        # Key -> file size, least recently used first
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+        self._scanned_at = 0.0
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        # Key -> future of the identical async request already on its way to the API
+        self.in_flight: dict[str, asyncio.Future] = {}
+
+        os.makedirs(directory, exist_ok=True)
+        self._rescan()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _disk_entries(self) -> list[str]:
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(".json")]
+
+    def _rescan(self) -> None:
+        entries = []
+        for path in self._disk_entries():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, os.path.basename(path)[:-len(".json")], stat.st_size))
+        self._disk = OrderedDict((key, size) for _, key, size in sorted(entries))
+        self._disk_bytes = sum(self._disk.values())
+        self._scanned_at = time.monotonic()
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, created_at: float, payload: dict) -> None:
+        self._memory[key] = (created_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _touch(self, key: str, size: int) -> None:
+        self._disk_bytes += size - self._disk.pop(key, 0)
+        self._disk[key] = size
+
+    def _remove(self, key: str) -> None:
+        self._disk_bytes -= self._disk.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _memory_get(self, key: str) -> dict | None:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and not self._expired(entry[0]):
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self._memory.pop(key, None)
+            return None
+
+    def _disk_get(self, key: str) -> dict | None:
+        path = self._path(key)
+        with self._disk_lock:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    record = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                record = None
+            if record is not None and self._expired(record["created_at"]):
+                self._remove(key)
+                record = None
+            if record is not None:
+                # Touch the file as well, so another process (or the next rescan) sees the same recency
+                os.utime(path)
+                self._touch(key, os.path.getsize(path))
+
+        with self._lock:
+            if record is None:
+                self.misses += 1
+                return None
+            self._remember(key, record["created_at"], record["payload"])
+            self.hits += 1
+            return record["payload"]
+
+    def _disk_put(self, key: str, created_at: float, payload: dict) -> None:
+        data = json.dumps({"created_at": created_at, "payload": payload}, ensure_ascii=False)
+        with self._disk_lock:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+            self._touch(key, len(data.encode("utf-8")))
+            self._evict()
+
+    def get(self, key: str) -> dict | None:
+        payload = self._memory_get(key)
+        return payload if payload is not None else self._disk_get(key)
+
+    async def aget(self, key: str) -> dict | None:
+        payload = self._memory_get(key)
+        return payload if payload is not None else await asyncio.to_thread(self._disk_get, key)
+
+    def put(self, key: str, payload: dict) -> None:
+        created_at = time.time()
+        with self._lock:
+            self._remember(key, created_at, payload)
+        self._disk_put(key, created_at, payload)
+
+    async def aput(self, key: str, payload: dict) -> None:
+        # In memory before the disk write starts, so a request waiting on this key finds it straight away
+        created_at = time.time()
+        with self._lock:
+            self._remember(key, created_at, payload)
+        await asyncio.to_thread(self._disk_put, key, created_at, payload)
+
+    def _evict(self) -> None:
+        if time.monotonic() - self._scanned_at > DISK_RESCAN_SECONDS:
+            self._rescan()
+        if self._disk_bytes <= self.max_disk_bytes:
+            return
+        # Our count may be stale if other processes share the directory; re-sync once before evicting a batch
+        self._rescan()
+        while self._disk and self._disk_bytes > self.max_disk_bytes * DISK_LOW_WATER:
+            self._remove(next(iter(self._disk)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        with self._disk_lock:
+            self._rescan()
+            for key in list(self._disk):
+                self._remove(key)
+
+
+# ===============================
+#        Client wrappers
+# ===============================
+
+def _cacheable(params: dict) -> bool:
+    # Streams and multi-sample requests are passed straight through
+    return not params.get("stream") and params.get("n") in (None, 1)
+
+
+def _load_completion(payload: dict, response_format: Any = None) -> ChatCompletion:
+    from openai.types.chat import ChatCompletion, ParsedChatCompletion
+
+    # The stage's span records this response's usage; marking it keeps a cache hit from counting as spend
+    span = current_span()
+    if span is not None:
+        span.from_response_cache = True
+    if isinstance(response_format, type) and issubclass(response_format, BaseModel):
+        return ParsedChatCompletion[response_format].model_validate(payload)
+    return ChatCompletion.model_validate(payload)
+
+
+class _CachedCompletions:
+    def __init__(self, completions, cache: ResponseCache):
+        self._completions = completions
+        self._cache = cache
+
+    def create(self, *, model: str, messages: list[dict], **params) -> ChatCompletion:
+        if not _cacheable(params):
+            return self._completions.create(model=model, messages=messages, **params)
+        key = response_cache_key(model, messages, **params)
+        payload = self._cache.get(key)
+        if payload is None:
+            response = self._completions.create(model=model, messages=messages, **params)
+            self._cache.put(key, response.model_dump(mode="json"))
+            return response
+        return _load_completion(payload)
+
+    def parse(self, *, model: str, messages: list[dict], response_format: Any, **params) -> ParsedChatCompletion:
+        key = response_cache_key(model, messages, response_format, parse=True, **params)
+        payload = self._cache.get(key)
+        if payload is None:
+            response = self._completions.parse(model=model, messages=messages, response_format=response_format, **params)
+            self._cache.put(key, response.model_dump(mode="json"))
+            return response
+        return _load_completion(payload, response_format)
+
+
+class _AsyncCachedCompletions(_CachedCompletions):
+    async def _cached(self, key: str, call, response_format: Any = None) -> ChatCompletion:
+        payload = self._cache._memory_get(key)
+        if payload is not None:
+            return _load_completion(payload, response_format)
+
+        # Single flight: identical concurrent misses wait for the first one's response instead of each calling the API.
+        # The first caller failing (or being cancelled) wakes the others, and the next one in line tries itself.
+        while (in_flight := self._cache.in_flight.get(key)) is not None:
+            await asyncio.shield(in_flight)
+        future = asyncio.get_running_loop().create_future()
+        self._cache.in_flight[key] = future
+        try:
+            payload = await self._cache.aget(key)
+            if payload is not None:
+                return _load_completion(payload, response_format)
+            response = await call()
+            await self._cache.aput(key, response.model_dump(mode="json"))
+            return response
+        finally:
+            del self._cache.in_flight[key]
+            future.set_result(None)
+
+    async def create(self, *, model: str, messages: list[dict], **params) -> ChatCompletion:
+        if not _cacheable(params):
+            return await self._completions.create(model=model, messages=messages, **params)
+        key = response_cache_key(model, messages, **params)
+        return await self._cached(key, lambda: self._completions.create(model=model, messages=messages, **params))
+
+    async def parse(self, *, model: str, messages: list[dict], response_format: Any, **params) -> ParsedChatCompletion:
+        key = response_cache_key(model, messages, response_format, parse=True, **params)
+        return await self._cached(key, lambda: self._completions.parse(model=model, messages=messages, response_format=response_format, **params), response_format)
+
+
+class _Namespace:
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+class CachedOpenAI:
+    """
+    Drop-in stand-in for the OpenAI client in the stage functions (extract_job_listing_attributes,
+    create_interview_guide, aggregate_evaluations). Anything other than chat completions goes to the wrapped client.
+    """
+
+    completions_type = _CachedCompletions
+
+    def __init__(self, client: OpenAI | AsyncOpenAI, cache: ResponseCache | None = None):
+        self._client = client
+        self.cache = cache or ResponseCache()
+        self.chat = _Namespace(completions=self.completions_type(client.chat.completions, self.cache))
+        # Newer SDKs dropped beta.chat once structured outputs went GA; route it to chat.completions there
+        beta_chat = getattr(client.beta, "chat", client.chat)
+        self.beta = _Namespace(chat=_Namespace(completions=self.completions_type(beta_chat.completions, self.cache)))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+class AsyncCachedOpenAI(CachedOpenAI):
+    completions_type = _AsyncCachedCompletions
@@ -0,0 +1,288 @@
+import contextvars
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+# USD per 1M tokens: (input, cached input, output)
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4o": (2.50, 1.25, 10.00),
+}
+
+# Upper bounds (seconds) of the Prometheus histogram buckets for wall time and time to first token
+LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+
+METRIC_PREFIX = "interview_bot_model_call"
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+    # Dated snapshots ("gpt-4o-mini-2024-07-18") are priced like their alias; unknown models cost 0 rather than guess
+    prices = MODEL_PRICES.get(model) or next((price for name, price in MODEL_PRICES.items() if model.startswith(f"{name}-")), None)
+    if prices is None:
+        return 0.0
+    input_price, cached_price, output_price = prices
+    uncached_tokens = max(prompt_tokens - cached_tokens, 0)
+    return (uncached_tokens * input_price + cached_tokens * cached_price + completion_tokens * output_price) / 1_000_000
+
+
+@dataclass
+class Span:
+    stage: str
+    model: str
+    name: str = ""
+    started_at: float = field(default_factory=time.time)
+    wall_seconds: float = 0.0
+    # Only set for streamed calls; a non-streamed response has no first token before the whole reply
+    ttft_seconds: float | None = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    requests: int = 0
+    cost_usd: float = 0.0
+    error: str | None = None
+    # Served by llm.response_cache without an API call; its tokens are reported but cost nothing and stay out of totals
+    from_response_cache: bool = False
+    _clock: float = field(default_factory=time.perf_counter, repr=False)
+
+    def first_token(self) -> None:
+        if self.ttft_seconds is None:
+            self.ttft_seconds = time.perf_counter() - self._clock
+
+    def record_usage(self, usage: Any) -> None:
+        # Accepts Chat Completions usage and the Agents SDK's run usage; accumulates, since an agent run is several requests
+        if usage is None:
+            return
+        if hasattr(usage, "input_tokens"):
+            self.prompt_tokens += usage.input_tokens or 0
+            self.completion_tokens += usage.output_tokens or 0
+            details = getattr(usage, "input_tokens_details", None)
+            self.requests += getattr(usage, "requests", 1) or 0
+        else:
+            self.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+            self.completion_tokens += getattr(usage, "completion_tokens", 0) or 0
+            details = getattr(usage, "prompt_tokens_details", None)
+            self.requests += 1
+        self.cached_tokens += (getattr(details, "cached_tokens", 0) or 0) if details else 0
+
+    def record_response(self, response: Any) -> None:
+        self.record_usage(getattr(response, "usage", None))
+
+    def record_chunk(self, chunk: Any) -> None:
+        # With stream_options={"include_usage": True} the usage arrives on a final chunk that has no choices
+        if chunk.choices and chunk.choices[0].delta.content:
+            self.first_token()
+        self.record_usage(getattr(chunk, "usage", None))
+
+    def to_dict(self) -> dict:
+        return {
+            "stage": self.stage,
+            "name": self.name,
+            "model": self.model,
+            "started_at": self.started_at,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "ttft_seconds": None if self.ttft_seconds is None else round(self.ttft_seconds, 4),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "requests": self.requests,
+            "cost_usd": round(self.cost_usd, 8),
+            "error": self.error,
+            "from_response_cache": self.from_response_cache,
+        }
+
+
+class _SeriesTotals:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.wall_sum = 0.0
+        self.wall_buckets = [0] * len(LATENCY_BUCKETS)
+        self.ttft_count = 0
+        self.ttft_sum = 0.0
+        self.ttft_buckets = [0] * len(LATENCY_BUCKETS)
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+        self.cost_usd = 0.0
+        self.response_cache_hits = 0
+
+    def add(self, span: Span) -> None:
+        self.calls += 1
+        self.errors += span.error is not None
+        self.wall_sum += span.wall_seconds
+        _observe(self.wall_buckets, span.wall_seconds)
+        if span.ttft_seconds is not None:
+            self.ttft_count += 1
+            self.ttft_sum += span.ttft_seconds
+            _observe(self.ttft_buckets, span.ttft_seconds)
+        if span.from_response_cache:
+            self.response_cache_hits += 1
+            return
+        self.prompt_tokens += span.prompt_tokens
+        self.completion_tokens += span.completion_tokens
+        self.cached_tokens += span.cached_tokens
+        self.cost_usd += span.cost_usd
+
+
+def _observe(buckets: list[int], value: float) -> None:
+    for index, bound in enumerate(LATENCY_BUCKETS):
+        if value <= bound:
+            buckets[index] += 1
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items()) + "}"
+
+
+_CURRENT_SPAN: contextvars.ContextVar[Span | None] = contextvars.ContextVar("current_span", default=None)
+
+
+def current_span() -> Span | None:
+    # The span of the model call in progress in this thread or task, for code below the stage functions (the response cache)
+    return _CURRENT_SPAN.get()
+
+
+_SPAN_COLLECTORS: contextvars.ContextVar[tuple[list[Span], ...]] = contextvars.ContextVar("span_collectors", default=())
+
+
+@contextmanager
+def collect_spans() -> Iterator[list[Span]]:
+    # Every span that finishes in this thread or task while the block runs, for code above the stage functions (the rate limiter)
+    spans: list[Span] = []
+    token = _SPAN_COLLECTORS.set((*_SPAN_COLLECTORS.get(), spans))
+    try:
+        yield spans
+    finally:
+        _SPAN_COLLECTORS.reset(token)
+
+
+class Telemetry:
+    """
+    Collects one span per model call. The most recent spans are kept for JSONL export, and per (stage, name, model)
+    totals are kept for the Prometheus text export, so memory stays bounded in a long-running process.
+    """
+
+    def __init__(self, max_spans: int = 10_000):
+        self.spans: deque[Span] = deque(maxlen=max_spans)
+        self._totals: dict[tuple[str, str, str], _SeriesTotals] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage: str, model: str, name: str = "") -> Iterator[Span]:
+        span = Span(stage=stage, model=model, name=name)
+        token = _CURRENT_SPAN.set(span)
+        try:
+            yield span
+        except GeneratorExit:
+            # A streamed reply the consumer stopped reading
+            span.error = "cancelled"
+            raise
+        except BaseException as error:
+            span.error = "cancelled" if type(error).__name__ == "CancelledError" else type(error).__name__
+            raise
+        finally:
+            # A streamed span closed from another context (generator finalised elsewhere) can't reset its token
+            try:
+                _CURRENT_SPAN.reset(token)
+            except ValueError:
+                pass
+            span.wall_seconds = time.perf_counter() - span._clock
+            span.cost_usd = 0.0 if span.from_response_cache else estimate_cost(model, span.prompt_tokens, span.completion_tokens, span.cached_tokens)
+            self.record(span)
+            for collected in _SPAN_COLLECTORS.get():
+                collected.append(span)
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+            key = (span.stage, span.name, span.model)
+            self._totals.setdefault(key, _SeriesTotals()).add(span)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.spans.clear()
+            self._totals.clear()
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        # Per-stage totals across names and models, for printing in the notebook
+        stages: dict[str, dict[str, float]] = {}
+        with self._lock:
+            for (stage, _, _), totals in self._totals.items():
+                row = stages.setdefault(stage, {"calls": 0, "response_cache_hits": 0, "wall_seconds": 0.0, "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0, "cost_usd": 0.0})
+                row["calls"] += totals.calls
+                row["response_cache_hits"] += totals.response_cache_hits
+                row["wall_seconds"] += totals.wall_sum
+                row["prompt_tokens"] += totals.prompt_tokens
+                row["completion_tokens"] += totals.completion_tokens
+                row["cached_tokens"] += totals.cached_tokens
+                row["cost_usd"] += totals.cost_usd
+        return stages
+
+    def write_jsonl(self, path: str | Path) -> int:
+        # Exported spans are drained, so calling this periodically appends each span once
+        with self._lock:
+            spans = list(self.spans)
+            self.spans.clear()
+        with Path(path).open("a", encoding="utf-8") as file:
+            for span in spans:
+                file.write(json.dumps(span.to_dict()) + "\n")
+        return len(spans)
+
+    def prometheus_text(self) -> str:
+        with self._lock:
+            series = sorted(self._totals.items())
+
+        lines = []
+
+        def histogram(metric: str, help_text: str, count_of, sum_of, buckets_of) -> None:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for (stage, name, model), totals in series:
+                for bound, count in zip(LATENCY_BUCKETS, buckets_of(totals)):
+                    lines.append(f"{metric}_bucket{_labels(stage=stage, name=name, model=model, le=str(bound))} {count}")
+                lines.append(f"{metric}_bucket{_labels(stage=stage, name=name, model=model, le='+Inf')} {count_of(totals)}")
+                lines.append(f"{metric}_sum{_labels(stage=stage, name=name, model=model)} {sum_of(totals)}")
+                lines.append(f"{metric}_count{_labels(stage=stage, name=name, model=model)} {count_of(totals)}")
+
+        def counter(metric: str, help_text: str, samples_of) -> None:
+            # samples_of(totals) -> [(extra labels, value)]
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for (stage, name, model), totals in series:
+                for extra_labels, value in samples_of(totals):
+                    lines.append(f"{metric}{_labels(stage=stage, name=name, model=model, **extra_labels)} {value}")
+
+        histogram(f"{METRIC_PREFIX}_seconds", "Wall time of model calls.", lambda t: t.calls, lambda t: t.wall_sum, lambda t: t.wall_buckets)
+        histogram(f"{METRIC_PREFIX}_ttft_seconds", "Time to first streamed token (streamed calls only).", lambda t: t.ttft_count, lambda t: t.ttft_sum, lambda t: t.ttft_buckets)
+        counter(f"{METRIC_PREFIX}_errors_total", "Model calls that raised or were cancelled.", lambda t: [({}, t.errors)])
+        counter(f"{METRIC_PREFIX}_response_cache_hits_total", "Calls served from the local response cache; excluded from tokens and cost.", lambda t: [({}, t.response_cache_hits)])
+        counter(
+            f"{METRIC_PREFIX}_tokens_total",
+            "Tokens reported by the API; cached is the part of prompt served from the prompt cache.",
+            lambda t: [({"type": "prompt"}, t.prompt_tokens), ({"type": "completion"}, t.completion_tokens), ({"type": "cached"}, t.cached_tokens)],
+        )
+        counter(f"{METRIC_PREFIX}_cost_usd_total", "Estimated spend from MODEL_PRICES.", lambda t: [({}, round(t.cost_usd, 8))])
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str | Path) -> None:
+        # Write-then-rename so a node_exporter textfile collector never reads a half-written file
+        path = Path(path)
+        temporary = path.with_suffix(path.suffix + ".tmp")
+        temporary.write_text(self.prometheus_text(), encoding="utf-8")
+        temporary.replace(path)
+
+
+# Process-wide collector the stage functions record into
+TELEMETRY = Telemetry()
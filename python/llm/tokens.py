@@ -0,0 +1,15 @@
+# Rough token counts for budgeting. About 4 characters per token for English text with the GPT-4o / GPT-4.1
+# tokenizers, which is close enough for deciding what fits without pulling in a tokenizer dependency.
+
+CHARS_PER_TOKEN = 4
+
+# Role and delimiter overhead the chat format adds to each message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def estimate_message_tokens(messages: list[dict]) -> int:
+    return sum(estimate_tokens(message.get("content") or "") + MESSAGE_OVERHEAD_TOKENS for message in messages)
@@ -0,0 +1,42 @@
+import json
+import os
+import tempfile
+import time
+from typing import Any
+
+# content_hash and fingerprint are re-exported for callers that import them from here
+from llm.hashing import canonical, content_hash, fingerprint
+
+
+class ArtifactStore:
+    """Content-addressed store: every artifact lives under the hash of the inputs that produced it."""
+
+    def __init__(self, root: str = "./artifacts"):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def key(self, stage: str, inputs: dict) -> str:
+        return content_hash({"stage": stage, "inputs": inputs})
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Any | None:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)["value"]
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, stage: str, value: Any) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temp file and rename so a crashed run never leaves a half-written artifact behind
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"stage": stage, "created_at": time.time(), "value": canonical(value)}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from constants.constants import JobListingResearchResponse, JudgeEvaluation, PanelEvaluation
+from evaluation.context_planner import plan_judge_context
+from evaluation.feedback_merge import format_merged_feedback, merge_feedback
+from ingestion.fetchers import PageFetcher
+from ingestion.listing_preprocessor import PreprocessedListing, preprocess_listing
+from ingestion.question_dedup import DedupedQuestionBank, dedupe_question_bank
+from llm.hashing import content_hash, fingerprint
+from llm.response_cache import AsyncCachedOpenAI, CachedOpenAI, ResponseCache
+from pipeline import stages
+from pipeline.artifact_store import ArtifactStore
+from prompts.distillation_prompts import DISTILLATION_SYSTEM_PROMPT_V1
+from prompts.evaluation_aggregator_prompts import aggregate_evaluations_prompt_v1
+from prompts.job_parsing_prompts import JOB_LISTING_RESEARCH_PROMPT_V1
+from research.research_runner import PillarResult, ResearchRunner, combine_partial_research
+from research.research_store import ResearchStore, perform_research_with_store
+from retrieval.bm25_index import BM25Index, build_listing_index, chunk_markdown, tokenize
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+
+@dataclass
+class StageRun:
+    stage: str
+    key: str
+    cached: bool
+
+
+@dataclass
+class PrepArtifacts:
+    scraped_job_listing: str
+    job_listing_research_response: JobListingResearchResponse
+    deep_research_results: str
+    interview_guide: str
+
+
+class PrepPipeline:
+    """
+    Runs the notebook flow (scrape -> parse -> research -> guide -> evaluations -> aggregation) with every stage's
+    output stored under a hash of its inputs, so a re-run only recomputes the stages whose inputs changed. Both clients
+    go through the response cache, so a model call whose exact request was seen before (e.g. a judge re-run on an
+    unchanged transcript under a different stage key) is not paid for twice.
+    """
+
+    def __init__(self, client: OpenAI, async_client: AsyncOpenAI, store: ArtifactStore | None = None, firecrawl=None, fetcher: PageFetcher | None = None, research_store: ResearchStore | None = None, research_runner: ResearchRunner | None = None, response_cache: ResponseCache | None = None):
+        self.response_cache = response_cache or ResponseCache()
+        self.client = CachedOpenAI(client, self.response_cache)
+        self.async_client = AsyncCachedOpenAI(async_client, self.response_cache)
+        self.store = store or ArtifactStore()
+        self.firecrawl = firecrawl
+        self.fetcher = fetcher
+        self.research_store = research_store
+        self.research_runner = research_runner
+        self.research_results: dict[str, PillarResult] = {}
+        self.runs: list[StageRun] = []
+        self.preprocessed_listing: PreprocessedListing | None = None
+        self.question_bank: DedupedQuestionBank | None = None
+
+    def _lookup(self, stage: str, inputs: dict, refresh: bool = False) -> tuple[str, Any | None]:
+        key = self.store.key(stage, inputs)
+        value = None if refresh else self.store.get(key)
+        self.runs.append(StageRun(stage=stage, key=key, cached=value is not None))
+        return key, value
+
+    def _cached(self, stage: str, inputs: dict, compute: Callable[[], Any], refresh: bool = False) -> Any:
+        key, value = self._lookup(stage, inputs, refresh)
+        if value is None:
+            value = compute()
+            self.store.put(key, stage, value)
+        return value
+
+    async def _cached_async(self, stage: str, inputs: dict, compute: Callable[[], Awaitable[Any]]) -> Any:
+        key, value = self._lookup(stage, inputs)
+        if value is None:
+            value = await compute()
+            self.store.put(key, stage, value)
+        return value
+
+    # ===============================
+    #            Stages
+    # ===============================
+
+    def scrape(self, job_listing_url: str, refresh: bool = False) -> str:
+        # Pages can change under the same URL, so callers pass refresh=True to force a new scrape
+        compute = lambda: self.firecrawl.scrape(job_listing_url, formats=["markdown"]).markdown
+        return self._cached("scrape", {"url": job_listing_url}, compute, refresh)
+
+    async def fetch(self, job_listing_url: str) -> str:
+        # With a fetcher the page cache revalidates against the server; an unchanged page comes back from a 304, and the
+        # extraction below is then a cache hit because the content hash is unchanged
+        if self.fetcher is None:
+            return await asyncio.to_thread(self.scrape, job_listing_url)
+        page = await self.fetcher.fetch(job_listing_url)
+        self.runs.append(StageRun(stage="fetch", key=page.url, cached=page.not_modified))
+        return page.content
+
+    def _extract_job_listing_inputs(self, scraped_job_listing: str) -> tuple[str, dict]:
+        # Only the posting region reaches the model; the key is on the cleaned text, so nav/footer churn is a cache hit
+        self.preprocessed_listing = preprocess_listing(scraped_job_listing)
+        listing_text = self.preprocessed_listing.text
+        inputs = {
+            "code": [fingerprint(stages.extract_job_listing_attributes), fingerprint(stages.extract_job_listing_attributes_async), fingerprint(stages.job_parsing_messages)],
+            "prompt": fingerprint(JOB_LISTING_RESEARCH_PROMPT_V1),
+            "model": stages.JOB_PARSING_MODEL,
+            "schema": content_hash(JobListingResearchResponse.model_json_schema()),
+            "listing_text": content_hash(listing_text),
+        }
+        return listing_text, inputs
+
+    def extract_job_listing(self, scraped_job_listing: str) -> JobListingResearchResponse:
+        listing_text, inputs = self._extract_job_listing_inputs(scraped_job_listing)
+        value = self._cached("extract_job_listing", inputs, lambda: stages.extract_job_listing_attributes(self.client, listing_text))
+        return JobListingResearchResponse(**value) if isinstance(value, dict) else value
+
+    async def extract_job_listing_async(self, scraped_job_listing: str) -> JobListingResearchResponse:
+        listing_text, inputs = self._extract_job_listing_inputs(scraped_job_listing)
+        value = await self._cached_async("extract_job_listing", inputs, lambda: stages.extract_job_listing_attributes_async(self.async_client, listing_text))
+        return JobListingResearchResponse(**value) if isinstance(value, dict) else value
+
+    async def research_pillar(self, pillar: str, listing: JobListingResearchResponse) -> str:
+        instructions, _ = stages.RESEARCH_PILLARS[pillar]
+        query = stages.research_query(pillar, listing)
+        inputs = {
+            "pillar": pillar,
+            "prompt": fingerprint(instructions),
+            "model": stages.RESEARCH_MODEL,
+            "query": query,
+        }
+        return await self._cached_async(f"research:{pillar}", inputs, lambda: stages.run_research_pillar(pillar, listing))
+
+    async def deep_research(self, listing: JobListingResearchResponse) -> str:
+        # With a research runner, slow pillars are hedged and dropped at their deadline; the guide is built from
+        # whatever finished, with missing sections marked
+        if self.research_runner is not None:
+            # Attempts go through research_pillar, so a pillar finished on an earlier run is a cache hit here too
+            self.research_results = await self.research_runner.run(listing, self.research_store, self.research_pillar)
+            return combine_partial_research(self.research_results)
+
+        # With a research store, pillars are shared across listings at the same company instead of keyed per listing
+        if self.research_store is not None:
+            results = await perform_research_with_store(self.research_store, listing, self.research_pillar)
+            return stages.combine_research([results[pillar] for pillar in stages.RESEARCH_PILLARS])
+
+        # Each pillar is its own artifact, so editing one research prompt only re-runs that agent
+        results = await asyncio.gather(*(self.research_pillar(pillar, listing) for pillar in stages.RESEARCH_PILLARS))
+        return stages.combine_research(results)
+
+    def _interview_guide_inputs(self, listing: JobListingResearchResponse, deep_research_results: str, interview_questions: str) -> tuple[str, dict]:
+        # Reworded duplicates in scraped question banks are collapsed first; the key is on the deduplicated bank
+        self.question_bank = dedupe_question_bank(interview_questions)
+        interview_questions = self.question_bank.text
+        inputs = {
+            "code": [fingerprint(stages.create_interview_guide), fingerprint(stages.create_interview_guide_async), fingerprint(stages.distillation_messages)],
+            "prompt": fingerprint(DISTILLATION_SYSTEM_PROMPT_V1),
+            "model": stages.DISTILLATION_MODEL,
+            "input": content_hash(stages.interview_guide_input(listing, deep_research_results, interview_questions)),
+        }
+        return interview_questions, inputs
+
+    def interview_guide(self, listing: JobListingResearchResponse, deep_research_results: str, interview_questions: str) -> str:
+        interview_questions, inputs = self._interview_guide_inputs(listing, deep_research_results, interview_questions)
+        return self._cached("interview_guide", inputs, lambda: stages.create_interview_guide(self.client, listing, deep_research_results, interview_questions))
+
+    async def interview_guide_async(self, listing: JobListingResearchResponse, deep_research_results: str, interview_questions: str) -> str:
+        # Same artifact as interview_guide; the async call can be cancelled mid-request, which speculative prep relies on
+        interview_questions, inputs = self._interview_guide_inputs(listing, deep_research_results, interview_questions)
+        return await self._cached_async("interview_guide", inputs, lambda: stages.create_interview_guide_async(self.async_client, listing, deep_research_results, interview_questions))
+
+    def retrieval_index(self, deep_research_results: str, interview_guide: str) -> BM25Index:
+        # Chunked and indexed once per research/guide pair; interview sessions reload it from the store
+        inputs = {
+            "code": [fingerprint(build_listing_index), fingerprint(chunk_markdown), fingerprint(tokenize)],
+            "deep_research_results": content_hash(deep_research_results),
+            "interview_guide": content_hash(interview_guide),
+        }
+        value = self._cached("retrieval_index", inputs, lambda: build_listing_index(deep_research_results, interview_guide).to_dict())
+        return BM25Index.from_dict(value)
+
+    def _judge_context(self, name: str, deep_research_results: str, interview_guide: str, context_budget: int | None) -> tuple[str, str, dict]:
+        # With a budget each judge gets only its relevant research pillars and guide sections; the cache keys on what it was sent
+        inputs = {}
+        if context_budget is not None:
+            context = plan_judge_context(name, deep_research_results, interview_guide, context_budget)
+            deep_research_results, interview_guide = context.deep_research_results, context.interview_guide
+            inputs = {"context_planner": fingerprint(plan_judge_context), "context_budget": context_budget}
+        inputs["deep_research_results"] = content_hash(deep_research_results)
+        inputs["interview_guide"] = content_hash(interview_guide)
+        return deep_research_results, interview_guide, inputs
+
+    async def evaluations(self, listing: JobListingResearchResponse, deep_research_results: str, interview_guide: str, interview_transcript: str, layout: str = stages.JUDGE_FIRST_LAYOUT, mode: str = stages.FAN_OUT_MODE, context_budget: int | None = None) -> dict[str, str]:
+        upstream = {
+            "listing": content_hash(listing),
+            "deep_research_results": content_hash(deep_research_results),
+            "interview_guide": content_hash(interview_guide),
+            "interview_transcript": content_hash(interview_transcript),
+        }
+
+        if mode == stages.SINGLE_CALL_MODE:
+            inputs = {
+                "code": fingerprint(stages.evaluate_interview_single_call),
+                "prompt": [fingerprint(part) for part in stages.PANEL_PROMPT_PARTS],
+                "schema": content_hash(PanelEvaluation.model_json_schema()),
+                "model": stages.JUDGE_MODEL,
+                **upstream,
+            }
+            return await self._cached_async(
+                "evaluation:panel",
+                inputs,
+                lambda: stages.evaluate_interview_single_call(self.async_client, listing, deep_research_results, interview_guide, interview_transcript),
+            )
+
+        async def judge(name: str) -> str:
+            judge_research, judge_guide, context_inputs = self._judge_context(name, deep_research_results, interview_guide, context_budget)
+            inputs = {
+                "code": fingerprint(stages.judge_messages),
+                "prompt": [fingerprint(part) for part in stages.judge_prompt_parts(name, layout)],
+                "layout": layout,
+                "model": stages.JUDGE_MODEL,
+                **upstream,
+                **context_inputs,
+            }
+            return await self._cached_async(
+                f"evaluation:{name}",
+                inputs,
+                lambda: stages.evaluate_interview(self.async_client, name, listing, judge_research, judge_guide, interview_transcript, layout),
+            )
+
+        results = await asyncio.gather(*(judge(name) for name in stages.JUDGE_PROMPTS))
+        return dict(zip(stages.JUDGE_PROMPTS.keys(), results))
+
+    async def structured_evaluations(self, listing: JobListingResearchResponse, deep_research_results: str, interview_guide: str, interview_transcript: str, layout: str = stages.JUDGE_FIRST_LAYOUT, context_budget: int | None = None) -> dict[str, JudgeEvaluation]:
+        upstream = {
+            "listing": content_hash(listing),
+            "interview_transcript": content_hash(interview_transcript),
+        }
+
+        async def judge(name: str) -> JudgeEvaluation:
+            judge_research, judge_guide, context_inputs = self._judge_context(name, deep_research_results, interview_guide, context_budget)
+            inputs = {
+                "code": [fingerprint(stages.evaluate_interview_structured), fingerprint(stages.judge_messages)],
+                "prompt": [fingerprint(part) for part in stages.judge_prompt_parts(name, layout)],
+                "schema": content_hash(JudgeEvaluation.model_json_schema()),
+                "layout": layout,
+                "model": stages.JUDGE_MODEL,
+                **upstream,
+                **context_inputs,
+            }
+            value = await self._cached_async(
+                f"structured_evaluation:{name}",
+                inputs,
+                lambda: stages.evaluate_interview_structured(self.async_client, name, listing, judge_research, judge_guide, interview_transcript, layout),
+            )
+            return JudgeEvaluation(**value) if isinstance(value, dict) else value
+
+        results = await asyncio.gather(*(judge(name) for name in stages.JUDGE_PROMPTS))
+        return dict(zip(stages.JUDGE_PROMPTS.keys(), results))
+
+    def _final_evaluation_inputs(self, listing: JobListingResearchResponse, combined_evaluations: str) -> dict:
+        return {
+            "code": [fingerprint(stages.aggregate_evaluations), fingerprint(stages.aggregate_evaluations_async), fingerprint(stages.aggregator_messages)],
+            "prompt": fingerprint(aggregate_evaluations_prompt_v1),
+            "model": stages.AGGREGATOR_MODEL,
+            "listing": content_hash(listing),
+            "combined_evaluations": content_hash(combined_evaluations),
+        }
+
+    def final_evaluation(self, listing: JobListingResearchResponse, combined_evaluations: str) -> str:
+        inputs = self._final_evaluation_inputs(listing, combined_evaluations)
+        return self._cached("final_evaluation", inputs, lambda: stages.aggregate_evaluations(self.client, listing, combined_evaluations))
+
+    async def final_evaluation_async(self, listing: JobListingResearchResponse, combined_evaluations: str) -> str:
+        inputs = self._final_evaluation_inputs(listing, combined_evaluations)
+        return await self._cached_async("final_evaluation", inputs, lambda: stages.aggregate_evaluations_async(self.async_client, listing, combined_evaluations))
+
+    # ===============================
+    #           Full flows
+    # ===============================
+
+    async def prepare(self, job_listing_url: str, interview_questions: str) -> PrepArtifacts:
+        scraped_job_listing = await self.fetch(job_listing_url)
+        listing = await self.extract_job_listing_async(scraped_job_listing)
+        deep_research_results = await self.deep_research(listing)
+        interview_guide = await self.interview_guide_async(listing, deep_research_results, interview_questions)
+        return PrepArtifacts(scraped_job_listing, listing, deep_research_results, interview_guide)
+
+    async def evaluate(self, prep: PrepArtifacts, interview_messages: list[dict], mode: str = stages.FAN_OUT_MODE, structured: bool = False, context_budget: int | None = None) -> tuple[dict, str]:
+        # structured=True has the judges return JudgeEvaluation and merges overlapping points locally before aggregation.
+        # context_budget gives each judge only its relevant research and guide sections (fan-out judges only).
+        if structured and mode != stages.FAN_OUT_MODE:
+            raise ValueError(f"Structured evaluation runs one call per judge; mode {mode!r} is not supported with structured=True")
+        listing = prep.job_listing_research_response
+        interview_transcript = stages.format_interview_transcript(interview_messages)
+        if structured:
+            evaluations = await self.structured_evaluations(listing, prep.deep_research_results, prep.interview_guide, interview_transcript, context_budget=context_budget)
+            combined_evaluations = format_merged_feedback(evaluations, merge_feedback(evaluations))
+        else:
+            evaluations = await self.evaluations(listing, prep.deep_research_results, prep.interview_guide, interview_transcript, mode=mode, context_budget=context_budget)
+            combined_evaluations = stages.combine_evaluations(evaluations)
+        return evaluations, await self.final_evaluation_async(listing, combined_evaluations)
+
+    def recomputed_stages(self) -> list[str]:
+        return [run.stage for run in self.runs if not run.cached]
@@ -0,0 +1,113 @@
+import asyncio
+
+from constants.constants import JobListingResearchResponse
+from pipeline import stages
+from pipeline.prep_pipeline import PrepArtifacts, PrepPipeline
+
+# Research key used when the research runner or research store is configured; both run the pillars as one unit
+WHOLE_REPORT = "report"
+
+
+class SpeculativePrep:
+    """
+    Splits PrepPipeline.prepare at the point where the user reviews the extracted listing. Research and guide
+    distillation start as soon as extraction returns; confirm() keeps every task whose inputs the user's edits left
+    unchanged and cancels and restarts the rest, so an unedited listing is ready about as soon as the user confirms.
+    """
+
+    def __init__(self, pipeline: PrepPipeline, interview_questions: str):
+        self.pipeline = pipeline
+        self.interview_questions = interview_questions
+        self.scraped_job_listing: str | None = None
+        self.listing: JobListingResearchResponse | None = None
+
+        # Name -> (what the task read from the listing, task)
+        self._research: dict[str, tuple[str, asyncio.Task]] = {}
+        self._guide: tuple[str, asyncio.Task] | None = None
+        # What the latest confirm() kept and restarted
+        self.reused: list[str] = []
+        self.cancelled: list[str] = []
+
+    def _research_keys(self, listing: JobListingResearchResponse) -> dict[str, str]:
+        # Research only reads the company name and job title, so edits to the description or requirements keep it
+        queries = {pillar: stages.research_query(pillar, listing) for pillar in stages.RESEARCH_PILLARS}
+        if self.pipeline.research_runner is not None or self.pipeline.research_store is not None:
+            return {WHOLE_REPORT: "\n".join(queries.values())}
+        return queries
+
+    def _guide_key(self, listing: JobListingResearchResponse) -> str:
+        # The listing fields the distillation prompt reads; the research it reads is checked separately
+        return stages.interview_guide_input(listing, "", self.interview_questions)
+
+    @staticmethod
+    def _reusable(task: asyncio.Task) -> bool:
+        # A speculative attempt that failed (or was cancelled) is retried rather than re-raised at confirm time
+        return not task.done() or (not task.cancelled() and task.exception() is None)
+
+    def _discard(self, name: str, task: asyncio.Task) -> None:
+        if not task.done():
+            task.cancel()
+            self.cancelled.append(name)
+        elif not task.cancelled():
+            # Retrieved so a replaced failed attempt doesn't log an unretrieved exception
+            task.exception()
+
+    def _start_research(self, name: str, listing: JobListingResearchResponse) -> asyncio.Task:
+        if name == WHOLE_REPORT:
+            return asyncio.create_task(self.pipeline.deep_research(listing))
+        return asyncio.create_task(self.pipeline.research_pillar(name, listing))
+
+    async def _research_results(self, tasks: list[asyncio.Task]) -> str:
+        # asyncio.wait rather than gather: cancelling the guide must not cancel research tasks that are kept
+        await asyncio.wait(tasks)
+        results = [task.result() for task in tasks]
+        return results[0] if list(self._research) == [WHOLE_REPORT] else stages.combine_research(results)
+
+    async def _distill(self, listing: JobListingResearchResponse, tasks: list[asyncio.Task]) -> str:
+        deep_research_results = await self._research_results(tasks)
+        return await self.pipeline.interview_guide_async(listing, deep_research_results, self.interview_questions)
+
+    def _start_guide(self, listing: JobListingResearchResponse) -> None:
+        tasks = [task for _, task in self._research.values()]
+        self._guide = (self._guide_key(listing), asyncio.create_task(self._distill(listing, tasks)))
+
+    async def extract(self, job_listing_url: str) -> JobListingResearchResponse:
+        self.scraped_job_listing = await self.pipeline.fetch(job_listing_url)
+        self.listing = await self.pipeline.extract_job_listing_async(self.scraped_job_listing)
+        self._research = {name: (key, self._start_research(name, self.listing)) for name, key in self._research_keys(self.listing).items()}
+        self._start_guide(self.listing)
+        return self.listing
+
+    async def confirm(self, listing: JobListingResearchResponse | None = None) -> PrepArtifacts:
+        # listing is the user's edited copy; None confirms the extracted listing as it was
+        listing = listing or self.listing
+        self.reused, self.cancelled = [], []
+        research_reused = True
+        for name, key in self._research_keys(listing).items():
+            previous = self._research.get(name)
+            if previous is not None and previous[0] == key and self._reusable(previous[1]):
+                self.reused.append(f"research:{name}")
+                continue
+            research_reused = False
+            if previous is not None:
+                self._discard(f"research:{name}", previous[1])
+            self._research[name] = (key, self._start_research(name, listing))
+
+        if research_reused and self._guide is not None and self._guide[0] == self._guide_key(listing) and self._reusable(self._guide[1]):
+            self.reused.append("interview_guide")
+        else:
+            if self._guide is not None:
+                self._discard("interview_guide", self._guide[1])
+            self._start_guide(listing)
+
+        self.listing = listing
+        interview_guide = await self._guide[1]
+        deep_research_results = await self._research_results([task for _, task in self._research.values()])
+        return PrepArtifacts(self.scraped_job_listing, listing, deep_research_results, interview_guide)
+
+    def cancel(self) -> None:
+        # For a user who abandons the review; results already stored in the artifact store stay there
+        for _, task in self._research.values():
+            task.cancel()
+        if self._guide is not None:
+            self._guide[1].cancel()
@@ -0,0 +1,503 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import TYPE_CHECKING, AsyncIterator, Iterator
+
+from constants.constants import GuardrailResponse, JobListingResearchResponse, JudgeEvaluation, PanelEvaluation
+from llm.telemetry import TELEMETRY
+from prompts.distillation_prompts import DISTILLATION_SYSTEM_PROMPT_V1
+from prompts.evaluation_aggregator_prompts import aggregate_evaluations_prompt_v1
+from prompts.evaluation_prompts import (
+    JUDGE_TRANSCRIPT_INPUT_V1,
+    SHARED_PREFIX_TRANSCRIPT_INPUT_V1,
+    communication_judge_instructions_v1,
+    communication_judge_system_prompt_v1,
+    content_judge_instructions_v1,
+    content_judge_system_prompt_v1,
+    fit_judge_instructions_v1,
+    fit_judge_system_prompt_v1,
+    judge_interview_context_v1,
+    panel_judge_system_prompt_v1,
+    risk_judge_instructions_v1,
+    risk_judge_system_prompt_v1,
+    shared_judge_context_v1,
+    structure_judge_instructions_v1,
+    structure_judge_system_prompt_v1,
+)
+from prompts.guardrail_prompts import INTERVIEW_USER_MESSAGE_GUARDRAIL_PROMPT_V1
+from prompts.interview_chat_prompts import interview_system_prompt_v1
+from prompts.job_parsing_prompts import JOB_LISTING_RESEARCH_PROMPT_V1
+from prompts.research_prompts import (
+    COMPANY_STRATEGY_SYSTEM_PROMPT_V1,
+    DOMAIN_KNOWLEDGE_SYSTEM_PROMPT_V1,
+    ROLE_SUCCESS_SYSTEM_PROMPT_V1,
+    TEAM_CULTURE_SYSTEM_PROMPT_V1,
+    company_strategy_query,
+    domain_knowledge_query,
+    role_success_query,
+    team_culture_query,
+)
+
+if TYPE_CHECKING:
+    from agents import Agent
+    from openai import AsyncOpenAI, OpenAI
+
+# The stage functions from testing.ipynb, with the OpenAI client passed in instead of read from a notebook global.
+
+JOB_PARSING_MODEL = "gpt-4.1-nano"
+RESEARCH_MODEL = "gpt-4o-mini"
+DISTILLATION_MODEL = "gpt-4o-mini"
+INTERVIEW_MODEL = "gpt-4o-mini"
+INTERVIEW_SUMMARY_MODEL = "gpt-4.1-nano"
+JUDGE_MODEL = "gpt-4o-mini"
+JUDGE_FALLBACK_MODEL = "gpt-4.1-nano"
+AGGREGATOR_MODEL = "gpt-4.1-mini"
+GUARDRAIL_MODEL = "gpt-4.1-nano"
+
+# Research pillar name -> (agent instructions, query builder). Order matches deep_research_results.md.
+RESEARCH_PILLARS = {
+    "company_strategy": (COMPANY_STRATEGY_SYSTEM_PROMPT_V1, lambda company_name, job_title: company_strategy_query(company_name)),
+    "role_success": (ROLE_SUCCESS_SYSTEM_PROMPT_V1, role_success_query),
+    "team_culture": (TEAM_CULTURE_SYSTEM_PROMPT_V1, team_culture_query),
+    "domain_knowledge": (DOMAIN_KNOWLEDGE_SYSTEM_PROMPT_V1, domain_knowledge_query),
+}
+
+# Research pillar name -> the H1 title its agent's report starts with
+RESEARCH_PILLAR_TITLES = {
+    "company_strategy": "Company Context & Strategy",
+    "role_success": "Role Definition & Success Profile",
+    "team_culture": "Team Dynamics, Process, and Culture",
+    "domain_knowledge": "Function-Specific and Domain Knowledge",
+}
+
+# Evaluation name -> judge system prompt, in the order the aggregator reads them.
+JUDGE_PROMPTS = {
+    "Content Evaluation": content_judge_system_prompt_v1,
+    "Structure Evaluation": structure_judge_system_prompt_v1,
+    "Fit Evaluation": fit_judge_system_prompt_v1,
+    "Communication Evaluation": communication_judge_system_prompt_v1,
+    "Risk Evaluation": risk_judge_system_prompt_v1,
+}
+
+# Evaluation name -> judge-specific instructions, used after the shared context in the shared-prefix layout
+JUDGE_INSTRUCTIONS = {
+    "Content Evaluation": content_judge_instructions_v1,
+    "Structure Evaluation": structure_judge_instructions_v1,
+    "Fit Evaluation": fit_judge_instructions_v1,
+    "Communication Evaluation": communication_judge_instructions_v1,
+    "Risk Evaluation": risk_judge_instructions_v1,
+}
+
+# Judge prompt layouts. JUDGE_FIRST is the original: judge-specific text, then the shared research and guide.
+# SHARED_PREFIX puts the shared context and transcript first so all five calls start with the same bytes.
+JUDGE_FIRST_LAYOUT = "judge_first"
+SHARED_PREFIX_LAYOUT = "shared_prefix"
+
+# Evaluation modes. FAN_OUT runs one call per judge; SINGLE_CALL asks for all five judges in one structured-output call.
+FAN_OUT_MODE = "fan_out"
+SINGLE_CALL_MODE = "single_call"
+
+# Evaluation name -> PanelEvaluation field holding that judge's output in single-call mode
+PANEL_FIELDS = {
+    "Content Evaluation": "content_evaluation",
+    "Structure Evaluation": "structure_evaluation",
+    "Fit Evaluation": "fit_evaluation",
+    "Communication Evaluation": "communication_evaluation",
+    "Risk Evaluation": "risk_evaluation",
+}
+
+
+# ===============================
+#       Step 1 - Job Parsing
+# ===============================
+
+def job_parsing_messages(scraped_job_contents: str) -> list[dict]:
+    return [
+        {"role": "system", "content": JOB_LISTING_RESEARCH_PROMPT_V1},
+        {"role": "user", "content": f"Scraped website contents: \n\n{scraped_job_contents}"}
+    ]
+
+
+def extract_job_listing_attributes(client: OpenAI, scraped_job_contents: str) -> JobListingResearchResponse:
+    with TELEMETRY.span("job_parsing", JOB_PARSING_MODEL) as span:
+        response = client.beta.chat.completions.parse(
+            model=JOB_PARSING_MODEL,
+            messages=job_parsing_messages(scraped_job_contents),
+            temperature=0.3,
+            top_p=0.9,
+            response_format=JobListingResearchResponse,
+        )
+        span.record_response(response)
+
+    # Parse the JSON response content into a JobListingResearchResponse instance
+    content = response.choices[0].message.content
+    response_data = json.loads(content)
+    return JobListingResearchResponse(**response_data)
+
+
+async def extract_job_listing_attributes_async(async_client: AsyncOpenAI, scraped_job_contents: str) -> JobListingResearchResponse:
+    with TELEMETRY.span("job_parsing", JOB_PARSING_MODEL) as span:
+        response = await async_client.beta.chat.completions.parse(
+            model=JOB_PARSING_MODEL,
+            messages=job_parsing_messages(scraped_job_contents),
+            temperature=0.3,
+            top_p=0.9,
+            response_format=JobListingResearchResponse,
+        )
+        span.record_response(response)
+
+    content = response.choices[0].message.content
+    return JobListingResearchResponse(**json.loads(content))
+
+
+# ===============================
+#      Step 2 - Deep Research
+# ===============================
+
+def research_agent(pillar: str) -> Agent:
+    # The Agents SDK takes over a second to import, so it loads with the first research call rather than with this module
+    from agents import Agent, WebSearchTool
+    from agents.model_settings import ModelSettings
+
+    instructions, _ = RESEARCH_PILLARS[pillar]
+    return Agent(
+        name=f"{pillar.replace('_', ' ').capitalize()} agent",
+        instructions=instructions,
+        tools=[WebSearchTool(search_context_size="medium")],
+        model=RESEARCH_MODEL,
+        model_settings=ModelSettings(tool_choice="required"),
+    )
+
+
+def research_query(pillar: str, listing: JobListingResearchResponse) -> str:
+    _, query_builder = RESEARCH_PILLARS[pillar]
+    return query_builder(listing.company_name, listing.job_title)
+
+
+async def run_research_pillar(pillar: str, listing: JobListingResearchResponse) -> str:
+    from agents import Runner
+
+    with TELEMETRY.span("research", RESEARCH_MODEL, pillar) as span:
+        result = await Runner.run(research_agent(pillar), research_query(pillar, listing))
+        # The agent makes several requests (tool calls, then the report); the run usage totals all of them
+        span.record_usage(getattr(getattr(result, "context_wrapper", None), "usage", None))
+    return result.final_output
+
+
+async def perform_research_simultaneously(listing: JobListingResearchResponse) -> list[str]:
+    research_tasks = [run_research_pillar(pillar, listing) for pillar in RESEARCH_PILLARS]
+    return await asyncio.gather(*research_tasks, return_exceptions=False)
+
+
+def combine_research(research_results: list[str]) -> str:
+    return "\n\n".join(research_results)
+
+
+# ===============================
+#  Step 3 - Distill Interview Guide
+# ===============================
+
+def interview_guide_input(listing: JobListingResearchResponse, deep_research_results: str, interview_questions: str) -> str:
+    return "\n".join([
+        f"job_title: {listing.job_title}",
+        f"job_description: {listing.job_description}",
+        f"company_name: {listing.company_name}",
+        f"\ndeep_research_results: \n{deep_research_results}",
+        f"\ninterview_questions: \n{interview_questions}",
+    ])
+
+
+def distillation_messages(listing: JobListingResearchResponse, deep_research_results: str, interview_questions: str) -> list[dict]:
+    return [
+        {"role": "system", "content": DISTILLATION_SYSTEM_PROMPT_V1},
+        {"role": "user", "content": interview_guide_input(listing, deep_research_results, interview_questions)},
+    ]
+
+
+def create_interview_guide(client: OpenAI, listing: JobListingResearchResponse, deep_research_results: str, interview_questions: str) -> str:
+    with TELEMETRY.span("distillation", DISTILLATION_MODEL) as span:
+        response = client.chat.completions.create(
+            model=DISTILLATION_MODEL,
+            messages=distillation_messages(listing, deep_research_results, interview_questions),
+            temperature=0.6,
+        )
+        span.record_response(response)
+
+    return response.choices[0].message.content
+
+
+async def create_interview_guide_async(async_client: AsyncOpenAI, listing: JobListingResearchResponse, deep_research_results: str, interview_questions: str) -> str:
+    with TELEMETRY.span("distillation", DISTILLATION_MODEL) as span:
+        response = await async_client.chat.completions.create(
+            model=DISTILLATION_MODEL,
+            messages=distillation_messages(listing, deep_research_results, interview_questions),
+            temperature=0.6,
+        )
+        span.record_response(response)
+
+    return response.choices[0].message.content
+
+
+# ===============================
+#   Step 4 - Conduct Interview
+# ===============================
+
+def interview_messages(listing: JobListingResearchResponse, interview_guide: str, message: str, history: list) -> list[dict]:
+    # Format chat history for OpenAI
+    messages = [{"role": "system", "content": interview_system_prompt_v1(listing, interview_guide)}]
+    for user_msg, bot_msg in history:
+        messages.append({"role": "user", "content": user_msg})
+        if bot_msg:
+            messages.append({"role": "assistant", "content": bot_msg})
+    messages.append({"role": "user", "content": message})
+    return messages
+
+
+def interview_chat(client: OpenAI, listing: JobListingResearchResponse, interview_guide: str, message: str, history: list) -> str:
+    with TELEMETRY.span("interview_turn", INTERVIEW_MODEL) as span:
+        response = client.chat.completions.create(
+            model=INTERVIEW_MODEL,
+            messages=interview_messages(listing, interview_guide, message, history),
+        )
+        span.record_response(response)
+
+    # Return the assistant’s reply
+    return response.choices[0].message.content
+
+
+def interview_chat_stream(client: OpenAI, listing: JobListingResearchResponse, interview_guide: str, message: str, history: list) -> Iterator[str]:
+    with TELEMETRY.span("interview_turn", INTERVIEW_MODEL) as span:
+        stream = client.chat.completions.create(
+            model=INTERVIEW_MODEL,
+            messages=interview_messages(listing, interview_guide, message, history),
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+        # gr.ChatInterface re-renders whatever is yielded, so yield the reply so far rather than each delta
+        reply = ""
+        for chunk in stream:
+            span.record_chunk(chunk)
+            if chunk.choices and chunk.choices[0].delta.content:
+                reply += chunk.choices[0].delta.content
+                yield reply
+
+
+async def ainterview_chat_stream(async_client: AsyncOpenAI, listing: JobListingResearchResponse, interview_guide: str, message: str, history: list) -> AsyncIterator[str]:
+    with TELEMETRY.span("interview_turn", INTERVIEW_MODEL) as span:
+        stream = await async_client.chat.completions.create(
+            model=INTERVIEW_MODEL,
+            messages=interview_messages(listing, interview_guide, message, history),
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+        # Yields token deltas as they arrive, for front ends that append to the message themselves
+        async for chunk in stream:
+            span.record_chunk(chunk)
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+# ===============================
+#   Interview Message Guardrail
+# ===============================
+
+async def check_interview_message_async(async_client: AsyncOpenAI, message: str) -> GuardrailResponse:
+    with TELEMETRY.span("guardrail", GUARDRAIL_MODEL) as span:
+        response = await async_client.beta.chat.completions.parse(
+            model=GUARDRAIL_MODEL,
+            messages=[
+                {"role": "system", "content": INTERVIEW_USER_MESSAGE_GUARDRAIL_PROMPT_V1},
+                {"role": "user", "content": message},
+            ],
+            response_format=GuardrailResponse,
+            temperature=0,
+        )
+        span.record_response(response)
+
+    return GuardrailResponse(**json.loads(response.choices[0].message.content))
+
+
+# ===============================
+#  Step 5 - Evaluate Performance
+# ===============================
+
+def format_interview_transcript(messages: list[dict]) -> str:
+    entity_rename_map = {"user": "Candidate", "assistant": "Interviewer"}
+    return "".join(f"{entity_rename_map.get(message['role'], 'Unknown')}:\n{message['content']}\n\n" for message in messages)
+
+
+def judge_messages(judge_name: str, listing: JobListingResearchResponse, deep_research_results: str, interview_guide: str, interview_transcript: str, layout: str = JUDGE_FIRST_LAYOUT) -> list[dict]:
+    if layout == SHARED_PREFIX_LAYOUT:
+        return [
+            {"role": "system", "content": shared_judge_context_v1(listing, deep_research_results, interview_guide)},
+            {"role": "user", "content": interview_transcript},
+            {"role": "system", "content": JUDGE_INSTRUCTIONS[judge_name](listing, SHARED_PREFIX_TRANSCRIPT_INPUT_V1)},
+        ]
+    if layout == JUDGE_FIRST_LAYOUT:
+        return [
+            {"role": "system", "content": JUDGE_PROMPTS[judge_name](listing, deep_research_results, interview_guide)},
+            {"role": "user", "content": interview_transcript},
+        ]
+    raise ValueError(f"Unknown judge prompt layout: {layout}")
+
+
+def judge_prompt_parts(judge_name: str, layout: str = JUDGE_FIRST_LAYOUT) -> list:
+    # Every prompt function and text a judge's messages are rendered from, for cache keys; fingerprint() hashes only
+    # the source of the function it is given, not the helpers that function calls
+    if layout == SHARED_PREFIX_LAYOUT:
+        return [shared_judge_context_v1, judge_interview_context_v1, JUDGE_INSTRUCTIONS[judge_name], SHARED_PREFIX_TRANSCRIPT_INPUT_V1]
+    if layout == JUDGE_FIRST_LAYOUT:
+        return [JUDGE_PROMPTS[judge_name], JUDGE_INSTRUCTIONS[judge_name], judge_interview_context_v1, JUDGE_TRANSCRIPT_INPUT_V1]
+    raise ValueError(f"Unknown judge prompt layout: {layout}")
+
+
+PANEL_PROMPT_PARTS = [panel_judge_system_prompt_v1, judge_interview_context_v1, *JUDGE_INSTRUCTIONS.values(), JUDGE_TRANSCRIPT_INPUT_V1]
+
+
+async def evaluate_interview(async_client: AsyncOpenAI, judge_name: str, listing: JobListingResearchResponse, deep_research_results: str, interview_guide: str, interview_transcript: str, layout: str = JUDGE_FIRST_LAYOUT) -> str:
+    with TELEMETRY.span("judge", JUDGE_MODEL, judge_name) as span:
+        response = await async_client.chat.completions.create(
+            model=JUDGE_MODEL,
+            messages=judge_messages(judge_name, listing, deep_research_results, interview_guide, interview_transcript, layout),
+        )
+        span.record_response(response)
+
+    return response.choices[0].message.content
+
+
+async def evaluate_interview_structured(async_client: AsyncOpenAI, judge_name: str, listing: JobListingResearchResponse, deep_research_results: str, interview_guide: str, interview_transcript: str, layout: str = JUDGE_FIRST_LAYOUT, model: str = JUDGE_MODEL) -> JudgeEvaluation:
+    with TELEMETRY.span("judge", model, judge_name) as span:
+        response = await async_client.beta.chat.completions.parse(
+            model=model,
+            messages=judge_messages(judge_name, listing, deep_research_results, interview_guide, interview_transcript, layout),
+            response_format=JudgeEvaluation,
+        )
+        span.record_response(response)
+
+    return JudgeEvaluation(**json.loads(response.choices[0].message.content))
+
+
+async def perform_all_structured_evaluations(async_client: AsyncOpenAI, listing: JobListingResearchResponse, deep_research_results: str, interview_guide: str, interview_transcript: str, layout: str = JUDGE_FIRST_LAYOUT) -> dict[str, JudgeEvaluation]:
+    tasks = {
+        name: evaluate_interview_structured(async_client, name, listing, deep_research_results, interview_guide, interview_transcript, layout)
+        for name in JUDGE_PROMPTS
+    }
+
+    results = await asyncio.gather(*tasks.values())
+    return dict(zip(tasks.keys(), results))
+
+
+def panel_messages(listing: JobListingResearchResponse, deep_research_results: str, interview_guide: str, interview_transcript: str) -> list[dict]:
+    return [
+        {"role": "system", "content": panel_judge_system_prompt_v1(listing, deep_research_results, interview_guide)},
+        {"role": "user", "content": interview_transcript},
+    ]
+
+
+async def evaluate_interview_single_call(async_client: AsyncOpenAI, listing: JobListingResearchResponse, deep_research_results: str, interview_guide: str, interview_transcript: str) -> dict[str, str]:
+    with TELEMETRY.span("judge", JUDGE_MODEL, "Panel Evaluation") as span:
+        response = await async_client.beta.chat.completions.parse(
+            model=JUDGE_MODEL,
+            messages=panel_messages(listing, deep_research_results, interview_guide, interview_transcript),
+            response_format=PanelEvaluation,
+        )
+        span.record_response(response)
+
+    panel = PanelEvaluation(**json.loads(response.choices[0].message.content))
+    return {name: getattr(panel, field) for name, field in PANEL_FIELDS.items()}
+
+
+async def perform_all_evaluations(async_client: AsyncOpenAI, listing: JobListingResearchResponse, deep_research_results: str, interview_guide: str, interview_transcript: str, layout: str = JUDGE_FIRST_LAYOUT, mode: str = FAN_OUT_MODE) -> dict[str, str]:
+    if mode == SINGLE_CALL_MODE:
+        return await evaluate_interview_single_call(async_client, listing, deep_research_results, interview_guide, interview_transcript)
+    if mode != FAN_OUT_MODE:
+        raise ValueError(f"Unknown evaluation mode: {mode}")
+
+    tasks = {
+        name: evaluate_interview(async_client, name, listing, deep_research_results, interview_guide, interview_transcript, layout)
+        for name in JUDGE_PROMPTS
+    }
+
+    results = await asyncio.gather(*tasks.values())
+    return dict(zip(tasks.keys(), results))
+
+
+def shared_prefix_report(listing: JobListingResearchResponse, deep_research_results: str, interview_guide: str, interview_transcript: str, layout: str = JUDGE_FIRST_LAYOUT) -> dict[str, dict[str, int]]:
+    # For each judge call: total prompt bytes, and how many leading bytes it shares with at least one other judge call
+    prompts = {
+        name: "".join(
+            f"{message['role']}\n{message['content']}\n"
+            for message in judge_messages(name, listing, deep_research_results, interview_guide, interview_transcript, layout)
+        ).encode()
+        for name in JUDGE_PROMPTS
+    }
+
+    def common_prefix_length(a: bytes, b: bytes) -> int:
+        length = 0
+        for x, y in zip(a, b):
+            if x != y:
+                break
+            length += 1
+        return length
+
+    return {
+        name: {
+            "prompt_bytes": len(prompt),
+            "shared_prefix_bytes": max(common_prefix_length(prompt, other) for other_name, other in prompts.items() if other_name != name),
+        }
+        for name, prompt in prompts.items()
+    }
+
+
+def combine_evaluations(evaluations: dict[str, str]) -> str:
+    combined_evaluations = ""
+    for key in evaluations.keys():
+        combined_evaluations += f"{key}:\n{evaluations[key]}\n\n"
+    return combined_evaluations
+
+
+def aggregator_messages(listing: JobListingResearchResponse, combined_evaluations: str) -> list[dict]:
+    return [
+        {"role": "system", "content": aggregate_evaluations_prompt_v1(listing)},
+        {"role": "user", "content": combined_evaluations},
+    ]
+
+
+def aggregate_evaluations(client: OpenAI, listing: JobListingResearchResponse, combined_evaluations: str) -> str:
+    with TELEMETRY.span("aggregator", AGGREGATOR_MODEL) as span:
+        response = client.chat.completions.create(
+            model=AGGREGATOR_MODEL,
+            messages=aggregator_messages(listing, combined_evaluations),
+        )
+        span.record_response(response)
+
+    return response.choices[0].message.content
+
+
+async def aggregate_evaluations_async(async_client: AsyncOpenAI, listing: JobListingResearchResponse, combined_evaluations: str) -> str:
+    with TELEMETRY.span("aggregator", AGGREGATOR_MODEL) as span:
+        response = await async_client.chat.completions.create(
+            model=AGGREGATOR_MODEL,
+            messages=aggregator_messages(listing, combined_evaluations),
+        )
+        span.record_response(response)
+
+    return response.choices[0].message.content
+
+
+async def aggregate_evaluations_stream_async(async_client: AsyncOpenAI, listing: JobListingResearchResponse, combined_evaluations: str) -> AsyncIterator[str]:
+    with TELEMETRY.span("aggregator", AGGREGATOR_MODEL) as span:
+        stream = await async_client.chat.completions.create(
+            model=AGGREGATOR_MODEL,
+            messages=aggregator_messages(listing, combined_evaluations),
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+        async for chunk in stream:
+            span.record_chunk(chunk)
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
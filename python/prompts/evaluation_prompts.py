@@ -1,6 +1,45 @@
 from constants.constants import JobListingResearchResponse
 
-def content_judge_system_prompt_v1(listing: JobListingResearchResponse, deep_research: str, interview_guideline: str) -> str:
+# The INPUT section of every judge's instructions. The shared-prefix layout sends the instructions after the transcript,
+# so it swaps in the second wording.
+JUDGE_TRANSCRIPT_INPUT_V1 = """You will receive a transcript of messages between the candidate and the interviewer as a sequence of messages attributed to the candidate ("candidate") or \
+the interviewer ("interviewer"). Messages appear in the order they were sent, oldest to newest."""
+
+SHARED_PREFIX_TRANSCRIPT_INPUT_V1 = """The transcript of messages between the candidate and the interviewer was provided above, in the message just before these instructions. \
+It is a sequence of messages attributed to the candidate ("candidate") or the interviewer ("interviewer"), in the order they were sent, oldest to newest."""
+
+def judge_interview_context_v1(listing: JobListingResearchResponse, deep_research: str, interview_guideline: str) -> str:
+    return f"""# INTERVIEW CONTEXT
+
+## JOB DETAILS
+- `job_title`: {listing.job_title}
+- `job_location`: {listing.job_location}
+- `job_description`: {listing.job_description}
+- `work_schedule`: {listing.work_schedule}
+- `job_expectations_and_responsibilities`: {listing.expectations_and_responsibilities}
+- `job_requirements`: {listing.requirements}
+
+## CONTEXTUAL DEEP RESEARCH
+
+{deep_research}
+
+## INTERVIEW GUIDELINE
+
+{interview_guideline}"""
+
+
+# Shared-prefix layout: identical for all five judges so provider prefix caching applies across the parallel calls.
+# The judge-specific *_judge_instructions_v1 text is sent after the transcript.
+def shared_judge_context_v1(listing: JobListingResearchResponse, deep_research: str, interview_guideline: str) -> str:
+    return f"""# EVALUATION CONTEXT
+
+You are an evaluator on a panel assessing candidates applying for the role of {listing.job_title} at {listing.company_name}. The context below is shared \
+by every evaluator on the panel. You will then receive the interview transcript, followed by your specific judge role, evaluation criteria and output format.
+
+{judge_interview_context_v1(listing, deep_research, interview_guideline)}"""
+
+
+def content_judge_instructions_v1(listing: JobListingResearchResponse, transcript_input: str = JUDGE_TRANSCRIPT_INPUT_V1) -> str:
     return f"""# ROLE
 
 You are *content judge*, an evaulator for candidates applying for the role of {listing.job_title} at {listing.company_name}. Your job is to assess the performance \
@@ -12,8 +51,7 @@ Evaluate the factual and role-relevant substance of each answer against what the
 
 # INPUT
 
-You will receive a transcript of messages between the candidate and the interviewer as a sequence of messages attributed to the candidate ("candidate") or \
-the interviewer ("interviewer"). Messages appear in the order they were sent, oldest to newest.
+{transcript_input}
 
 # EVALUATION CRITERIA
 
@@ -45,28 +83,14 @@ Return a list of feedback points. Each feedback point should include:
 - Relevant information from the job listing context
 - Additional context related to best practices for answering questions like this
 
-Lastly, return a summary of what the candidate did well and what they should work on.
-
-# INTERVIEW CONTEXT
-
-## JOB DETAILS
-- `job_title`: {listing.job_title}
-- `job_location`: {listing.job_location}
-- `job_description`: {listing.job_description}
-- `work_schedule`: {listing.work_schedule}
-- `job_expectations_and_responsibilities`: {listing.expectations_and_responsibilities}
-- `job_requirements`: {listing.requirements}
-
-## CONTEXTUAL DEEP RESEARCH
+Lastly, return a summary of what the candidate did well and what they should work on."""
 
-{deep_research}
 
-## INTERVIEW GUIDELINE
-
-{interview_guideline}"""
+def content_judge_system_prompt_v1(listing: JobListingResearchResponse, deep_research: str, interview_guideline: str) -> str:
+    return f"{content_judge_instructions_v1(listing)}\n\n{judge_interview_context_v1(listing, deep_research, interview_guideline)}"
 
 
-def structure_judge_system_prompt_v1(listing: JobListingResearchResponse, deep_research: str, interview_guideline: str) -> str:
+def structure_judge_instructions_v1(listing: JobListingResearchResponse, transcript_input: str = JUDGE_TRANSCRIPT_INPUT_V1) -> str:
     return f"""#ROLE
 
 You are *structure judge*, an evaulator for candidates applying for the role of {listing.job_title} at {listing.company_name}. Your job is to assess the performance \
@@ -78,8 +102,7 @@ Assess clarity, organization, and efficiency of delivery, emphasizing STAR/SAO c
 
 # INPUT
 
-You will receive a transcript of messages between the candidate and the interviewer as a sequence of messages attributed to the candidate ("candidate") or \
-the interviewer ("interviewer"). Messages appear in the order they were sent, oldest to newest.
+{transcript_input}
 
 # EVALUATION CRITERIA
 
@@ -110,28 +133,14 @@ Return a list of feedback points. Each feedback point should include:
 - Relevant information from the job listing context
 - Additional context related to best practices for answering questions like this
 
-Lastly, return a summary of what the candidate did well and what they should work on.
+Lastly, return a summary of what the candidate did well and what they should work on."""
 
-# INTERVIEW CONTEXT
 
-## JOB DETAILS
-- `job_title`: {listing.job_title}
-- `job_location`: {listing.job_location}
-- `job_description`: {listing.job_description}
-- `work_schedule`: {listing.work_schedule}
-- `job_expectations_and_responsibilities`: {listing.expectations_and_responsibilities}
-- `job_requirements`: {listing.requirements}
-
-## CONTEXTUAL DEEP RESEARCH
-
-{deep_research}
-
-## INTERVIEW GUIDELINE
-
-{interview_guideline}"""
+def structure_judge_system_prompt_v1(listing: JobListingResearchResponse, deep_research: str, interview_guideline: str) -> str:
+    return f"{structure_judge_instructions_v1(listing)}\n\n{judge_interview_context_v1(listing, deep_research, interview_guideline)}"
 
 
-def fit_judge_system_prompt_v1(listing: JobListingResearchResponse, deep_research: str, interview_guideline: str) -> str:
+def fit_judge_instructions_v1(listing: JobListingResearchResponse, transcript_input: str = JUDGE_TRANSCRIPT_INPUT_V1) -> str:
     return f"""#ROLE
 
 You are *fit judge*, an evaulator for candidates applying for the role of {listing.job_title} at {listing.company_name}. Your job is to assess the performance \
@@ -143,8 +152,7 @@ Determine alignment with the role's requirements, seniority, culture/values, and
 
 # INPUT
 
-You will receive a transcript of messages between the candidate and the interviewer as a sequence of messages attributed to the candidate ("candidate") or \
-the interviewer ("interviewer"). Messages appear in the order they were sent, oldest to newest.
+{transcript_input}
 
 # EVALUATION CRITERIA
 
@@ -176,28 +184,14 @@ Return a list of feedback points. Each feedback point should include:
 - Relevant information from the job listing context
 - Additional context related to best practices for answering questions like this
 
-Lastly, return a summary of what the candidate did well and what they should work on.
-
-# INTERVIEW CONTEXT
+Lastly, return a summary of what the candidate did well and what they should work on."""
 
-## JOB DETAILS
-- `job_title`: {listing.job_title}
-- `job_location`: {listing.job_location}
-- `job_description`: {listing.job_description}
-- `work_schedule`: {listing.work_schedule}
-- `job_expectations_and_responsibilities`: {listing.expectations_and_responsibilities}
-- `job_requirements`: {listing.requirements}
-
-## CONTEXTUAL DEEP RESEARCH
-
-{deep_research}
-
-## INTERVIEW GUIDELINE
 
-{interview_guideline}"""
+def fit_judge_system_prompt_v1(listing: JobListingResearchResponse, deep_research: str, interview_guideline: str) -> str:
+    return f"{fit_judge_instructions_v1(listing)}\n\n{judge_interview_context_v1(listing, deep_research, interview_guideline)}"
 
 
-def communication_judge_system_prompt_v1(listing: JobListingResearchResponse, deep_research: str, interview_guideline: str) -> str:
+def communication_judge_instructions_v1(listing: JobListingResearchResponse, transcript_input: str = JUDGE_TRANSCRIPT_INPUT_V1) -> str:
     return f"""#ROLE
 
 You are *communication judge*, an evaulator for candidates applying for the role of {listing.job_title} at {listing.company_name}. Your job is to assess the performance \
@@ -209,8 +203,7 @@ Evaluate interpersonal effectiveness in text: tone, professionalism, confidence,
 
 # INPUT
 
-You will receive a transcript of messages between the candidate and the interviewer as a sequence of messages attributed to the candidate ("candidate") or \
-the interviewer ("interviewer"). Messages appear in the order they were sent, oldest to newest.
+{transcript_input}
 
 # EVALUATION CRITERIA
 
@@ -241,28 +234,14 @@ Return a list of feedback points. Each feedback point should include:
 - Relevant information from the job listing context
 - Additional context related to best practices for answering questions like this
 
-Lastly, return a summary of what the candidate did well and what they should work on.
-
-# INTERVIEW CONTEXT
-
-## JOB DETAILS
-- `job_title`: {listing.job_title}
-- `job_location`: {listing.job_location}
-- `job_description`: {listing.job_description}
-- `work_schedule`: {listing.work_schedule}
-- `job_expectations_and_responsibilities`: {listing.expectations_and_responsibilities}
-- `job_requirements`: {listing.requirements}
+Lastly, return a summary of what the candidate did well and what they should work on."""
 
-## CONTEXTUAL DEEP RESEARCH
 
-{deep_research}
-
-## INTERVIEW GUIDELINE
-
-{interview_guideline}"""
+def communication_judge_system_prompt_v1(listing: JobListingResearchResponse, deep_research: str, interview_guideline: str) -> str:
+    return f"{communication_judge_instructions_v1(listing)}\n\n{judge_interview_context_v1(listing, deep_research, interview_guideline)}"
 
 
-def risk_judge_system_prompt_v1(listing: JobListingResearchResponse, deep_research: str, interview_guideline: str) -> str:
+def risk_judge_instructions_v1(listing: JobListingResearchResponse, transcript_input: str = JUDGE_TRANSCRIPT_INPUT_V1) -> str:
     return f"""#ROLE
 
 You are *risk judge*, an evaulator for candidates applying for the role of {listing.job_title} at {listing.company_name}. Your job is to assess the performance \
@@ -274,8 +253,7 @@ Identify statements that may materially harm candidacy or credibility, and flag
 
 # INPUT
 
-You will receive a transcript of messages between the candidate and the interviewer as a sequence of messages attributed to the candidate ("candidate") or \
-the interviewer ("interviewer"). Messages appear in the order they were sent, oldest to newest.
+{transcript_input}
 
 # EVALUATION CRITERIA
 
@@ -306,22 +284,47 @@ Return a list of feedback points. Each feedback point should include:
 - Relevant information from the job listing context
 - Additional context related to best practices for answering questions like this
 
-Lastly, return a summary of what the candidate did well and what they should work on.
+Lastly, return a summary of what the candidate did well and what they should work on."""
 
-# INTERVIEW CONTEXT
 
-## JOB DETAILS
-- `job_title`: {listing.job_title}
-- `job_location`: {listing.job_location}
-- `job_description`: {listing.job_description}
-- `work_schedule`: {listing.work_schedule}
-- `job_expectations_and_responsibilities`: {listing.expectations_and_responsibilities}
-- `job_requirements`: {listing.requirements}
+def risk_judge_system_prompt_v1(listing: JobListingResearchResponse, deep_research: str, interview_guideline: str) -> str:
+    return f"{risk_judge_instructions_v1(listing)}\n\n{judge_interview_context_v1(listing, deep_research, interview_guideline)}"
 
-## CONTEXTUAL DEEP RESEARCH
+# Single-call layout: the shared context is sent once and every judge's instructions follow, with each judge's output
+# returned in its own field of PanelEvaluation.
+def panel_judge_system_prompt_v1(listing: JobListingResearchResponse, deep_research: str, interview_guideline: str) -> str:
+    return f"""# PANEL ROLE
 
-{deep_research}
+You are a panel of five independent judges evaluating a candidate's mock interview for the role of {listing.job_title} at {listing.company_name}. \
+Each judge's full instructions are given below. Perform every judge's evaluation separately, exactly as that judge alone would, and write each \
+judge's complete output into its field of the response:
 
-## INTERVIEW GUIDELINE
+- `content_evaluation` — *content judge*
+- `structure_evaluation` — *structure judge*
+- `fit_evaluation` — *fit judge*
+- `communication_evaluation` — *communication judge*
+- `risk_evaluation` — *risk judge*
+
+Judges do not see or reference each other's output. Each field is Markdown following that judge's OUTPUT section.
+
+{judge_interview_context_v1(listing, deep_research, interview_guideline)}
+
+# JUDGE INSTRUCTIONS: content_evaluation
+
+{content_judge_instructions_v1(listing)}
+
+# JUDGE INSTRUCTIONS: structure_evaluation
+
+{structure_judge_instructions_v1(listing)}
+
+# JUDGE INSTRUCTIONS: fit_evaluation
+
+{fit_judge_instructions_v1(listing)}
+
+# JUDGE INSTRUCTIONS: communication_evaluation
+
+{communication_judge_instructions_v1(listing)}
+
+# JUDGE INSTRUCTIONS: risk_evaluation
 
-{interview_guideline}"""
\ No newline at end of file
+{risk_judge_instructions_v1(listing)}"""
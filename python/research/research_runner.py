@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from constants.constants import JobListingResearchResponse
+from pipeline import stages
+from research.research_store import ResearchStore
+
+COMPLETE = "complete"
+MISSING = "missing"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PillarResult:
+    pillar: str
+    status: str
+    output: str | None = None
+    attempts: int = 0
+    elapsed_seconds: float = 0.0
+    reused: bool = False
+    # repr of each failed attempt's exception, in the order they failed
+    errors: list[str] = field(default_factory=list)
+
+
+class ResearchRunner:
+    """
+    Runs the research agents with a per-pillar deadline. A pillar still running after hedge_after seconds (or one whose
+    attempt fails) gets a duplicate attempt, and the first to finish wins. Pillars that miss the deadline come back
+    as MISSING instead of blocking the rest of the prep flow. run_pillar is the default way to run one pillar; run()
+    also takes one per call, e.g. PrepPipeline.research_pillar so each attempt goes through the artifact cache.
+    """
+
+    def __init__(self, run_pillar: Callable[[str, JobListingResearchResponse], Awaitable[str]] = stages.run_research_pillar, deadline: float = 120.0, hedge_after: float = 60.0, max_attempts: int = 2):
+        self.run_pillar = run_pillar
+        self.deadline = deadline
+        self.hedge_after = hedge_after
+        self.max_attempts = max_attempts
+
+    async def _run_with_deadline(self, pillar: str, listing: JobListingResearchResponse, run_pillar: Callable[[str, JobListingResearchResponse], Awaitable[str]]) -> PillarResult:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = PillarResult(pillar=pillar, status=MISSING)
+        pending: set[asyncio.Task] = set()
+
+        def launch() -> None:
+            result.attempts += 1
+            pending.add(asyncio.create_task(run_pillar(pillar, listing)))
+
+        launch()
+        try:
+            while pending:
+                elapsed = loop.time() - start
+                if elapsed >= self.deadline:
+                    break
+                # Wake up at the hedge point if there is still an attempt to spend, otherwise at the deadline
+                can_hedge = result.attempts < self.max_attempts
+                wake_at = self.hedge_after * result.attempts if can_hedge else self.deadline
+                timeout = max(0.0, min(wake_at, self.deadline) - elapsed)
+
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        result.status, result.output = COMPLETE, task.result()
+                        return result
+                    result.errors.append(repr(task.exception()))
+                    logger.warning("Research attempt %d for %s failed: %r", len(result.errors), pillar, task.exception())
+
+                # Either the hedge point passed with no answer or an attempt failed: spend another attempt
+                if result.attempts < self.max_attempts and (done or loop.time() - start >= self.hedge_after * result.attempts):
+                    launch()
+            return result
+        finally:
+            for task in pending:
+                task.cancel()
+            result.elapsed_seconds = loop.time() - start
+
+    async def run(self, listing: JobListingResearchResponse, store: ResearchStore | None = None, run_pillar: Callable[[str, JobListingResearchResponse], Awaitable[str]] | None = None) -> dict[str, PillarResult]:
+        run_pillar = run_pillar or self.run_pillar
+        results = {}
+        to_run = []
+        for pillar in stages.RESEARCH_PILLARS:
+            output = store.get(pillar, listing) if store is not None else None
+            if output is not None:
+                results[pillar] = PillarResult(pillar=pillar, status=COMPLETE, output=output, reused=True)
+            else:
+                to_run.append(pillar)
+
+        for result in await asyncio.gather(*(self._run_with_deadline(pillar, listing, run_pillar) for pillar in to_run)):
+            results[result.pillar] = result
+            # Only complete pillars are stored; a missing one is simply retried on the next listing
+            if store is not None and result.status == COMPLETE:
+                store.put(result.pillar, listing, result.output)
+
+        return {pillar: results[pillar] for pillar in stages.RESEARCH_PILLARS}
+
+
+def combine_partial_research(results: dict[str, PillarResult]) -> str:
+    # Missing pillars keep their section with an explicit marker, so distillation writes "Unknown" instead of guessing
+    sections = []
+    for pillar, result in results.items():
+        if result.status == COMPLETE:
+            sections.append(result.output)
+        else:
+            sections.append(f"# {stages.RESEARCH_PILLAR_TITLES[pillar]}\n\n*Research for this section did not complete in time. Treat all of its facts as Unknown.*")
+    return stages.combine_research(sections)
@@ -0,0 +1,113 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Awaitable, Callable
+
+from constants.constants import JobListingResearchResponse
+from llm.hashing import fingerprint
+from pipeline import stages
+
+DAY = 24 * 60 * 60
+
+# How each pillar is shared across listings. Company strategy only depends on the company; team culture and domain
+# knowledge are shared by sibling roles (same title ignoring seniority); role success is specific to the exact title.
+PILLAR_SCOPES = {
+    "company_strategy": "company",
+    "role_success": "company_title",
+    "team_culture": "company_role_family",
+    "domain_knowledge": "company_role_family",
+}
+
+# Company news moves fastest; domain knowledge barely moves at all
+PILLAR_TTLS = {
+    "company_strategy": 14 * DAY,
+    "role_success": 30 * DAY,
+    "team_culture": 60 * DAY,
+    "domain_knowledge": 90 * DAY,
+}
+
+SENIORITY_PATTERN = re.compile(r"\b(senior|sr|junior|jr|lead|principal|staff|associate|entry level|head of|i{1,3}|iv|[1-5])\b\.?")
+
+
+def normalize_company(company_name: str) -> str:
+    company = re.sub(r"[^a-z0-9 ]", " ", company_name.lower())
+    company = re.sub(r"\b(inc|llc|ltd|corp|corporation|co|company|plc)\b", " ", company)
+    return " ".join(company.split())
+
+
+def normalize_title(job_title: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9 ]", " ", job_title.lower()).split())
+
+
+def role_family(job_title: str) -> str:
+    return " ".join(SENIORITY_PATTERN.sub(" ", normalize_title(job_title)).split())
+
+
+def scope_key(pillar: str, listing: JobListingResearchResponse) -> str:
+    company = normalize_company(listing.company_name)
+    scope = PILLAR_SCOPES[pillar]
+    if scope == "company":
+        return company
+    if scope == "company_role_family":
+        return f"{company}|{role_family(listing.job_title)}"
+    return f"{company}|{normalize_title(listing.job_title)}"
+
+
+class ResearchStore:
+    """Research pillars stored by company (and title where needed) so new listings at a known employer reuse them."""
+
+    def __init__(self, directory: str = "./research_store", ttls: dict[str, float] | None = None):
+        self.directory = directory
+        self.ttls = {**PILLAR_TTLS, **(ttls or {})}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, pillar: str, listing: JobListingResearchResponse) -> str:
+        # The agent instructions are part of the key, so editing a research prompt invalidates that pillar everywhere
+        instructions, _ = stages.RESEARCH_PILLARS[pillar]
+        key = hashlib.sha256(f"{scope_key(pillar, listing)}|{fingerprint(instructions)}|{stages.RESEARCH_MODEL}".encode()).hexdigest()
+        return os.path.join(self.directory, pillar, f"{key}.json")
+
+    def get(self, pillar: str, listing: JobListingResearchResponse) -> str | None:
+        try:
+            with open(self._path(pillar, listing), "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if time.time() - record["created_at"] > self.ttls[pillar]:
+            return None
+        return record["output"]
+
+    def put(self, pillar: str, listing: JobListingResearchResponse, output: str) -> None:
+        path = self._path(pillar, listing)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        record = {
+            "pillar": pillar,
+            "scope": scope_key(pillar, listing),
+            "company_name": listing.company_name,
+            "job_title": listing.job_title,
+            "created_at": time.time(),
+            "output": output,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def missing_pillars(self, listing: JobListingResearchResponse) -> list[str]:
+        return [pillar for pillar in stages.RESEARCH_PILLARS if self.get(pillar, listing) is None]
+
+
+async def perform_research_with_store(store: ResearchStore, listing: JobListingResearchResponse, run_pillar: Callable[[str, JobListingResearchResponse], Awaitable[str]] = stages.run_research_pillar) -> dict[str, str]:
+    # Fresh pillars are reused; only missing or stale ones run their web-search agent
+    results = {pillar: store.get(pillar, listing) for pillar in stages.RESEARCH_PILLARS}
+    stale = [pillar for pillar, output in results.items() if output is None]
+
+    outputs = await asyncio.gather(*(run_pillar(pillar, listing) for pillar in stale))
+    for pillar, output in zip(stale, outputs):
+        store.put(pillar, listing, output)
+        results[pillar] = output
+    return results
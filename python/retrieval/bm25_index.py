@@ -0,0 +1,184 @@
+import argparse
+import json
+import math
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass
+
+from evaluation.context_planner import matches_heading, split_guide
+from llm.tokens import estimate_tokens
+
+RESEARCH = "research"
+GUIDE = "guide"
+
+# Guide sections every interviewer turn needs; they stay in the system prompt and are never retrieved
+PINNED_GUIDE_SECTIONS = ("Role Snapshot", "Tailored Question Bank")
+
+DEFAULT_CHUNK_TOKENS = 250
+
+HEADING_PATTERN = re.compile(r"^(#{1,4})\s+(.*\S)\s*$")
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Kept short on purpose: research reports are full of domain words that a longer list would drop
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from has have how i in is it its of on or our that the their them they "
+    "this to was we were what when where which who why will with you your".split()
+)
+
+
+@dataclass
+class Chunk:
+    id: int
+    source: str
+    heading: str
+    text: str
+
+    def render(self) -> str:
+        return f"[{self.source}: {self.heading}]\n{self.text}" if self.heading else f"[{self.source}]\n{self.text}"
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def chunk_markdown(text: str, source: str, max_tokens: int = DEFAULT_CHUNK_TOKENS, start_id: int = 0) -> list[Chunk]:
+    """
+    Splits markdown at its headings, then packs each section's blocks (paragraphs, or lines of a bullet list) into chunks
+    of at most max_tokens. Every chunk carries its heading path, e.g. "Role Definition & Success Profile > Skills".
+    """
+    chunks: list[Chunk] = []
+    headings: list[tuple[int, str]] = []
+    blocks: list[str] = []
+
+    def flush() -> None:
+        current: list[str] = []
+        for block in blocks:
+            if current and estimate_tokens("\n".join([*current, block])) > max_tokens:
+                chunks.append(Chunk(start_id + len(chunks), source, " > ".join(title for _, title in headings), "\n".join(current)))
+                current = []
+            current.append(block)
+        if current:
+            chunks.append(Chunk(start_id + len(chunks), source, " > ".join(title for _, title in headings), "\n".join(current)))
+        blocks.clear()
+
+    for line in text.splitlines():
+        match = HEADING_PATTERN.match(line)
+        if match:
+            flush()
+            level = len(match.group(1))
+            while headings and headings[-1][0] >= level:
+                headings.pop()
+            headings.append((level, match.group(2)))
+        elif line.strip():
+            blocks.append(line.rstrip())
+    flush()
+    return chunks
+
+
+def section_title(heading: str) -> str:
+    # Top-level title of a heading path without the guide's "N) " numbering, e.g. "4) Tailored Question Bank > ..." -> "Tailored Question Bank"
+    return re.sub(r"^\d+\)\s*", "", heading.split(" > ")[0])
+
+
+class BM25Index:
+    """
+    In-process Okapi BM25 over heading-tagged chunks of the research report and interview guide. Built once per listing
+    and stored as a plain dict, so it can be cached next to the prep artifacts and reloaded without re-chunking.
+    """
+
+    def __init__(self, chunks: list[Chunk], k1: float = 1.2, b: float = 0.75):
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+        # The heading is indexed with the text so a chunk deep in "Skills & Competencies" matches a query about skills
+        self.term_counts = [Counter(tokenize(f"{chunk.heading}\n{chunk.text}")) for chunk in chunks]
+        self._build()
+
+    def _build(self) -> None:
+        self.lengths = [sum(counts.values()) for counts in self.term_counts]
+        self.average_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0.0
+        document_frequency = Counter(term for counts in self.term_counts for term in counts)
+        total = len(self.chunks)
+        self.idf = {term: math.log(1 + (total - frequency + 0.5) / (frequency + 0.5)) for term, frequency in document_frequency.items()}
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def scores(self, query: str) -> list[float]:
+        terms = [term for term in set(tokenize(query)) if term in self.idf]
+        scores = []
+        for counts, length in zip(self.term_counts, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / self.average_length) if self.average_length else self.k1
+            scores.append(sum(self.idf[term] * counts[term] * (self.k1 + 1) / (counts[term] + norm) for term in terms if term in counts))
+        return scores
+
+    def search(self, query: str, k: int = 4, sources: tuple[str, ...] | None = None, exclude_headings: tuple[str, ...] = ()) -> list[Chunk]:
+        # exclude_headings drops chunks under any heading path starting with one of these (e.g. the pinned guide sections)
+        ranked = sorted(zip(self.scores(query), self.chunks), key=lambda pair: pair[0], reverse=True)
+        results = []
+        for score, chunk in ranked:
+            if score <= 0 or len(results) == k:
+                break
+            if sources is not None and chunk.source not in sources:
+                continue
+            if any(matches_heading(section_title(chunk.heading), heading) for heading in exclude_headings):
+                continue
+            results.append(chunk)
+        return results
+
+    def to_dict(self) -> dict:
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "chunks": [asdict(chunk) for chunk in self.chunks],
+            "term_counts": [dict(counts) for counts in self.term_counts],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BM25Index":
+        index = cls.__new__(cls)
+        index.k1 = data["k1"]
+        index.b = data["b"]
+        index.chunks = [Chunk(**chunk) for chunk in data["chunks"]]
+        index.term_counts = [Counter(counts) for counts in data["term_counts"]]
+        index._build()
+        return index
+
+
+def build_listing_index(deep_research_results: str, interview_guide: str, max_tokens: int = DEFAULT_CHUNK_TOKENS) -> BM25Index:
+    research = chunk_markdown(deep_research_results, RESEARCH, max_tokens)
+    guide = chunk_markdown(interview_guide, GUIDE, max_tokens, start_id=len(research))
+    return BM25Index(research + guide)
+
+
+def pinned_guide(interview_guide: str) -> str:
+    # Falls back to the whole guide when its headers aren't the ones the distillation prompt prescribes
+    sections = [section for section in split_guide(interview_guide) if any(matches_heading(section.key, title) for title in PINNED_GUIDE_SECTIONS)]
+    if not sections:
+        return interview_guide
+    return "\n".join(section.text.strip("\n") + "\n" for section in sections).strip("\n")
+
+
+def format_chunks(chunks: list[Chunk]) -> str:
+    return "\n\n".join(chunk.render() for chunk in chunks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query the retrieval index built from a research report and interview guide.")
+    parser.add_argument("query")
+    parser.add_argument("--deep-research", default="./saved_texts/deep_research_results.md")
+    parser.add_argument("--interview-guide", default="./saved_texts/interview_guide.md")
+    parser.add_argument("-k", type=int, default=4)
+    args = parser.parse_args()
+
+    with open(args.deep_research, "r", encoding="utf-8") as f:
+        deep_research_results = f.read()
+    with open(args.interview_guide, "r", encoding="utf-8") as f:
+        interview_guide = f.read()
+    index = build_listing_index(deep_research_results, interview_guide)
+    results = index.search(args.query, args.k, exclude_headings=PINNED_GUIDE_SECTIONS)
+    print(json.dumps([asdict(chunk) for chunk in results], indent=4))
+
+
+if __name__ == "__main__":
+    main()
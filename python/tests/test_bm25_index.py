@@ -0,0 +1,51 @@
+from retrieval.bm25_index import GUIDE, PINNED_GUIDE_SECTIONS, RESEARCH, BM25Index, build_listing_index, pinned_guide
+
+RESEARCH_REPORT = """# Company Overview
+Acme builds payment infrastructure for small merchants across Europe.
+
+# Tech Stack
+The platform runs on Kubernetes with Python services and a Postgres ledger.
+
+# Culture
+Teams write design docs and hold blameless postmortems after incidents.
+"""
+
+GUIDE_TEXT = """## 1) Role Snapshot
+Senior backend engineer owning the Postgres ledger service.
+
+## 2) Tailored Question Bank
+- Walk me through a Postgres migration you led.
+
+## 3) Strategic Context
+The ledger is being split out of the monolith this year.
+"""
+
+
+def test_ranks_the_chunk_that_matches_the_query_first():
+    index = build_listing_index(RESEARCH_REPORT, GUIDE_TEXT)
+    results = index.search("kubernetes python services", k=2)
+    assert results[0].heading == "Tech Stack"
+    assert [chunk.heading for chunk in index.search("blameless postmortems", k=1)] == ["Culture"]
+    # No query term in any chunk -> nothing, rather than arbitrary chunks
+    assert index.search("zebra") == []
+
+
+def test_sources_and_pinned_sections_are_excluded():
+    index = build_listing_index(RESEARCH_REPORT, GUIDE_TEXT)
+    assert {chunk.source for chunk in index.search("postgres ledger", k=10, sources=(RESEARCH,))} == {RESEARCH}
+    assert len(index.search("postgres ledger", k=10)) == 4
+    # The pinned guide sections are always in the system prompt, so retrieval skips them despite their "N) " numbering
+    results = index.search("postgres ledger", k=10, exclude_headings=PINNED_GUIDE_SECTIONS)
+    assert [(chunk.source, chunk.heading) for chunk in results] == [(RESEARCH, "Tech Stack"), (GUIDE, "3) Strategic Context")]
+
+
+def test_round_trips_through_dict():
+    index = build_listing_index(RESEARCH_REPORT, GUIDE_TEXT)
+    restored = BM25Index.from_dict(index.to_dict())
+    assert restored.scores("postgres ledger") == index.scores("postgres ledger")
+
+
+def test_pinned_guide_keeps_only_pinned_sections():
+    pinned = pinned_guide(GUIDE_TEXT)
+    assert "Role Snapshot" in pinned and "Tailored Question Bank" in pinned
+    assert "Strategic Context" not in pinned
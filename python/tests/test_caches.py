@@ -0,0 +1,145 @@
+import asyncio
+import os
+import time
+import types
+
+from llm.hashing import content_hash, fingerprint
+from llm.response_cache import AsyncCachedOpenAI, ResponseCache, response_cache_key
+from pipeline.artifact_store import ArtifactStore
+
+
+def prompt_v1() -> str:
+    return "Summarise the listing."
+
+
+def prompt_v1_edited() -> str:
+    return "Summarise the listing in five bullets."
+
+
+def test_artifact_key_changes_with_prompt_source_and_inputs(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    key = store.key("extract", {"prompt": fingerprint(prompt_v1), "listing": "a"})
+    assert key == store.key("extract", {"listing": "a", "prompt": fingerprint(prompt_v1)})
+    assert key != store.key("extract", {"prompt": fingerprint(prompt_v1_edited), "listing": "a"})
+    assert key != store.key("extract", {"prompt": fingerprint(prompt_v1), "listing": "b"})
+    assert key != store.key("guide", {"prompt": fingerprint(prompt_v1), "listing": "a"})
+
+
+def test_artifact_store_round_trip(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    key = content_hash({"stage": "x"})
+    assert store.get(key) is None and key not in store
+    store.put(key, "x", {"b": 1, "a": [1, 2]})
+    assert key in store
+    assert ArtifactStore(str(tmp_path)).get(key) == {"a": [1, 2], "b": 1}
+
+
+def test_response_key_ignores_whitespace_and_non_semantic_params():
+    messages = [{"role": "user", "content": "Hello  \r\nworld\n"}]
+    key = response_cache_key("gpt-4o-mini", messages, temperature=0.2)
+    assert key == response_cache_key("gpt-4o-mini", [{"role": "user", "content": "Hello\nworld"}], temperature=0.2, timeout=30, user="u1")
+    assert key != response_cache_key("gpt-4o-mini", messages, temperature=0.7)
+    assert key != response_cache_key("gpt-4.1-mini", messages, temperature=0.2)
+
+
+def test_response_cache_survives_restart_and_expires(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl_seconds=60)
+    cache.put("k", {"id": 1})
+    assert ResponseCache(str(tmp_path), ttl_seconds=60).get("k") == {"id": 1}
+
+    expired = ResponseCache(str(tmp_path), ttl_seconds=0)
+    time.sleep(0.01)
+    assert expired.get("k") is None
+    assert not os.path.exists(tmp_path / "k.json")
+
+
+def test_response_cache_evicts_least_recently_used_to_low_water(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_memory_entries=1)
+    for i in range(6):
+        cache.put(f"k{i}", {"v": "x" * 100})
+    entry_bytes = os.path.getsize(tmp_path / "k0.json")
+    cache.max_disk_bytes = int(entry_bytes * 6.5)
+
+    # k0 is read back from disk, so k1 and k2 become the least recently used entries. The pause keeps its touched
+    # mtime clear of the others on filesystems with coarse timestamps.
+    time.sleep(0.05)
+    assert cache.get("k0") is not None
+    cache.put("k6", {"v": "x" * 100})
+
+    remaining = sorted(name[:-len(".json")] for name in os.listdir(tmp_path))
+    assert remaining == ["k0", "k3", "k4", "k5", "k6"]
+    assert cache._disk_bytes == sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path))
+
+
+def test_response_cache_resyncs_with_other_processes(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path), max_disk_bytes=1000)
+    other = ResponseCache(str(tmp_path), max_disk_bytes=10_000)
+    for i in range(8):
+        other.put(f"other{i}", {"v": "y" * 100})
+
+    # Stands in for DISK_RESCAN_SECONDS having passed since this process last looked at the directory
+    monkeypatch.setattr("llm.response_cache.DISK_RESCAN_SECONDS", 0)
+    cache.put("mine", {"v": "x" * 100})
+    assert cache._disk_bytes == sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path))
+    assert cache._disk_bytes <= 1000
+    assert os.path.exists(tmp_path / "mine.json")
+
+
+class FakeAsyncCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, *, model, messages, **params):
+        from openai.types.chat import ChatCompletion
+
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return ChatCompletion.model_validate({
+            "id": f"call-{self.calls}", "object": "chat.completion", "created": 0, "model": model,
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": messages[-1]["content"].upper()}}],
+        })
+
+
+class FakeAsyncClient:
+    def __init__(self):
+        self.chat = types.SimpleNamespace(completions=FakeAsyncCompletions())
+        self.beta = types.SimpleNamespace()
+
+
+def test_async_identical_misses_share_one_call(tmp_path):
+    client = FakeAsyncClient()
+    cached = AsyncCachedOpenAI(client, ResponseCache(str(tmp_path)))
+
+    async def main():
+        ask = lambda content: cached.chat.completions.create(model="gpt-4o-mini", messages=[{"role": "user", "content": content}])
+        return await asyncio.gather(*(ask("hello") for _ in range(5)), ask("other"))
+
+    responses = asyncio.run(main())
+    assert client.chat.completions.calls == 2
+    assert [response.choices[0].message.content for response in responses] == ["HELLO"] * 5 + ["OTHER"]
+    assert cached.cache.in_flight == {}
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_async_failed_leader_lets_a_waiting_request_retry(tmp_path):
+    client = FakeAsyncClient()
+    completions = client.chat.completions
+    original = completions.create
+
+    async def flaky(**kwargs):
+        if completions.calls == 0:
+            completions.calls += 1
+            await asyncio.sleep(0.01)
+            raise ConnectionError("first attempt fails")
+        return await original(**kwargs)
+
+    completions.create = flaky
+    cached = AsyncCachedOpenAI(client, ResponseCache(str(tmp_path)))
+
+    async def main():
+        ask = lambda: cached.chat.completions.create(model="gpt-4o-mini", messages=[{"role": "user", "content": "hi"}])
+        return await asyncio.gather(ask(), ask(), return_exceptions=True)
+
+    first, second = asyncio.run(main())
+    assert isinstance(first, ConnectionError)
+    assert second.choices[0].message.content == "HI"
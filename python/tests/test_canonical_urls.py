@@ -0,0 +1,46 @@
+import pytest
+
+from ingestion.canonical_urls import canonical_url
+
+
+def test_tracking_and_mobile_variants_share_one_key():
+    urls = [
+        "https://www.indeed.com/viewjob?jk=ABC123&from=serp&tk=xyz",
+        "https://m.indeed.com/viewjob?jk=abc123",
+        "https://indeed.com/rc/clk?jk=abc123&utm_source=mail",
+    ]
+    assert {canonical_url(url) for url in urls} == {"https://www.indeed.com/viewjob?jk=abc123"}
+
+
+def test_regional_host_is_kept():
+    assert canonical_url("https://uk.indeed.com/viewjob?jk=abc123&from=serp") == "https://uk.indeed.com/viewjob?jk=abc123"
+    assert canonical_url("https://www.example.co.uk/careers/123/") == "https://www.example.co.uk/careers/123"
+
+
+def test_site_specific_job_ids():
+    assert canonical_url("https://www.linkedin.com/jobs/view/senior-engineer-at-acme-3812345678/?trk=abc") == "https://www.linkedin.com/jobs/view/3812345678"
+    assert canonical_url("https://www.linkedin.com/jobs/search/?currentJobId=3812345678") == "https://www.linkedin.com/jobs/view/3812345678"
+    assert canonical_url("https://job-boards.greenhouse.io/Acme/jobs/4567?gh_src=x") == "https://boards.greenhouse.io/acme/jobs/4567"
+
+
+def test_missing_job_id_falls_back_to_generic_form():
+    # An Indeed search page has no jk, so only tracking params are dropped and the rest is sorted
+    assert canonical_url("https://www.indeed.com/jobs?q=python&l=london&from=home") == "https://www.indeed.com/jobs?l=london&q=python"
+    assert canonical_url("https://www.linkedin.com/jobs/search/?keywords=python") == "https://www.linkedin.com/jobs/search?keywords=python"
+
+
+def test_relative_url_is_rejected():
+    with pytest.raises(ValueError):
+        canonical_url("/viewjob?jk=abc123")
+
+
+def test_repeated_query_keys_are_all_kept():
+    assert canonical_url("https://example.com/jobs?skill=python&utm_medium=x&skill=go") == "https://example.com/jobs?skill=go&skill=python"
+    assert canonical_url("https://example.com/jobs?skill=go&skill=python") == canonical_url("https://example.com/jobs?skill=python&skill=go")
+
+
+def test_hash_route_fragment_is_kept_and_anchor_dropped():
+    assert canonical_url("https://careers.example.com/#/job/123?ref=x") == "https://careers.example.com/#/job/123?ref=x"
+    assert canonical_url("https://careers.example.com/#!/job/123") == "https://careers.example.com/#!/job/123"
+    assert canonical_url("https://careers.example.com/#/job/123") != canonical_url("https://careers.example.com/#/job/456")
+    assert canonical_url("https://example.com/careers/123#apply") == "https://example.com/careers/123"
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import types
+
+from constants.constants import JobListingResearchResponse
+from interview.conversation_manager import AsyncConversationManager, ConversationManager
+from pipeline.stages import INTERVIEW_SUMMARY_MODEL
+
+LISTING = JobListingResearchResponse(
+    job_title="Engineer", job_location="London", job_description="d", work_schedule="Full time",
+    company_name="Acme", expectations_and_responsibilities="e", requirements="r",
+)
+
+# Each turn is ~100 tokens, so a 150-token window folds a turn out after every reply from the second on
+ANSWER = "I led the payments migration and cut settlement time in half. " * 6
+
+
+def chunk(content: str | None) -> types.SimpleNamespace:
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=content))], usage=None)
+
+
+def response(content: str) -> types.SimpleNamespace:
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=content))], usage=None)
+
+
+class FakeClient:
+    """Streams a fixed reply; summary calls wait for `release` and then return, or raise when `fail` is set."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.fail = False
+        self.summaries = 0
+        self.turn_messages: list[list[dict]] = []
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, stream=False, **kwargs):
+        if model == INTERVIEW_SUMMARY_MODEL:
+            self.release.wait(5)
+            self.summaries += 1
+            if self.fail:
+                raise RuntimeError("summary failed")
+            return response(f"notes {self.summaries}")
+        self.turn_messages.append(messages)
+        return iter([chunk("Next "), chunk("question?")])
+
+
+def notes(messages: list[dict]) -> list[str]:
+    return [message["content"] for message in messages if message["content"].startswith("# Interview Notes")]
+
+
+def test_stream_returns_before_the_summary_and_the_next_turn_applies_it():
+    client = FakeClient()
+    conversation = ConversationManager(client, LISTING, "guide", history_token_budget=150, min_recent_messages=2)
+    list(conversation.stream_reply(ANSWER))
+    # The summary call is still blocked, yet the second stream runs to completion
+    assert list(conversation.stream_reply(ANSWER))[-1] == "Next question?"
+    assert client.summaries == 0 and conversation.summary == ""
+
+    client.release.set()
+    list(conversation.stream_reply("Short answer."))
+    assert conversation.summary == "notes 1"
+    assert notes(client.turn_messages[-1]) == ["# Interview Notes (earlier turns)\n\nnotes 1"]
+    assert conversation.transcript[0]["content"] == ANSWER and len(conversation.transcript) == 6
+
+
+def test_failed_summary_keeps_the_turns_in_the_window():
+    client = FakeClient()
+    client.fail = True
+    client.release.set()
+    conversation = ConversationManager(client, LISTING, "guide", history_token_budget=150, min_recent_messages=2)
+    list(conversation.stream_reply(ANSWER))
+    list(conversation.stream_reply(ANSWER))
+    list(conversation.stream_reply("Short answer."))
+    assert conversation.summary == ""
+    # The folded first turn was put back and sent with the third turn
+    assert client.turn_messages[-1][1]["content"] == ANSWER
+
+
+def test_async_summary_runs_in_the_background():
+    client = FakeClient()
+    summarizing = asyncio.Event()
+
+    async def create(model, messages, stream=False, **kwargs):
+        if model == INTERVIEW_SUMMARY_MODEL:
+            summarizing.set()
+            await asyncio.sleep(0.05)
+            return response("async notes")
+        client.turn_messages.append(messages)
+
+        class Stream:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def __aiter__(self):
+                for content in ("Next ", "question?"):
+                    yield chunk(content)
+
+        return Stream()
+
+    client.chat.completions.create = create
+
+    async def main():
+        conversation = AsyncConversationManager(client, LISTING, "guide", history_token_budget=150, min_recent_messages=2)
+        for answer in (ANSWER, ANSWER):
+            async for _ in conversation.stream_reply(answer):
+                pass
+        # The stream returned before the summary call got to run
+        assert conversation.summary == "" and not summarizing.is_set()
+        async for _ in conversation.stream_reply("Short answer."):
+            pass
+        return conversation
+
+    conversation = asyncio.run(main())
+    assert conversation.summary == "async notes"
+    assert notes(client.turn_messages[-1]) == ["# Interview Notes (earlier turns)\n\nasync notes"]
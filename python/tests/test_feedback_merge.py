@@ -0,0 +1,38 @@
+from constants.constants import FeedbackPoint, JudgeEvaluation
+from evaluation.feedback_merge import merge_feedback, quotes_overlap
+
+
+def test_quotes_match_on_word_boundaries_only():
+    assert not quotes_overlap("led", "cancelled")
+    assert not quotes_overlap("led the team", "I cancelled the team offsite")
+
+
+def test_truncated_quote_matches_full_quote():
+    assert quotes_overlap("I led the migration to Kafka...", "I led the migration to Kafka in 2021 with two engineers")
+
+
+def test_short_quotes_never_match():
+    assert not quotes_overlap("yes", "yes")
+    assert not quotes_overlap("I did", "I did")
+
+
+def test_reworded_quote_matches_on_word_overlap():
+    assert quotes_overlap("we cut p99 latency by forty percent", "we cut the p99 latency by forty percent")
+    assert not quotes_overlap("we cut p99 latency by forty percent", "our hiring process took six weeks")
+
+
+def _point(polarity: str, quote: str, criterion: str = "Evidence") -> FeedbackPoint:
+    return FeedbackPoint(polarity=polarity, criterion=criterion, quotes=[quote], rationale="r", job_context="c", best_practice="b", severity="medium")
+
+
+def test_merge_joins_shared_evidence_and_keeps_polarities_apart():
+    quote = "I led the migration to Kafka in 2021"
+    evaluations = {
+        "Content Evaluation": JudgeEvaluation(feedback_points=[_point("strength", quote), _point("improvement", "I was not sure about the budget")], summary=""),
+        "Structure Evaluation": JudgeEvaluation(feedback_points=[_point("strength", quote + "...", "Result"), _point("improvement", quote)], summary=""),
+    }
+    merged = merge_feedback(evaluations)
+    strengths = [point for point in merged if point.polarity == "strength"]
+    assert len(strengths) == 1
+    assert sorted(strengths[0].judges) == ["Content Evaluation", "Structure Evaluation"]
+    assert len([point for point in merged if point.polarity == "improvement"]) == 2
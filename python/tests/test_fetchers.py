@@ -0,0 +1,77 @@
+import asyncio
+import types
+
+import httpx
+
+from ingestion.fetchers import FetchedPage, FirecrawlFetcher, PageCache
+
+URL = "https://jobs.example.com/listing/1"
+
+
+class FakeFirecrawl:
+    def __init__(self):
+        self.scrapes = 0
+
+    def scrape(self, url, formats):
+        self.scrapes += 1
+        return types.SimpleNamespace(markdown=f"# Listing, scrape {self.scrapes}")
+
+
+class FakeServer:
+    """Answers HEAD with the page's current ETag, and 304 when the request's If-None-Match still matches it."""
+
+    def __init__(self, etag: str | None = '"v1"', fail: bool = False):
+        self.etag = etag
+        self.fail = fail
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.fail:
+            raise httpx.ConnectError("unreachable", request=request)
+        if self.etag and request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"ETag": self.etag} if self.etag else {})
+
+
+def fetch(tmp_path, server: FakeServer, firecrawl: FakeFirecrawl) -> FetchedPage:
+    async def main():
+        fetcher = FirecrawlFetcher(firecrawl, PageCache(str(tmp_path)))
+        await fetcher.client.aclose()
+        fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(server))
+        try:
+            return await fetcher.fetch(URL)
+        finally:
+            await fetcher.aclose()
+
+    return asyncio.run(main())
+
+
+def test_unchanged_page_is_revalidated_without_scraping(tmp_path):
+    server, firecrawl = FakeServer(), FakeFirecrawl()
+    first = fetch(tmp_path, server, firecrawl)
+    second = fetch(tmp_path, server, firecrawl)
+    assert first.etag == '"v1"' and not first.not_modified
+    assert second.not_modified and second.content == first.content
+    assert firecrawl.scrapes == 1
+    assert [request.method for request in server.requests] == ["HEAD", "HEAD"]
+
+
+def test_changed_page_is_scraped_without_downloading_it(tmp_path):
+    server, firecrawl = FakeServer(), FakeFirecrawl()
+    fetch(tmp_path, server, firecrawl)
+    server.etag = '"v2"'
+    page = fetch(tmp_path, server, firecrawl)
+    assert page.etag == '"v2"' and page.content == "# Listing, scrape 2"
+    assert all(request.method == "HEAD" for request in server.requests)
+
+
+def test_cached_entry_without_validators_learns_them(tmp_path):
+    firecrawl = FakeFirecrawl()
+    # The first run's HEAD fails, so the page is cached without validators
+    fetch(tmp_path, FakeServer(fail=True), firecrawl)
+    server = FakeServer()
+    page = fetch(tmp_path, server, firecrawl)
+    assert page.etag == '"v1"'
+    assert fetch(tmp_path, server, firecrawl).not_modified
+    assert firecrawl.scrapes == 2
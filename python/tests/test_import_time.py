@@ -0,0 +1,25 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded only once a stage (or the model it needs) is actually used
+HEAVY_MODULES = ["openai", "agents", "httpx", "pydantic", "pipeline.stages", "constants.constants"]
+
+
+def loaded_after(statement: str) -> list[str]:
+    # A fresh interpreter so nothing imported by the test session leaks in
+    probe = f"import json, sys\n{statement}\nprint(json.dumps(sorted(name for name in {HEAVY_MODULES!r} if name in sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_bare_import_loads_no_heavy_modules():
+    assert loaded_after("import interview_bot") == []
+
+
+def test_stage_modules_do_not_import_openai_at_import_time():
+    assert "openai" not in loaded_after("import interview_bot; interview_bot.ConversationManager")
+    assert not {"openai", "agents"} & set(loaded_after("import interview_bot; interview_bot.stages"))
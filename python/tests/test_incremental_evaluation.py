@@ -0,0 +1,78 @@
+import asyncio
+
+from constants.constants import FeedbackPoint, JudgeEvaluation
+from evaluation.incremental_evaluation import PER_EXCHANGE_JUDGES, WHOLE_INTERVIEW_JUDGES, IncrementalEvaluator
+from pipeline import stages
+
+
+def fake_judges(monkeypatch, delay: float = 0.01) -> list[tuple[str, str]]:
+    calls = []
+
+    async def evaluate_interview_structured(async_client, name, listing, deep_research_results, interview_guide, transcript, layout):
+        calls.append((name, transcript))
+        await asyncio.sleep(delay)
+        point = FeedbackPoint(polarity="strength", criterion=name, quotes=[f"{name} quote number {len(calls)}"], rationale="r", job_context="c", best_practice="b", severity="low")
+        return JudgeEvaluation(feedback_points=[point], summary=name)
+
+    monkeypatch.setattr(stages, "evaluate_interview_structured", evaluate_interview_structured)
+    return calls
+
+
+async def interview(evaluator: IncrementalEvaluator, answers: int) -> None:
+    evaluator.record_turn("Hi", "Tell me about yourself.")
+    for number in range(1, answers + 1):
+        # The candidate takes longer to answer than the judges take to run
+        await asyncio.sleep(0.05)
+        evaluator.record_turn(f"Answer {number} about the payments migration I led", f"Question {number + 1}?")
+
+
+def test_exchanges_run_only_per_answer_judges_with_earlier_context(monkeypatch):
+    calls = fake_judges(monkeypatch)
+
+    async def main():
+        evaluator = IncrementalEvaluator(None, None, "", "", context_budget=None, whole_interview_every=100)
+        await interview(evaluator, 3)
+        await asyncio.gather(*evaluator._tasks)
+        return evaluator
+
+    evaluator = asyncio.run(main())
+    assert {name for name, _ in calls} == set(PER_EXCHANGE_JUDGES)
+    assert len(calls) == 3 * len(PER_EXCHANGE_JUDGES)
+    third = [transcript for _, transcript in calls if "exchange 3 of" in transcript][0]
+    assert "Earlier in the interview" in third and "Answer 2" in third
+    assert evaluator.exchange_count == 3
+
+
+def test_finish_reuses_a_current_background_pass(monkeypatch):
+    calls = fake_judges(monkeypatch)
+
+    async def main():
+        evaluator = IncrementalEvaluator(None, None, "", "", context_budget=None)
+        await interview(evaluator, 3)
+        # Let the background work land, as it does while the candidate reads the closing message
+        await asyncio.sleep(0.2)
+        calls.clear()
+        evaluations = await evaluator.finish()
+        return evaluator, evaluations
+
+    evaluator, evaluations = asyncio.run(main())
+    assert calls == []
+    assert set(evaluations) == set(stages.JUDGE_PROMPTS)
+    assert evaluator._interview_judged_at == len(evaluator.messages)
+
+
+def test_finish_judges_turns_the_background_pass_has_not_seen(monkeypatch):
+    calls = fake_judges(monkeypatch)
+
+    async def main():
+        evaluator = IncrementalEvaluator(None, None, "", "", context_budget=None, whole_interview_every=2)
+        await interview(evaluator, 3)
+        await asyncio.sleep(0.2)
+        calls.clear()
+        await evaluator.finish()
+        return evaluator
+
+    evaluator = asyncio.run(main())
+    assert sorted(name for name, _ in calls) == sorted(WHOLE_INTERVIEW_JUDGES)
+    assert all("Answer 3" in transcript for _, transcript in calls)
+    assert evaluator.interview_passes == 2
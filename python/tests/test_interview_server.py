@@ -0,0 +1,110 @@
+import asyncio
+
+import httpx
+
+from constants.constants import JobListingResearchResponse
+from interview.interview_server import InterviewServer, InterviewSessionManager
+from interview.session_store import SessionStore
+
+LISTING = JobListingResearchResponse(
+    job_title="Engineer", job_location="London", job_description="d", work_schedule="Full time",
+    company_name="Acme", expectations_and_responsibilities="e", requirements="r",
+)
+
+
+def run_with_server(check, **manager_options):
+    # No model calls are made, so the manager needs no client
+    async def main():
+        manager = InterviewSessionManager(None, **manager_options)
+        async with InterviewServer(manager, port=0) as server, httpx.AsyncClient(base_url=server.base_url) as client:
+            await check(client, manager)
+
+    asyncio.run(main())
+
+
+async def register(client: httpx.AsyncClient) -> str:
+    response = await client.post("/artifacts", json={"listing": LISTING.model_dump(), "interview_guide": "guide"})
+    assert response.status_code == 201
+    return response.json()["artifacts_id"]
+
+
+def test_missing_and_mistyped_fields_are_bad_requests():
+    async def check(client, manager):
+        assert (await client.post("/artifacts", json={"listing": LISTING.model_dump()})).status_code == 400
+        assert (await client.post("/sessions", json={})).status_code == 400
+        assert (await client.post("/sessions", json={"artifacts_id": 5})).status_code == 400
+        assert (await client.post("/sessions", json=["not", "an", "object"])).status_code == 400
+        session_id = (await client.post("/sessions", json={"artifacts_id": await register(client)})).json()["session_id"]
+        assert (await client.post(f"/sessions/{session_id}/messages", json={})).status_code == 400
+
+    run_with_server(check)
+
+
+def test_unknown_ids_are_not_found():
+    async def check(client, manager):
+        response = await client.post("/sessions", json={"artifacts_id": "missing"})
+        assert response.status_code == 404 and "missing" in response.json()["error"]
+        assert (await client.post("/sessions/nope/messages", json={"message": "hi"})).status_code == 404
+        assert (await client.delete("/sessions/nope")).status_code == 404
+        assert (await client.get("/unknown")).status_code == 404
+
+    run_with_server(check)
+
+
+def test_taken_session_id_conflicts():
+    async def check(client, manager):
+        artifacts_id = await register(client)
+        assert (await client.post("/sessions", json={"artifacts_id": artifacts_id, "session_id": "s1"})).status_code == 201
+        assert (await client.post("/sessions", json={"artifacts_id": artifacts_id, "session_id": "s1"})).status_code == 409
+
+    run_with_server(check)
+
+
+def test_admission_limit_is_too_many_requests():
+    async def check(client, manager):
+        artifacts_id = await register(client)
+        assert (await client.post("/sessions", json={"artifacts_id": artifacts_id})).status_code == 201
+        response = await client.post("/sessions", json={"artifacts_id": artifacts_id})
+        assert response.status_code == 429 and response.headers["retry-after"] == "5"
+
+    run_with_server(check, max_sessions=1)
+
+
+def test_evicted_session_is_restored_from_the_store(tmp_path):
+    store = SessionStore(str(tmp_path))
+
+    async def check(client, manager):
+        artifacts_id = await register(client)
+        session_id = (await client.post("/sessions", json={"artifacts_id": artifacts_id})).json()["session_id"]
+        store.append_messages(session_id, [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "Hello"}])
+        assert (await client.delete(f"/sessions/{session_id}")).status_code == 200
+        assert session_id not in manager.sessions
+
+        # An id that exists only in the store is still taken
+        assert (await client.post("/sessions", json={"artifacts_id": artifacts_id, "session_id": session_id})).status_code == 409
+        session = await manager.session(session_id)
+        assert session.conversation.transcript[-1] == {"role": "assistant", "content": "Hello"}
+        assert manager.restored == 1
+
+    run_with_server(check, session_store=store)
+
+
+def test_session_restored_after_a_restart_gets_its_retrieval_index(tmp_path):
+    store = SessionStore(str(tmp_path))
+    research = "# Tech Stack\nThe ledger runs on Postgres.\n"
+
+    async def main():
+        before = InterviewSessionManager(None, session_store=store)
+        artifacts_id = await before.register_artifacts(LISTING, "## 1) Role Snapshot\nBackend engineer.\n", research)
+        session_id = await before.create_session(artifacts_id)
+
+        # A fresh manager on the same store, as after a restart: nothing registered in memory
+        after = InterviewSessionManager(None, session_store=store)
+        session = await after.session(session_id)
+        return after, artifacts_id, session
+
+    after, artifacts_id, session = asyncio.run(main())
+    assert session.artifacts_id == artifacts_id
+    assert after.artifacts[artifacts_id].deep_research_results == research
+    index = session.conversation.retrieval_index
+    assert index is not None and index.search("postgres")[0].heading == "Tech Stack"
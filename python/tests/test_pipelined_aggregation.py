@@ -0,0 +1,75 @@
+import asyncio
+
+from constants.constants import FeedbackPoint, JudgeEvaluation
+from evaluation.pipelined_aggregation import COMPLETED, COMPLETED_BY_FALLBACK, DROPPED, FALLBACK_STRAGGLERS, PipelinedEvaluation
+from pipeline import stages
+
+JUDGES = list(stages.JUDGE_PROMPTS)
+
+
+def fake_stages(monkeypatch, delays: dict[tuple[str, str], float], failing: set[tuple[str, str]] = frozenset()) -> tuple[list, list]:
+    # delays/failing are keyed by (judge, model); any other call lands after 10ms
+    calls, aggregated = [], []
+
+    async def evaluate_interview_structured(async_client, name, listing, deep_research_results, interview_guide, transcript, layout, model):
+        calls.append((name, model))
+        await asyncio.sleep(delays.get((name, model), 0.01))
+        if (name, model) in failing:
+            raise RuntimeError(f"{name} failed")
+        point = FeedbackPoint(polarity="strength", criterion=name, quotes=[f"{name} quote"], rationale="r", job_context="c", best_practice="b", severity="low")
+        return JudgeEvaluation(feedback_points=[point], summary=f"{name} via {model}")
+
+    async def aggregate_evaluations_stream_async(async_client, listing, combined_evaluations):
+        aggregated.append(combined_evaluations)
+        for token in ("Report", " done"):
+            await asyncio.sleep(0.01)
+            yield token
+
+    monkeypatch.setattr(stages, "evaluate_interview_structured", evaluate_interview_structured)
+    monkeypatch.setattr(stages, "aggregate_evaluations_stream_async", aggregate_evaluations_stream_async)
+    return calls, aggregated
+
+
+def report(evaluation: PipelinedEvaluation) -> str:
+    async def main():
+        return "".join([token async for token in evaluation.stream_report()])
+
+    return asyncio.run(main())
+
+
+def test_straggler_is_dropped_and_the_speculative_report_kept(monkeypatch):
+    _, aggregated = fake_stages(monkeypatch, {(JUDGES[0], stages.JUDGE_MODEL): 5.0})
+    evaluation = PipelinedEvaluation(None, None, "", "", "", judge_timeout=0.2, speculate_after=0.05)
+
+    assert report(evaluation) == "Report done"
+    assert evaluation.judge_status[JUDGES[0]] == DROPPED
+    assert all(evaluation.judge_status[name] == COMPLETED for name in JUDGES[1:])
+    # The aggregator started on the other four before the deadline and its run was kept
+    assert evaluation.speculative_report_kept is True
+    assert len(aggregated) == 1 and f"the {JUDGES[0]} did not finish in time" in aggregated[0]
+
+
+def test_straggler_is_answered_by_the_fallback_model(monkeypatch):
+    calls, aggregated = fake_stages(monkeypatch, {(JUDGES[0], stages.JUDGE_MODEL): 5.0})
+    evaluation = PipelinedEvaluation(None, None, "", "", "", judge_timeout=0.1, straggler_policy=FALLBACK_STRAGGLERS, fallback_timeout=1.0, speculate_after=0.05)
+
+    assert report(evaluation) == "Report done"
+    assert (JUDGES[0], stages.JUDGE_FALLBACK_MODEL) in calls
+    assert evaluation.judge_status[JUDGES[0]] == COMPLETED_BY_FALLBACK
+    assert evaluation.evaluations[JUDGES[0]].summary == f"{JUDGES[0]} via {stages.JUDGE_FALLBACK_MODEL}"
+    # The speculative run lacked the late judge, so the report was re-run on all five
+    assert evaluation.speculative_report_kept is False
+    assert len(aggregated) == 2 and "did not finish in time" not in aggregated[-1]
+
+
+def test_failed_judge_falls_back_without_waiting_for_the_deadline(monkeypatch):
+    calls, _ = fake_stages(monkeypatch, {}, failing={(JUDGES[1], stages.JUDGE_MODEL)})
+    evaluation = PipelinedEvaluation(None, None, "", "", "", judge_timeout=5.0, straggler_policy=FALLBACK_STRAGGLERS, speculate_after=None)
+
+    async def main():
+        return await asyncio.wait_for(evaluation.collect(), timeout=1.0)
+
+    evaluations = asyncio.run(main())
+    assert set(evaluations) == set(JUDGES)
+    assert evaluation.judge_status[JUDGES[1]] == COMPLETED_BY_FALLBACK
+    assert calls.count((JUDGES[1], stages.JUDGE_FALLBACK_MODEL)) == 1
@@ -0,0 +1,44 @@
+from ingestion.question_dedup import MERGED_NOTE, cluster_questions, dedupe_question_bank, jaccard, minhash, shingles
+
+QUESTIONS = [
+    "Tell me about a time you led a team through a difficult project?",
+    "Describe a time you led a team through a difficult project?",
+    "Can you tell me about a time you led the team through a hard project?",
+    "Tell me about a time you failed?",
+    "How do you design a Postgres schema for a ledger?",
+]
+
+
+def test_threshold_decides_which_rewordings_merge():
+    # 0 and 1 differ only in stopwords (Jaccard 1.0); 2 swaps "difficult" for "hard" (Jaccard 0.5)
+    assert cluster_questions(QUESTIONS) == [[0, 1, 2], [3], [4]]
+    assert cluster_questions(QUESTIONS, threshold=0.95) == [[0, 1], [2], [3], [4]]
+
+
+def test_different_topics_never_merge():
+    # "time you failed" vs "time you led": the shared words are all stopwords
+    assert jaccard(shingles(QUESTIONS[0]), shingles(QUESTIONS[3])) == 0.0
+    assert cluster_questions(QUESTIONS, threshold=0.0)[1:] == [[3], [4]]
+
+
+def test_signature_agreement_tracks_jaccard():
+    first, second = shingles(QUESTIONS[0]), shingles(QUESTIONS[2])
+    cache: dict = {}
+    agreement = sum(a == b for a, b in zip(minhash(first, cache), minhash(second, cache))) / 64
+    assert abs(agreement - jaccard(first, second)) < 0.25
+    assert minhash(first) == minhash(first, cache)
+    assert minhash(set()) == minhash(set())
+
+
+def test_bank_keeps_the_first_variant_with_its_count():
+    bank = "# Leadership\n" + "".join(f"- {question}\n  - Note {i}\n" for i, question in enumerate(QUESTIONS))
+    deduped = dedupe_question_bank(bank)
+    assert deduped.text.startswith(MERGED_NOTE)
+    assert f"- {QUESTIONS[0]} [×3]\n  - Note 0\n" in deduped.text
+    assert "Note 1" not in deduped.text and "Note 2" not in deduped.text
+    assert (deduped.questions, deduped.clusters, deduped.duplicates_removed) == (5, 3, 2)
+
+
+def test_bank_without_duplicates_is_unchanged():
+    bank = "# Technical\n- How do you design a Postgres schema for a ledger?\n- Tell me about a time you failed?\n"
+    assert dedupe_question_bank(bank).text == bank
@@ -0,0 +1,64 @@
+from constants.constants import JobListingResearchResponse
+from interview.session_store import SessionStore
+
+LISTING = JobListingResearchResponse(
+    job_title="Engineer", job_location="London", job_description="d", work_schedule="Full time",
+    company_name="Acme", expectations_and_responsibilities="e", requirements="r",
+)
+
+
+def test_session_round_trip_across_reopen(tmp_path):
+    store = SessionStore(str(tmp_path))
+    session_id = store.start_session(listing=LISTING, interview_guide="guide", artifacts_id="a1")
+    store.append_messages(session_id, [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "Hello"}])
+    store.append_evaluation(session_id, "Content Evaluation", "good")
+    store.close()
+
+    reopened = SessionStore(str(tmp_path))
+    assert session_id in reopened and len(reopened) == 1
+    assert reopened.session(session_id)["metadata"]["artifacts_id"] == "a1"
+    assert reopened.messages(session_id) == [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "Hello"}]
+    assert reopened.evaluations(session_id) == {"Content Evaluation": "good"}
+
+
+def test_torn_line_is_skipped_and_not_truncated(tmp_path):
+    store = SessionStore(str(tmp_path))
+    store.start_session("s1", listing=LISTING)
+    store.append_message("s1", "user", "first")
+    store.close()
+
+    # A crash mid-append leaves half a record without its newline
+    torn = b'{"session_id": "s1", "kind": "message", "role": "user", "cont'
+    with open(tmp_path / "sessions.jsonl", "ab") as f:
+        f.write(torn)
+
+    reopened = SessionStore(str(tmp_path))
+    assert reopened.messages("s1") == [{"role": "user", "content": "first"}]
+    assert (tmp_path / "sessions.jsonl").read_bytes().endswith(torn)
+
+    reopened.append_message("s1", "assistant", "second")
+    assert reopened.messages("s1")[-1] == {"role": "assistant", "content": "second"}
+    assert len(list(reopened.iter_records())) == 3
+
+
+def test_records_missing_from_index_are_caught_up(tmp_path):
+    store = SessionStore(str(tmp_path))
+    store.start_session("s1", listing=LISTING)
+    store.close()
+    # Simulates a crash between the data append and the index insert
+    (tmp_path / "index.sqlite").unlink()
+    for suffix in ("-wal", "-shm"):
+        (tmp_path / f"index.sqlite{suffix}").unlink(missing_ok=True)
+
+    reopened = SessionStore(str(tmp_path))
+    assert "s1" in reopened
+    assert reopened.session("s1")["listing"]["company_name"] == "Acme"
+
+
+def test_two_handles_share_one_store(tmp_path):
+    first, second = SessionStore(str(tmp_path)), SessionStore(str(tmp_path))
+    first.start_session("a", listing=LISTING)
+    second.start_session("b", listing=LISTING)
+    first.append_message("b", "user", "from first")
+    assert sorted(second.session_ids()) == ["a", "b"]
+    assert second.messages("b") == [{"role": "user", "content": "from first"}]
@@ -0,0 +1,95 @@
+import asyncio
+from collections import Counter
+
+import pytest
+
+from constants.constants import JobListingResearchResponse
+from pipeline import stages
+from pipeline.speculative_prep import SpeculativePrep
+
+LISTING = JobListingResearchResponse(
+    job_title="Engineer", job_location="London", job_description="Build payments", work_schedule="Full time",
+    company_name="Acme", expectations_and_responsibilities="e", requirements="r",
+)
+
+
+class FakePipeline:
+    """Stands in for PrepPipeline: each stage sleeps briefly and counts its calls."""
+
+    research_runner = None
+    research_store = None
+
+    def __init__(self, failures: dict[str, int] | None = None):
+        self.calls: Counter = Counter()
+        # Pillar -> number of attempts that raise before one succeeds
+        self.failures = failures or {}
+
+    async def fetch(self, url: str) -> str:
+        return "scraped"
+
+    async def extract_job_listing_async(self, scraped: str) -> JobListingResearchResponse:
+        return LISTING
+
+    async def research_pillar(self, pillar: str, listing: JobListingResearchResponse) -> str:
+        self.calls[pillar] += 1
+        await asyncio.sleep(0.01)
+        if self.calls[pillar] <= self.failures.get(pillar, 0):
+            raise ConnectionError(f"{pillar} attempt {self.calls[pillar]} failed")
+        return f"# {pillar} for {listing.company_name}"
+
+    async def interview_guide_async(self, listing: JobListingResearchResponse, deep_research_results: str, interview_questions: str) -> str:
+        self.calls["guide"] += 1
+        await asyncio.sleep(0.01)
+        return f"guide for {listing.job_description}"
+
+
+def run(pipeline: FakePipeline, edit=None, settle: float = 0.0) -> tuple[SpeculativePrep, object]:
+    async def main():
+        prep = SpeculativePrep(pipeline, "questions")
+        listing = await prep.extract("https://example.com/job")
+        # The user reviewing the listing
+        await asyncio.sleep(settle)
+        return prep, await prep.confirm(edit(listing) if edit else None)
+
+    return asyncio.run(main())
+
+
+def test_unedited_listing_reuses_every_task():
+    pipeline = FakePipeline()
+    prep, artifacts = run(pipeline)
+    assert set(prep.reused) == {f"research:{pillar}" for pillar in stages.RESEARCH_PILLARS} | {"interview_guide"}
+    assert prep.cancelled == []
+    assert all(count == 1 for count in pipeline.calls.values())
+    assert artifacts.interview_guide == "guide for Build payments"
+
+
+def test_description_edit_keeps_research_and_restarts_guide():
+    pipeline = FakePipeline()
+    prep, artifacts = run(pipeline, lambda listing: listing.model_copy(update={"job_description": "Build ledgers"}))
+    assert prep.cancelled == ["interview_guide"] and "interview_guide" not in prep.reused
+    assert all(pipeline.calls[pillar] == 1 for pillar in stages.RESEARCH_PILLARS)
+    assert artifacts.interview_guide == "guide for Build ledgers"
+
+
+def test_company_edit_restarts_research():
+    pipeline = FakePipeline()
+    prep, artifacts = run(pipeline, lambda listing: listing.model_copy(update={"company_name": "Globex"}))
+    assert "interview_guide" in prep.cancelled
+    assert all(pipeline.calls[pillar] == 2 for pillar in stages.RESEARCH_PILLARS)
+    assert "Globex" in artifacts.deep_research_results and "Acme" not in artifacts.deep_research_results
+
+
+def test_failed_speculative_attempt_is_retried_at_confirm():
+    pipeline = FakePipeline(failures={"team_culture": 1})
+    # The failed attempt and the guide that depended on it have finished by the time the user confirms
+    prep, artifacts = run(pipeline, settle=0.1)
+    assert "research:team_culture" not in prep.reused and "interview_guide" not in prep.reused
+    # The first guide never ran: it failed with the research it was waiting for
+    assert pipeline.calls["team_culture"] == 2 and pipeline.calls["guide"] == 1
+    assert "# team_culture for Acme" in artifacts.deep_research_results
+
+
+def test_failure_on_retry_still_surfaces():
+    pipeline = FakePipeline(failures={"team_culture": 2})
+    with pytest.raises(ConnectionError):
+        run(pipeline, settle=0.1)